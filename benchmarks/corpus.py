@@ -0,0 +1,149 @@
+"""Synthetic corpus generation for the benchmark suite.
+
+Documents are built from a seeded random generator so that two runs with
+the same arguments produce byte-identical inputs.
+"""
+import random
+import zlib
+from pathlib import Path
+from typing import Dict, List
+
+ENGLISH_WORDS = (
+    "the of and to in that with this which were been would their there what when will from "
+    "have they these those should could about into through because than then them only other "
+    "such also after model data training language system results paper method approach network "
+    "learning analysis process document chapter section figure table value number example first "
+    "second research study question answer information general problem solution development"
+).split()
+FOREIGN_LINES = [
+    "Esto es una prueba del sistema de procesamiento de textos en español.",
+    "Dies ist ein Beispielsatz, der nicht auf Englisch geschrieben wurde.",
+    "Ceci est une phrase d'exemple qui n'est pas écrite en anglais.",
+    "Это тестовое предложение на русском языке для проверки фильтра.",
+]
+
+FORMATS = ["txt", "html", "epub", "docx", "pdf"]
+
+def make_paragraphs(count: int, seed: int = 0, foreign_ratio: float = 0.1) -> List[str]:
+    """Return count pseudo-English paragraphs with a share of foreign-language lines mixed in"""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(count):
+        if rng.random() < foreign_ratio:
+            paragraphs.append(rng.choice(FOREIGN_LINES))
+            continue
+        words = [rng.choice(ENGLISH_WORDS) for _ in range(rng.randint(12, 60))]
+        paragraphs.append(" ".join(words).capitalize() + ".")
+    return paragraphs
+
+def write_txt(path: Path, paragraphs: List[str]) -> None:
+    path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+def write_html(path: Path, paragraphs: List[str]) -> None:
+    body = "\n".join(f"<p>{p}</p>" for p in paragraphs)
+    path.write_text(
+        "<html><head><title>Bench</title><style>p { margin: 0 }</style>"
+        "<script>var x = 1;</script></head>"
+        f"<body><nav><a href='#'>Home</a></nav>\n{body}\n</body></html>",
+        encoding="utf-8"
+    )
+
+def write_epub(path: Path, paragraphs: List[str], chapters: int = 5) -> None:
+    from ebooklib import epub
+
+    book = epub.EpubBook()
+    book.set_identifier(path.stem)
+    book.set_title(path.stem)
+    book.set_language("en")
+    per_chapter = max(1, len(paragraphs) // chapters)
+    items = []
+    for index in range(0, len(paragraphs), per_chapter):
+        number = len(items) + 1
+        chapter = epub.EpubHtml(title=f"Chapter {number}", file_name=f"chap_{number}.xhtml", lang="en")
+        chapter.content = f"<h1>Chapter {number}</h1>" + "".join(
+            f"<p>{p}</p>" for p in paragraphs[index:index + per_chapter])
+        book.add_item(chapter)
+        items.append(chapter)
+    book.toc = items
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = ["nav", *items]
+    epub.write_epub(str(path), book)
+
+def write_docx(path: Path, paragraphs: List[str]) -> None:
+    from docx import Document
+
+    doc = Document()
+    for p in paragraphs:
+        doc.add_paragraph(p)
+    doc.save(str(path))
+
+def _pdf_escape(text: str) -> str:
+    return text.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path: Path, paragraphs: List[str], lines_per_page: int = 45, width: int = 90) -> None:
+    """Write a minimal text-only PDF (Helvetica, one line per text row) without extra dependencies"""
+    lines: List[str] = []
+    for p in paragraphs:
+        words, current = p.split(), ""
+        for word in words:
+            if len(current) + len(word) + 1 > width:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}".strip()
+        lines.extend([current, ""])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects: List[bytes] = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    page_objects: Dict[int, bytes] = {}
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 14 TL 50 770 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        stream = zlib.compress(content.encode("latin-1"))
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_objects[content_id] = (b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)) + stream + b"\nendstream"
+        page_objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                                 b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id))
+        page_ids.append(page_id)
+
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects.append(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    objects.extend(page_objects[i] for i in range(4, next_id))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+WRITERS = {
+    "txt": write_txt,
+    "html": write_html,
+    "epub": write_epub,
+    "docx": write_docx,
+    "pdf": write_pdf,
+}
+
+def generate_corpus(target_dir: Path, docs_per_format: int = 5, paragraphs_per_doc: int = 200,
+                    formats: List[str] = FORMATS, seed: int = 0) -> Dict[str, List[Path]]:
+    """Write docs_per_format synthetic documents of each format into target_dir"""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    corpus: Dict[str, List[Path]] = {}
+    for fmt in formats:
+        corpus[fmt] = []
+        for index in range(docs_per_format):
+            path = target_dir / f"bench_{fmt}_{index}.{fmt}"
+            WRITERS[fmt](path, make_paragraphs(paragraphs_per_doc, seed=seed + index))
+            corpus[fmt].append(path)
+    return corpus
@@ -0,0 +1,283 @@
+"""Benchmark harness for the extraction and cleaning hot paths.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--docs 5] [--paragraphs 200] [--only PATTERN]
+                                        [--repeat 3] [--output bench_results.json]
+                                        [--baseline old.json --tolerance 0.2]
+
+A synthetic corpus (see benchmarks/corpus.py) is generated once, then each
+benchmark runs in a fresh spawned process so that its peak RSS is measured
+in isolation. Results are written as JSON; with --baseline, any benchmark
+whose throughput drops by more than --tolerance is reported and the
+process exits non-zero.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import FORMATS, generate_corpus
+
+Corpus = Dict[str, List[Path]]
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def _file_bytes(paths: List[Path]) -> int:
+    return sum(p.stat().st_size for p in paths)
+
+# --- Benchmark definitions -------------------------------------------------
+# Each benchmark is a (setup, run) pair: setup(corpus, workdir) prepares state
+# outside the timed region, run(state) does the measured work and returns
+# {"docs": ..., "bytes": ..., "paragraphs": ...}. Benchmarks run with workdir
+# as the current directory, so src.main's relative input/output paths (and
+# those of any worker processes) resolve inside it.
+
+def _extract_setup(fmt: str) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        from src.main import EXTRACTORS
+        return EXTRACTORS[fmt], corpus[fmt]
+    return setup
+
+def _pdf_backend_setup(backend: str) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        from functools import partial
+        from src.processors.pdf_backends import backend_available
+        from src.processors.pdf_processor import iter_pdf
+        if not backend_available(backend):
+            raise ImportError(f"PDF backend {backend} is not installed")
+        return partial(iter_pdf, backend=backend), corpus["pdf"]
+    return setup
+
+def _html_soup_setup(corpus: Corpus, workdir: Path) -> Tuple:
+    """The BeautifulSoup html.parser path, as used before the lxml extractor"""
+    from src.processors.html_text import soup_text
+    return lambda file, meta: iter([soup_text(file.read_bytes())]), corpus["html"]
+
+def _docx_python_docx_setup(corpus: Corpus, workdir: Path) -> Tuple:
+    """The python-docx object model path, as used before the streaming extractor"""
+    from src.processors.docx_processor import _iter_python_docx
+    return lambda file, meta: _iter_python_docx(file), corpus["docx"]
+
+def _extract_run(state: Tuple) -> Dict:
+    extractor, files = state
+    paragraphs = 0
+    for file in files:
+        for chunk in extractor(file, {}):
+            paragraphs += sum(1 for line in chunk.splitlines() if line.strip())
+    return {"docs": len(files), "bytes": _file_bytes(files), "paragraphs": paragraphs}
+
+def _clean_setup(clean_level: str) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        from src.processors.text_cleaner import TextCleaner
+        texts = [p.read_text(encoding="utf-8") for p in corpus["txt"]]
+        return TextCleaner(clean_level=clean_level), texts
+    return setup
+
+def _clean_run(state: Tuple) -> Dict:
+    cleaner, texts = state
+    paragraphs = sum(len(cleaner.clean_text(text)) for text in texts)
+    return {"docs": len(texts), "bytes": sum(len(t.encode("utf-8")) for t in texts), "paragraphs": paragraphs}
+
+def _filter_setup(**cleaner_config) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        from src.processors.text_cleaner import TextCleaner
+        cleaner = TextCleaner(**cleaner_config)
+        lines = [line for p in corpus["txt"] for line in cleaner.clean_text(p.read_text(encoding="utf-8"))]
+        cleaner.is_english("Warm up the language models before timing.")
+        return cleaner, lines, len(corpus["txt"])
+    return setup
+
+def _filter_run(state: Tuple) -> Dict:
+    cleaner, lines, docs = state
+    cleaner.filter_english(lines)
+    return {"docs": docs, "bytes": sum(len(line.encode("utf-8")) for line in lines), "paragraphs": len(lines)}
+
+def _batch_setup(executor: str) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        from src.processors.text_cleaner import TextCleaner
+        import src.main as main_module
+        files = [p for paths in corpus.values() for p in paths]
+        main_module.INPUT_DIR.mkdir(exist_ok=True)
+        for file in files:
+            shutil.copy(file, main_module.INPUT_DIR / file.name)
+        return TextCleaner(), executor, files
+    return setup
+
+def _batch_run(state: Tuple) -> Dict:
+    from src.main import process_batch_files
+    cleaner, executor, files = state
+    process_batch_files(cleaner, executor=executor)
+    return {"docs": len(files), "bytes": _file_bytes(files), "paragraphs": _count_output_paragraphs()}
+
+def _count_output_paragraphs() -> int:
+    import src.main as main_module
+    total = 0
+    for meta_file in main_module.META_DIR.glob("*_metadata.json"):
+        with open(meta_file, encoding="utf-8") as f:
+            total += json.load(f).get("paragraph_count", 0)
+    return total
+
+def _dataset_setup(corpus: Corpus, workdir: Path) -> Tuple:
+    state = _batch_setup("thread")(corpus, workdir)
+    _batch_run(state)
+    return state
+
+def _dataset_run(state: Tuple) -> Dict:
+    from src.main import build_hf_dataset
+    _, _, files = state
+    dataset = build_hf_dataset()
+    return {"docs": len(files), "bytes": _file_bytes(files), "paragraphs": len(dataset) if dataset else 0}
+
+def _startup_setup(*command: str, runs: int = 10) -> Callable[[Corpus, Path], Tuple]:
+    def setup(corpus: Corpus, workdir: Path) -> Tuple:
+        env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+        return [sys.executable, *command], env, runs
+    return setup
+
+def _startup_run(state: Tuple) -> Dict:
+    """Start a fresh interpreter runs times; docs/s is invocations per second"""
+    command, env, runs = state
+    for _ in range(runs):
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    return {"docs": runs, "bytes": 0, "paragraphs": 0}
+
+BENCHMARKS: Dict[str, Tuple[Callable, Callable]] = {
+    "startup_import_main": (_startup_setup("-c", "import src.main"), _startup_run),
+    "startup_cli_help": (_startup_setup("-m", "src.cli", "--help"), _startup_run),
+    **{f"extract_{fmt}": (_extract_setup(fmt), _extract_run) for fmt in FORMATS},
+    "extract_html_beautifulsoup": (_html_soup_setup, _extract_run),
+    "extract_docx_python_docx": (_docx_python_docx_setup, _extract_run),
+    **{f"extract_pdf_{backend}": (_pdf_backend_setup(backend), _extract_run)
+       for backend in ("pypdf2", "pypdfium2", "pdfminer")},
+    "clean_text": (_clean_setup("basic"), _clean_run),
+    "clean_text_aggressive": (_clean_setup("aggressive"), _clean_run),
+    "filter_english": (_filter_setup(), _filter_run),
+    "filter_english_no_prefilter": (_filter_setup(prefilter=False), _filter_run),
+    "filter_english_parallel": (_filter_setup(parallel_detection=True, batch_size=1024), _filter_run),
+    "process_batch_files_thread": (_batch_setup("thread"), _batch_run),
+    "process_batch_files_process": (_batch_setup("process"), _batch_run),
+    "build_hf_dataset": (_dataset_setup, _dataset_run),
+}
+
+# --- Harness -----------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _run_in_child(name: str, corpus: Corpus, repeat: int, queue) -> None:
+    """Run one benchmark in this (fresh) process and report its results on queue"""
+    try:
+        workdir = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+        os.chdir(workdir)
+        os.environ.setdefault("HF_DATASETS_CACHE", str(workdir / "hf_cache"))
+        setup, run = BENCHMARKS[name]
+        timings = []
+        counts = {}
+        for _ in range(repeat):
+            state = setup(corpus, workdir)
+            start = time.perf_counter()
+            counts = run(state)
+            timings.append(time.perf_counter() - start)
+        shutil.rmtree(workdir, ignore_errors=True)
+        seconds = min(timings)
+        queue.put({
+            "seconds": seconds,
+            "docs_per_s": counts["docs"] / seconds if seconds else 0.0,
+            "mb_per_s": counts["bytes"] / (1024 * 1024) / seconds if seconds else 0.0,
+            "paragraphs_per_s": counts["paragraphs"] / seconds if seconds else 0.0,
+            "peak_rss_mb": _peak_rss_mb(),
+            **counts
+        })
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+def run_benchmark(name: str, corpus: Corpus, repeat: int = 1) -> Dict:
+    """Run a benchmark in a spawned subprocess and return its result record"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_run_in_child, args=(name, corpus, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return descriptions of benchmarks whose throughput regressed beyond tolerance"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in ("paragraphs_per_s", "mb_per_s", "docs_per_s"):
+            if previous.get(metric) and current[metric] < previous[metric] * (1 - tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MakeAIDatasets benchmark suite")
+    parser.add_argument("--docs", type=int, default=5, help="Documents per format (default: 5)")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Paragraphs per document (default: 200)")
+    parser.add_argument("--only", type=str, default="*", help="Glob selecting benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark; the fastest is kept")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"), help="Results JSON path")
+    parser.add_argument("--baseline", type=Path, default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop vs baseline (default: 0.2)")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    selected = [name for name in BENCHMARKS if fnmatch.fnmatch(name, args.only)]
+    corpus_dir = Path(tempfile.mkdtemp(prefix="bench_corpus_"))
+    try:
+        corpus = generate_corpus(corpus_dir, args.docs, args.paragraphs)
+        results = {}
+        for name in selected:
+            result = run_benchmark(name, corpus, args.repeat)
+            results[name] = result
+            if "error" in result:
+                print(f"{name:32s} ERROR {result['error']}")
+            else:
+                print(f"{name:32s} {result['seconds']:8.3f}s {result['docs_per_s']:9.1f} docs/s "
+                      f"{result['mb_per_s']:8.2f} MB/s {result['paragraphs_per_s']:10.1f} para/s "
+                      f"{result['peak_rss_mb']:8.1f} MB RSS")
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "docs_per_format": args.docs,
+            "paragraphs_per_doc": args.paragraphs,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
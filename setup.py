@@ -14,6 +14,8 @@ setup(
         "pytesseract",
         "datasets",
         "lingua-language-detector",
+        "numpy",
+        "pyarrow",
     ],
     python_requires=">=3.6",
 )
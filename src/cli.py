@@ -1,16 +1,78 @@
 import argparse
-from src.main import main
+from src.utils.output_writers import OUTPUT_FORMATS, PARQUET_COMPRESSIONS
+from src.processors.text_normalizer import CLEAN_LEVELS
+from src.utils.file_discovery import parse_shard
+from src.processors.pdf_backends import PDF_BACKENDS
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="MakeAIDatasets CLI")
     action_group = parser.add_mutually_exclusive_group(required=True)
     action_group.add_argument("--process", action="store_true", help="Process all input files")
+    action_group.add_argument("--watch", action="store_true",
+                              help="Keep running and process files as they are added to the input directory")
     action_group.add_argument("--build-dataset", action="store_true", help="Build Hugging Face dataset")
     action_group.add_argument("--upload-hf", action="store_true", help="Upload dataset to Hugging Face Hub")
 
+    input_group = parser.add_argument_group("Input options")
+    input_group.add_argument("--include", action="append", default=[], metavar="GLOB",
+                             help="Only process files matching this glob, e.g. '*.pdf' or 'books/*' (repeatable)")
+    input_group.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                             help="Skip files and directories matching this glob (repeatable)")
+    input_group.add_argument("--shard", type=str, default=None, metavar="I/N",
+                             help="Process only shard I of N (0-based), to split one input tree across N machines")
+
+    input_group.add_argument("--pdf-backend", type=str, choices=["auto", *PDF_BACKENDS], default=None,
+                             help="PDF text engine: pypdfium2 (fast), pypdf2, pdfminer (layout-aware, slow) "
+                                  "or auto (default: PDF_BACKEND or auto)")
+
     filter_group = parser.add_argument_group("Filtering options")
-    filter_group.add_argument("--lang", type=str, default="en", help="Language code to filter (default: en)")
-    filter_group.add_argument("--output-format", type=str, choices=["txt", "json", "csv"], default="txt", help="Output format")
+    filter_group.add_argument("--lang", type=str, default="en",
+                              help="Comma-separated ISO 639-1 codes to keep, e.g. en,de, or 'auto' for all (default: en)")
+    filter_group.add_argument("--fast-detection", action="store_true",
+                              help="Use Lingua's low-accuracy mode: faster, less reliable on short lines")
+    filter_group.add_argument("--split-by-language", action="store_true",
+                              help="Write one output file per detected language "
+                                   "(output/language_shards/<name>_<lang>_cleaned.<format>)")
+    filter_group.add_argument("--detect-batch-size", type=int, default=256, help="Lines per language detection batch (default: 256)")
+    filter_group.add_argument("--parallel-detection", action="store_true", help="Run language detection multi-threaded")
+    filter_group.add_argument("--no-prefilter", action="store_true", help="Send every line to the language model, skipping heuristics")
+    filter_group.add_argument("--clean-level", type=str, choices=CLEAN_LEVELS, default="basic",
+                              help="Text normalization preset (default: basic)")
+    filter_group.add_argument("--dedup", type=str, choices=["off", "document", "corpus"], default="off",
+                              help="Remove exact/near-duplicate paragraphs per document or across the corpus (default: off)")
+    filter_group.add_argument("--output-format", type=str, choices=OUTPUT_FORMATS, default="txt", help="Output format")
+
+    output_group = parser.add_argument_group("Output options")
+    output_group.add_argument("--row-group-size", type=int, default=10000,
+                              help="Paragraphs per Parquet row group / Arrow record batch (default: 10000)")
+    output_group.add_argument("--parquet-compression", type=str, choices=PARQUET_COMPRESSIONS, default="zstd",
+                              help="Parquet compression codec (default: zstd)")
+
+    dataset_group = parser.add_argument_group("Dataset options")
+    dataset_group.add_argument("--chunk-tokens", type=int, default=None, metavar="N",
+                               help="Pack consecutive paragraphs into samples of at most N tokens "
+                                    "(default: one sample per paragraph)")
+    dataset_group.add_argument("--chunk-overlap", type=int, default=0, metavar="N",
+                               help="Tokens of trailing sentences repeated at the start of the next sample (default: 0)")
+    dataset_group.add_argument("--tokenizer", type=str, default=None, metavar="SPEC",
+                               help="Token counter for --chunk-tokens: whitespace, bytes, tiktoken:<encoding> or "
+                                    "hf:<model> (default: CHUNK_TOKENIZER or whitespace)")
+
+    perf_group = parser.add_argument_group("Performance options")
+    perf_group.add_argument("--executor", type=str, choices=["thread", "process"], default="thread",
+                            help="Parallel execution engine: thread pool or process pool (default: thread)")
+    perf_group.add_argument("--dataset-shard-size", type=str, default=None,
+                            help="Maximum size of each dataset shard, e.g. 500MB (default: DATASET_SHARD_SIZE or 500MB)")
+    perf_group.add_argument("--force", action="store_true",
+                            help="Reprocess all files, ignoring the processing cache")
 
     args = parser.parse_args()
+    try:
+        parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.chunk_tokens is not None and not 0 <= args.chunk_overlap < args.chunk_tokens:
+        parser.error("--chunk-tokens must be positive and --chunk-overlap between 0 and --chunk-tokens - 1")
+    # Imported after parsing so --help and usage errors return immediately
+    from src.main import main
     main(args)
@@ -2,48 +2,96 @@
 
 import os
 import json
+import time
 import logging
-from pathlib import Path
-from typing import Optional, Dict, List
+import importlib
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Optional, Dict, List, Tuple, Iterable, Iterator, Callable, TYPE_CHECKING
 import concurrent.futures
 
-from datasets import Dataset
+# Heavy dependencies (datasets, Lingua, numpy and the per-format parsing
+# libraries) are imported only when a stage needs them, so that the CLI
+# starts quickly; these imports are for type checkers only
+if TYPE_CHECKING:
+    from datasets import Dataset
+    from src.processors.text_cleaner import TextCleaner
+    from src.processors.deduplicator import Deduplicator
 
-from src.processors.pdf_processor import process_pdf
-from src.processors.epub_processor import process_epub
-from src.processors.docx_processor import process_docx
-from src.processors.html_processor import process_html
-from src.processors.txt_processor import process_txt
-from src.processors.text_cleaner import TextCleaner
-from src.utils.filetype_detector import detect_file_type
+from src.processors.text_normalizer import CLEAN_LEVELS
+from src.processors.pdf_backends import PDF_BACKENDS, resolve_backend
+from src.utils.filetype_detector import detect_file_type, COMPRESSED_SUFFIXES
 from src.utils.summary_report import generate_summary_report
+from src.utils.processing_cache import ProcessingCache, hash_file, PIPELINE_VERSION
+from src.utils.job_manifest import JobManifest
+from src.utils.file_discovery import iter_input_files, parse_shard, relative_input_path
+from src.utils.output_writers import WRITERS, OUTPUT_FORMATS, PARQUET_COMPRESSIONS
+from src.utils.metrics import StageTimer, METRICS
 
 # Configuration constants
 INPUT_DIR = Path("input")
 OUTPUT_DIR = Path("output")
 DATASET_DIR = Path("dataset")
 META_DIR = OUTPUT_DIR / "metadata"
+CLEANED_DIR = OUTPUT_DIR / "cleaned_texts"
+# Per-language outputs of --split-by-language, kept apart from the combined outputs
+SHARD_DIR = OUTPUT_DIR / "language_shards"
 MODEL_DIR = Path("models")
+CACHE_DIR = OUTPUT_DIR / "cache"
+DEDUP_INDEX = OUTPUT_DIR / "dedup_index.sqlite"
+MANIFEST_PATH = OUTPUT_DIR / "manifest.sqlite"
 
-# Ensure directories exist
-INPUT_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-DATASET_DIR.mkdir(exist_ok=True)
-META_DIR.mkdir(exist_ok=True)
-MODEL_DIR.mkdir(exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(levelname)s] %(asctime)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
+def configure_logging() -> None:
+    """Set up the pipeline's log format (no-op if logging is already configured)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(levelname)s] %(asctime)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+def ensure_directories() -> None:
+    """Create the input, output and dataset directories used by the pipeline"""
+    for directory in (INPUT_DIR, OUTPUT_DIR, DATASET_DIR, META_DIR, MODEL_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+def _lazy_extractor(module: str, name: str) -> Callable[..., Iterator[str]]:
+    """Extractor that imports its processor module, and the libraries behind it, on first use"""
+    def extractor(file_path: Path, meta: Optional[Dict] = None) -> Iterator[str]:
+        return getattr(importlib.import_module(module), name)(file_path, meta)
+    extractor.__name__ = name
+    return extractor
+
+# Streaming extractors by detected format; each yields text chunks and fills a meta dict
+EXTRACTORS = {
+    "pdf": _lazy_extractor("src.processors.pdf_processor", "iter_pdf"),
+    "epub": _lazy_extractor("src.processors.epub_processor", "iter_epub"),
+    "txt": _lazy_extractor("src.processors.txt_processor", "iter_txt"),
+    "docx": _lazy_extractor("src.processors.docx_processor", "iter_docx"),
+    "html": _lazy_extractor("src.processors.html_processor", "iter_html"),
+    **{container: _lazy_extractor("src.processors.archive_processor", "iter_archive")
+       for container in ("gzip", "bz2", "zstd", "zip")},
+}
+
+def _output_stem(file: Path) -> Tuple[PurePosixPath, str]:
+    """Relative directory and base name of a file's outputs (book.txt.gz -> book)"""
+    relative = relative_input_path(file, INPUT_DIR)
+    stem = relative.stem
+    if relative.suffix.lower() in COMPRESSED_SUFFIXES:
+        stem = PurePosixPath(stem).stem
+    return relative.parent, stem
+
+def metadata_path(file: Path) -> Path:
+    """Path of a file's metadata JSON, mirroring its location under INPUT_DIR"""
+    parent, stem = _output_stem(file)
+    return META_DIR / parent / f"{stem}_metadata.json"
+
 def save_metadata(file: Path, metadata: Dict) -> bool:
     """Save processing metadata to JSON file"""
     try:
-        meta_file = META_DIR / f"{file.stem}_metadata.json"
+        meta_file = metadata_path(file)
+        meta_file.parent.mkdir(parents=True, exist_ok=True)
         with open(meta_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
         logger.info(f"Metadata saved: {meta_file.name}")
@@ -52,162 +100,690 @@ def save_metadata(file: Path, metadata: Dict) -> bool:
         logger.error(f"Metadata save failed: {str(e)}")
         return False
 
-def save_cleaned_text(output_file, english_paragraphs, output_format="txt"):
-    """Save cleaned text in the specified output format."""
-    output_file.parent.mkdir(exist_ok=True)
-    if output_format == "txt":
-        with output_file.open('w', encoding='utf-8') as f:
-            f.write("\n".join(english_paragraphs))
-    elif output_format == "json":
-        import json
-        with output_file.open('w', encoding='utf-8') as f:
-            json.dump(english_paragraphs, f, ensure_ascii=False, indent=2)
-    elif output_format == "csv":
-        import csv
-        with output_file.open('w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f)
-            for p in english_paragraphs:
-                writer.writerow([p])
-    else:
+def save_cleaned_text(output_file: Path, english_paragraphs: Iterable[str], output_format="txt", **writer_options) -> int:
+    """Save cleaned text in the specified output format.
+
+    Paragraphs are written as they arrive, so an iterator is never
+    materialized. Output goes to a temporary file that replaces output_file
+    only if at least one paragraph was written. writer_options (e.g.
+    row_group_size, compression) are passed to the format's writer.
+    Returns the paragraph count.
+    """
+    writer = WRITERS.get(output_format)
+    if writer is None:
         raise ValueError(f"Unsupported output format: {output_format}")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_name(f".{output_file.name}.tmp{os.getpid()}-{threading.get_ident()}")
+    try:
+        count = writer(tmp_file, english_paragraphs, **writer_options)
+        if count:
+            os.replace(tmp_file, output_file)
+        return count
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+def cleaned_output_path(file: Path, output_format: str = "txt", language: Optional[str] = None) -> Path:
+    """Path of a file's cleaned output, or of its per-language shard when language is given
+
+    The output mirrors the file's location under INPUT_DIR, so input/a/book.pdf
+    and input/b/book.pdf do not overwrite each other. Shards go to a separate
+    tree (SHARD_DIR/a/book_en_cleaned.txt), so they are never mistaken for the
+    output of an input named book_en.
+    """
+    parent, stem = _output_stem(file)
+    if language:
+        return SHARD_DIR / parent / f"{stem}_{language}_cleaned.{output_format}"
+    return CLEANED_DIR / parent / f"{stem}_cleaned.{output_format}"
+
+def save_language_shards(shard_path: Callable[[str], Path], paragraphs: Iterable[str], output_format="txt",
+                         **writer_options) -> Dict[str, int]:
+    """Route language-tagged paragraphs into one output per language in a single pass.
+
+    Paragraphs are appended to a temporary spill file per language as they
+    arrive; each spill is then streamed through save_cleaned_text to
+    shard_path(language). Untagged paragraphs go to the "und" shard.
+    Returns the paragraph count per language.
+    """
+    from src.processors.language_detector import TaggedParagraph
+
+    spills = {}
+    suffix = f".spill{os.getpid()}-{threading.get_ident()}"
+    try:
+        for paragraph in paragraphs:
+            language = getattr(paragraph, "language", None) or "und"
+            spill = spills.get(language)
+            if spill is None:
+                target = shard_path(language)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                spill = spills[language] = open(target.with_name(f".{target.name}{suffix}"), 'w', encoding='utf-8')
+            spill.write(paragraph)
+            spill.write("\n")
+
+        counts = {}
+        for language, spill in spills.items():
+            spill.close()
+            with open(spill.name, encoding='utf-8') as f:
+                shard = (TaggedParagraph(line[:-1], language) for line in f)
+                counts[language] = save_cleaned_text(shard_path(language), shard, output_format, **writer_options)
+        return counts
+    finally:
+        for spill in spills.values():
+            spill.close()
+            Path(spill.name).unlink(missing_ok=True)
+
+def _count_languages(items: Iterable[str], counts: Dict[str, int]) -> Iterator[str]:
+    """Pass paragraphs through while counting them per language tag"""
+    for item in items:
+        language = getattr(item, "language", None) or "und"
+        counts[language] = counts.get(language, 0) + 1
+        yield item
+
+def _record_sections(paragraphs: Iterable[str], meta: Dict) -> Iterator[str]:
+    """Pass paragraphs through, adding the first and last output paragraph of each section to meta["chapters"]
+
+    Paragraphs are numbered in output order (as in Chunk.first_paragraph);
+    sections none of whose paragraphs are kept get no positions.
+    """
+    for position, paragraph in enumerate(paragraphs):
+        section = getattr(paragraph, "section", None)
+        chapters = meta.get("chapters")
+        if section is not None and chapters and section < len(chapters):
+            chapters[section].setdefault("first_paragraph", position)
+            chapters[section]["last_paragraph"] = position
+        yield paragraph
+
+def _count_items(items: Iterable[str], stats: Dict, key: str) -> Iterator[str]:
+    """Pass items through while counting them (and their characters) into stats"""
+    for item in items:
+        stats[key] += 1
+        stats[f"{key}_chars"] += len(item)
+        yield item
+
+def _report_progress(items: Iterable[str], progress: Callable[..., None], every: int = 1000) -> Iterator[str]:
+    """Pass items through, reporting the running paragraph count every `every` items"""
+    count = 0
+    for item in items:
+        count += 1
+        if count % every == 0:
+            progress(paragraphs=count)
+        yield item
+    progress(paragraphs=count)
+
+def _source_fields(file: Path) -> Dict[str, str]:
+    """Metadata fields that depend on the file's name and location rather than its content"""
+    return {"source_file": file.name, "source_path": str(relative_input_path(file, INPUT_DIR))}
+
+def process_single_file(file: Path, text_cleaner: "TextCleaner", output_format="txt",
+                        cache: Optional[ProcessingCache] = None, force: bool = False,
+                        writer_options: Optional[Dict] = None,
+                        progress: Optional[Callable[..., None]] = None,
+                        deduplicator: Optional["Deduplicator"] = None, split_languages: bool = False,
+                        manifest: Optional[JobManifest] = None) -> bool:
+    """Process individual book file through the pipeline
 
-def process_single_file(file: Path, text_cleaner: TextCleaner, output_format="txt") -> bool:
-    """Process individual book file through the pipeline"""
+    With a cache, files whose content and processing config are unchanged
+    reuse their cached cleaned output and metadata (with the source name and
+    path of this file); force=True reprocesses them anyway and refreshes the
+    cache entry. The cache is not used with corpus-wide deduplication, whose
+    results depend on the index. progress, if given, is called with keyword
+    updates (paragraphs=<count>) while the file is processed.
+    deduplicator, if given, drops exact and near-duplicate paragraphs within
+    the file and, when it has a corpus index, across files. Paragraphs are
+    tagged with their language; with split_languages=True each language is
+    written to its own output shard, and structured formats get a language
+    column whenever more than one language can be kept.
+
+    Per-stage durations and counts are stored under "stages" in the metadata
+    (the metadata write itself is only reported to the metrics registry).
+    With a manifest, the file is marked running on start and its outcome,
+    timings and any error are recorded when it finishes.
+    """
+    timer = StageTimer()
+    status = "failed"
+    error = None
+    metadata = None
+    start = time.perf_counter()
     try:
         logger.info(f"Processing: {file.name}")
         
         if not file.exists():
             logger.error(f"File not found: {file}")
+            error = "File not found"
             return False
+        if manifest is not None:
+            manifest.start(file)
+
+        output_file = cleaned_output_path(file, output_format)
+        meta_file = metadata_path(file)
+        shard_path = lambda language: cleaned_output_path(file, output_format, language)
+        writer_options = {"language_column": len(text_cleaner.languages) != 1, **(writer_options or {})}
+        content_hash = None
+        cache_key = None
+        # Corpus dedup decisions depend on the index's state, not just the file, and
+        # a cache hit would skip registering the file's paragraphs in the index
+        if deduplicator is not None and deduplicator.index_path is not None:
+            cache = None
+        if cache is not None:
+            content_hash = hash_file(file)
+            cache_key = cache.make_key(content_hash, {
+                "cleaner": text_cleaner.config,
+                "output_format": output_format,
+                "writer_options": writer_options,
+                "dedup": deduplicator.config if deduplicator else None,
+                "split_languages": split_languages,
+                "pdf_backend": resolve_backend()
+            })
+            restore_shards = shard_path if split_languages else None
+            metadata = None if force else cache.restore(cache_key, output_file, meta_file, shard_path=restore_shards)
+            if metadata is not None:
+                # The entry may come from another file with the same content
+                metadata.update(_source_fields(file))
+                if "language_shards" in metadata:
+                    metadata["language_shards"] = {language: shard_path(language).name
+                                                   for language in metadata["language_shards"]}
+                if not save_metadata(file, metadata):
+                    error = "Metadata save failed"
+                    return False
+                logger.info(f"Cache hit, reused output for {file.name}")
+                status = "cached"
+                return True
             
         # Initialize processing variables
-        raw_text = ""
-        ocr_used = False
         file_meta = {}
-        source_format = detect_file_type(file)
+        with timer.stage("detect_type"):
+            source_format = detect_file_type(file)
         
         logger.info(f"Detected format: {source_format}")
         
         # File type routing
-        try:
-            if source_format == "pdf":
-                raw_text, ocr_used, file_meta = process_pdf(file)
-            elif source_format == "epub":
-                raw_text = process_epub(file)
-            elif source_format == "txt":
-                raw_text = process_txt(file)
-            elif source_format == "docx":
-                raw_text = process_docx(file)
-            elif source_format == "html":
-                raw_text = process_html(file)
-            else:
-                logger.warning(f"Unsupported format: {file.name}")
-                return False
-        except Exception as e:
-            logger.error(f"Processing failed for {file.name}: {str(e)}")
+        extractor = EXTRACTORS.get(source_format)
+        if extractor is None:
+            logger.warning(f"Unsupported format: {file.name}")
+            error = f"Unsupported format: {source_format}"
             return False
             
-        if not raw_text:
-            logger.warning(f"No text extracted from {file.name}")
-            return False
-            
-        # Text processing pipeline
+        # Streaming text pipeline: extract -> clean -> filter -> write, one chunk at a time
         try:
-            cleaned_paragraphs = text_cleaner.clean_text(raw_text)
-            english_paragraphs = text_cleaner.filter_english(cleaned_paragraphs)
-            english_ratio = f"{len(english_paragraphs)}/{len(cleaned_paragraphs)}"
-            
-            logger.info(f"Processed {len(cleaned_paragraphs)} paragraphs, {english_ratio} in English")
+            stats = {"raw": 0, "raw_chars": 0, "cleaned": 0, "cleaned_chars": 0, "english": 0, "english_chars": 0,
+                     "unique": 0, "unique_chars": 0}
+            raw_chunks = timer.timed_iter(_count_items(extractor(file, file_meta), stats, "raw"), "extract")
+            cleaned_paragraphs = timer.timed_iter(
+                _count_items(text_cleaner.iter_clean(raw_chunks), stats, "cleaned"), "clean")
+            english_paragraphs = timer.timed_iter(
+                _count_items(text_cleaner.iter_filter_english(cleaned_paragraphs), stats, "english"), "language_filter")
+            stage_chain = ["extract", "clean", "language_filter"]
+            dedup_doc = None
+            if deduplicator is not None:
+                dedup_doc = deduplicator.document(str(relative_input_path(file, INPUT_DIR)))
+                english_paragraphs = timer.timed_iter(
+                    _count_items(dedup_doc.iter_unique(english_paragraphs), stats, "unique"), "dedup")
+                stage_chain.append("dedup")
+            english_paragraphs = _record_sections(english_paragraphs, file_meta)
+            language_counts: Dict[str, int] = {}
+            english_paragraphs = _count_languages(english_paragraphs, language_counts)
+            if progress is not None:
+                english_paragraphs = _report_progress(english_paragraphs, progress)
+            with timer.stage("write"):
+                if split_languages:
+                    save_language_shards(shard_path, english_paragraphs, output_format, **writer_options)
+                else:
+                    save_cleaned_text(output_file, english_paragraphs, output_format, **writer_options)
+            shards = {language: shard_path(language) for language in language_counts} if split_languages else {}
+
+            # Stages ran interleaved; convert inclusive timings into per-stage self time
+            timer.exclusive(stage_chain + ["write"])
+            ocr_seconds = file_meta.pop("ocr_seconds", 0.0)
+            if ocr_seconds:
+                timer.stages["extract"]["seconds"] = max(0.0, timer.stages["extract"]["seconds"] - ocr_seconds)
+                timer.add("ocr", ocr_seconds, pages=file_meta.get("ocr_pages", 0))
+            timer.add("extract", chunks=stats["raw"], characters=stats["raw_chars"])
+            timer.add("clean", paragraphs=stats["cleaned"], characters=stats["cleaned_chars"])
+            timer.add("language_filter", paragraphs=stats["english"], characters=stats["english_chars"])
+            if dedup_doc is not None:
+                timer.add("dedup", paragraphs=stats["unique"], duplicates=dedup_doc.duplicates)
+            written = list(shards.values()) if split_languages else [output_file]
+            timer.add("write", bytes=sum(f.stat().st_size for f in written if f.exists()))
+
+            if not stats["raw_chars"]:
+                logger.warning(f"No text extracted from {file.name}")
+                error = "No text extracted"
+                return False
+
+            english_ratio = f"{stats['english']}/{stats['cleaned']}"
+            target = ", ".join(text_cleaner.languages) or "any language"
+            logger.info(f"Processed {stats['cleaned']} paragraphs, {english_ratio} in {target}")
             
-            if not english_paragraphs:
+            kept = stats["unique"] if dedup_doc is not None else stats["english"]
+            kept_chars = stats["unique_chars"] if dedup_doc is not None else stats["english_chars"]
+            if dedup_doc is not None:
+                logger.info(f"Removed {dedup_doc.duplicates} duplicate paragraphs")
+            if not kept:
                 logger.warning(f"No valid paragraphs found in {file.name}")
+                error = "No valid paragraphs"
                 return False
                 
-            # Save cleaned text
-            output_file = OUTPUT_DIR / "cleaned_texts" / f"{file.stem}_cleaned.{output_format}"
-            save_cleaned_text(output_file, english_paragraphs, output_format)
-            logger.info(f"Cleaned text saved: {output_file.name}")
+            if split_languages:
+                logger.info(f"Cleaned text saved: {', '.join(f.name for f in shards.values())}")
+            else:
+                logger.info(f"Cleaned text saved: {output_file.name}")
             
             # Generate and save metadata
+            ocr_used = file_meta.pop("ocr_used", False)
             metadata = {
-                "source_file": file.name,
+                **_source_fields(file),
                 "source_format": source_format,
-                "paragraph_count": len(english_paragraphs),
-                "character_count": sum(len(p) for p in english_paragraphs),
+                "paragraph_count": kept,
+                "character_count": kept_chars,
                 "english_ratio": english_ratio,
                 "ocr_used": ocr_used,
-                **file_meta
+                "languages": dict(sorted(language_counts.items(), key=lambda kv: -kv[1])),
+                **file_meta,
+                "stages": timer.as_dict()
             }
-            return save_metadata(file, metadata)
+            if dedup_doc is not None:
+                metadata["duplicates_removed"] = {
+                    "exact": dedup_doc.exact_duplicates,
+                    "near": dedup_doc.near_duplicates,
+                    "corpus": dedup_doc.corpus_duplicates
+                }
+            if split_languages:
+                metadata["language_shards"] = {language: f.name for language, f in shards.items()}
+            if content_hash:
+                metadata["content_hash"] = content_hash
+            with timer.stage("metadata"):
+                if not save_metadata(file, metadata):
+                    error = "Metadata save failed"
+                    return False
+            if cache_key:
+                if split_languages:
+                    cache.store(cache_key, None, meta_file, shards=shards)
+                else:
+                    cache.store(cache_key, output_file, meta_file)
+            status = "success"
+            return True
             
         except Exception as e:
             logger.error(f"Text processing failed for {file.name}: {str(e)}")
+            error = f"Text processing failed: {str(e)}"
             return False
             
     except Exception as e:
         logger.error(f"Unexpected error processing {file.name}: {str(e)}")
+        error = f"Unexpected error: {str(e)}"
         return False
+    finally:
+        METRICS.record_file(status, timer.stages)
+        if manifest is not None:
+            try:
+                stages = metadata.get("stages") if metadata else timer.as_dict()
+                manifest.finish(file, status, time.perf_counter() - start, stages, metadata, error)
+            except Exception as e:
+                logger.error(f"Manifest update failed for {file.name}: {str(e)}")
+
+# Per-process cleaner, built once by _init_process_worker in each pool worker
+_worker_cleaner: Optional["TextCleaner"] = None
+
+def _init_process_worker(cleaner_config: Dict) -> None:
+    """Build one TextCleaner per worker process"""
+    from src.processors.text_cleaner import TextCleaner
+    global _worker_cleaner
+    configure_logging()
+    _worker_cleaner = TextCleaner(**cleaner_config)
 
-def process_batch_files(text_cleaner: TextCleaner, output_format="txt") -> bool:
-    """Process all files in input directory with parallel execution"""
-    files = [f for f in INPUT_DIR.iterdir() if f.is_file()]
-    if not files:
+def _count_discovered(files: Iterable[Path], counts: Dict[str, int]) -> Iterator[Path]:
+    for file in files:
+        counts["files"] += 1
+        yield file
+
+def _iter_chunks(files: Iterable[Path], chunk_size: Optional[int], max_workers: int) -> Iterator[List[Path]]:
+    """Group a stream of files into chunks
+
+    Without a fixed chunk_size the total is unknown up front, so chunks grow
+    with the number of files seen (about a quarter of a chunk per worker per
+    file seen so far, up to 64): small trees are spread file by file across
+    workers, large ones amortize per-chunk IPC.
+    """
+    chunk: List[Path] = []
+    seen = 0
+    for file in files:
+        chunk.append(file)
+        seen += 1
+        if len(chunk) >= (chunk_size or min(64, max(1, seen // (max_workers * 4)))):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _run_chunk(files: List[Path], text_cleaner: "TextCleaner", options: Dict) -> Tuple[str, int, int, float]:
+    """Process a chunk of files and return (worker id, successes, total, elapsed seconds)
+
+    options are forwarded as keyword arguments to process_single_file.
+    """
+    worker_id = f"{os.getpid()}/{threading.current_thread().name}"
+    start = time.perf_counter()
+    success_count = 0
+    for file in files:
+        try:
+            if process_single_file(file, text_cleaner, **options):
+                success_count += 1
+        except Exception as e:
+            logger.error(f"Error processing {file.name}: {str(e)}")
+    return worker_id, success_count, len(files), time.perf_counter() - start
+
+def _run_chunk_in_process(files: List[Path], options: Dict) -> Tuple[str, int, int, float, Dict]:
+    """Process a chunk of files with the cleaner owned by this worker process
+
+    The worker's stage metrics for the chunk are returned with the result,
+    since METRICS in this process is invisible to the parent.
+    """
+    return (*_run_chunk(files, _worker_cleaner, options), METRICS.drain())
+
+def _chunk_result(future: concurrent.futures.Future) -> Tuple[str, int, int, float]:
+    """(worker id, successes, total, elapsed seconds) of a chunk, merging metrics sent by a worker process"""
+    result = future.result()
+    if len(result) > 4:
+        METRICS.merge(result[4])
+    return result[:4]
+
+def _log_worker_throughput(worker_stats: Dict[str, List[float]]) -> None:
+    """Log files processed and files/s for every worker"""
+    for worker_id, (files_done, elapsed) in sorted(worker_stats.items()):
+        rate = files_done / elapsed if elapsed > 0 else 0.0
+        logger.info(f"Worker {worker_id}: {int(files_done)} files in {elapsed:.2f}s ({rate:.2f} files/s)")
+
+def _create_pool(executor: str, max_workers: int, text_cleaner: "TextCleaner") -> concurrent.futures.Executor:
+    """Thread pool sharing text_cleaner, or process pool building one cleaner per worker"""
+    if executor == "process":
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_process_worker,
+            initargs=(text_cleaner.config,)
+        )
+    if executor == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unsupported executor: {executor}")
+
+def _submit_chunk(pool: concurrent.futures.Executor, executor: str, chunk: List[Path],
+                  text_cleaner: "TextCleaner", options: Dict) -> concurrent.futures.Future:
+    if executor == "process":
+        return pool.submit(_run_chunk_in_process, chunk, options)
+    return pool.submit(_run_chunk, chunk, text_cleaner, options)
+
+def process_batch_files(text_cleaner: "TextCleaner", output_format="txt", executor="thread",
+                        chunk_size: Optional[int] = None, cache: Optional[ProcessingCache] = None,
+                        force: bool = False, writer_options: Optional[Dict] = None,
+                        deduplicator: Optional["Deduplicator"] = None, split_languages: bool = False,
+                        manifest: Optional[JobManifest] = None, include: Iterable[str] = (),
+                        exclude: Iterable[str] = (), shard: Optional[Tuple[int, int]] = None) -> bool:
+    """Process all files under the input directory with parallel execution
+
+    Files are discovered recursively and submitted while the tree is still
+    being walked (see iter_input_files for include/exclude globs and
+    shard=(i, N)); at most a few chunks per worker are queued at a time.
+    executor="thread" shares text_cleaner across a thread pool; executor="process"
+    forks a process pool once, builds one TextCleaner per worker and feeds it
+    chunks of files, sidestepping the GIL for CPU-bound stages.
+    With a manifest, files it records as done (unchanged, same settings) are
+    skipped unless force=True, so an interrupted run resumes where it stopped.
+    """
+    discovered = {"files": 0}
+    files = _count_discovered(iter_input_files(INPUT_DIR, include, exclude, shard), discovered)
+    if manifest is not None and not force:
+        files = manifest.iter_pending(files)
+
+    max_workers = int(os.getenv("MAX_WORKERS", os.cpu_count()))
+    pool = _create_pool(executor, max_workers, text_cleaner)
+    if executor == "process":
+        chunk_size = chunk_size or int(os.getenv("CHUNK_SIZE", 0)) or None
+    else:
+        chunk_size = chunk_size or 1
+    logger.info(f"Processing files from {INPUT_DIR}{f' (shard {shard[0]}/{shard[1]})' if shard else ''} "
+                f"with {max_workers} {executor} workers")
+
+    options = {"output_format": output_format, "cache": cache, "force": force, "writer_options": writer_options,
+               "deduplicator": deduplicator, "split_languages": split_languages, "manifest": manifest}
+    success_count = 0
+    submitted = 0
+    worker_stats: Dict[str, List[float]] = {}
+
+    def collect(future: concurrent.futures.Future, chunk: List[Path]) -> None:
+        nonlocal success_count
+        try:
+            worker_id, succeeded, total, elapsed = _chunk_result(future)
+            success_count += succeeded
+            stats = worker_stats.setdefault(worker_id, [0, 0.0])
+            stats[0] += total
+            stats[1] += elapsed
+        except Exception as e:
+            logger.error(f"Error processing chunk starting at {chunk[0].name}: {str(e)}")
+
+    try:
+        with pool:
+            futures = {}
+            for chunk in _iter_chunks(files, chunk_size, max_workers):
+                futures[_submit_chunk(pool, executor, chunk, text_cleaner, options)] = chunk
+                submitted += len(chunk)
+                # Bound the queue so discovery does not run arbitrarily far ahead of processing
+                if len(futures) >= max_workers * 4:
+                    done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, futures.pop(future))
+            for future in concurrent.futures.as_completed(futures):
+                collect(future, futures[future])
+    finally:
+        if cache is not None:
+            cache.evict()
+        if deduplicator is not None:
+            deduplicator.close()
+
+    if not discovered["files"]:
         logger.info("No files found in input directory")
         return False
-    
-    logger.info(f"Processing {len(files)} files with {os.cpu_count()} workers")
-    
-    # Thread-based parallel processing
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=int(os.getenv("MAX_WORKERS", os.cpu_count()))
-    ) as executor:
-        futures = {
-            executor.submit(process_single_file, file, text_cleaner, output_format): file
-            for file in files
-        }
-        
-        success_count = 0
-        for future in concurrent.futures.as_completed(futures):
-            file = futures[future]
-            try:
-                if future.result():
-                    success_count += 1
-            except Exception as e:
-                logger.error(f"Error processing {file.name}: {str(e)}")
-    
-    logger.info(f"Completed {success_count}/{len(files)} files successfully")
+    if submitted < discovered["files"]:
+        logger.info(f"Resuming: {discovered['files'] - submitted} of {discovered['files']} files already done, "
+                    f"{submitted} pending")
+    if not submitted:
+        return True
+    _log_worker_throughput(worker_stats)
+    logger.info(f"Completed {success_count}/{submitted} files successfully")
     return success_count > 0
 
-def build_hf_dataset() -> Optional[Dataset]:
-    """Compile cleaned texts into Hugging Face dataset"""
-    cleaned_files = list((OUTPUT_DIR / "cleaned_texts").glob("*_cleaned.txt"))
-    if not cleaned_files:
-        logger.warning("No cleaned files found for dataset creation")
-        return None
-    
-    all_texts = []
-    for file in cleaned_files:
+# Files processed in watch mode between processing cache evictions
+WATCH_EVICT_EVERY = 100
+
+def watch_input(text_cleaner: "TextCleaner", output_format="txt", executor="thread",
+                cache: Optional[ProcessingCache] = None, writer_options: Optional[Dict] = None,
+                deduplicator: Optional["Deduplicator"] = None, split_languages: bool = False,
+                manifest: Optional[JobManifest] = None, debounce: Optional[float] = None,
+                poll_interval: Optional[float] = None, stop_event: Optional[threading.Event] = None,
+                include: Iterable[str] = (), exclude: Iterable[str] = (),
+                shard: Optional[Tuple[int, int]] = None) -> int:
+    """Process files as they land in the input directory until stopped (Ctrl+C or stop_event)
+
+    One worker pool stays up for the whole session, so the cleaner and its
+    language models are loaded once instead of on every cron run. A file is
+    queued once it has not changed for debounce seconds (WATCH_DEBOUNCE),
+    which keeps partially copied files out; files already present are picked
+    up the same way. With a manifest, files it records as done are skipped,
+    and a file rewritten while it is being processed is queued again once
+    the current run finishes. include/exclude/shard select files as in
+    process_batch_files. Returns the number of files processed.
+    """
+    from src.utils.folder_watcher import FolderWatcher
+
+    debounce = debounce if debounce is not None else float(os.getenv("WATCH_DEBOUNCE", 2.0))
+    poll_interval = poll_interval if poll_interval is not None else float(os.getenv("WATCH_POLL_INTERVAL", 1.0))
+    max_workers = int(os.getenv("MAX_WORKERS", os.cpu_count()))
+    pool = _create_pool(executor, max_workers, text_cleaner)
+    watcher = FolderWatcher(INPUT_DIR, debounce=debounce, poll_interval=poll_interval,
+                            include=include, exclude=exclude, shard=shard)
+    options = {"output_format": output_format, "cache": cache, "force": False, "writer_options": writer_options,
+               "deduplicator": deduplicator, "split_languages": split_languages, "manifest": manifest}
+    lock = threading.Lock()
+    evict_lock = threading.Lock()
+    in_flight: Dict[Path, concurrent.futures.Future] = {}
+    requeue = set()
+    totals = {"processed": 0, "succeeded": 0}
+
+    def submit(file: Path) -> None:
+        with lock:
+            if file in in_flight:
+                requeue.add(file)
+                return
+            if manifest is not None and not manifest.pending([file]):
+                logger.debug(f"Skipping {file.name}: already processed")
+                return
+            logger.info(f"Queued {file.name}")
+            future = _submit_chunk(pool, executor, [file], text_cleaner, options)
+            in_flight[file] = future
+        future.add_done_callback(lambda f: finished(file, f))
+
+    def finished(file: Path, future: concurrent.futures.Future) -> None:
+        try:
+            _, succeeded, _, elapsed = _chunk_result(future)
+            logger.info(f"{'Processed' if succeeded else 'Failed'} {file.name} in {elapsed:.2f}s")
+        except concurrent.futures.CancelledError:
+            succeeded = 0
+        except Exception as e:
+            succeeded = 0
+            logger.error(f"Error processing {file.name}: {str(e)}")
+        with lock:
+            del in_flight[file]
+            totals["processed"] += 1
+            totals["succeeded"] += succeeded
+            again = file in requeue and not pool_closed.is_set()
+            requeue.discard(file)
+            evict = cache is not None and totals["processed"] % WATCH_EVICT_EVERY == 0
+        if evict:
+            with evict_lock:
+                cache.evict()
+        if again and file.exists():
+            submit(file)
+
+    pool_closed = threading.Event()
+    logger.info(f"Watching {INPUT_DIR} with {max_workers} {executor} workers (debounce {debounce}s)")
+    try:
+        watcher.run(submit, stop_event)
+    except KeyboardInterrupt:
+        logger.info("Stopping watch mode")
+    finally:
+        watcher.close()
+        pool_closed.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        if cache is not None:
+            cache.evict()
+        if deduplicator is not None:
+            deduplicator.close()
+    logger.info(f"Watch mode processed {totals['succeeded']}/{totals['processed']} files successfully")
+    return totals["succeeded"]
+
+def _iter_file_paragraphs(file: Path) -> Iterator[str]:
+    """Non-empty lines of a cleaned text file, stripped"""
+    with file.open('r', encoding='utf-8') as f:
+        for line in f:
+            text = line.strip()
+            if text:
+                yield text
+
+def _dataset_files() -> List[Tuple[str, str, int, int]]:
+    """(path, source_file, mtime_ns, size) of the cleaned TXT outputs to compile into a dataset
+
+    Each source contributes either its combined output or, when they were
+    written more recently by a --split-by-language run, its language shards,
+    never both. source_file is the source's path under INPUT_DIR without its
+    extension.
+    """
+    outputs: Dict[str, List[Path]] = {}
+    for f in CLEANED_DIR.rglob("*_cleaned.txt"):
+        outputs[str(relative_input_path(f, CLEANED_DIR))[:-len("_cleaned.txt")]] = [f]
+    shards: Dict[str, List[Path]] = {}
+    for f in SHARD_DIR.rglob("*_cleaned.txt"):
+        source = str(relative_input_path(f, SHARD_DIR))[:-len("_cleaned.txt")].rsplit("_", 1)[0]
+        shards.setdefault(source, []).append(f)
+    for source, files in shards.items():
+        combined = outputs.get(source)
+        if combined is None or max(f.stat().st_mtime_ns for f in files) > combined[0].stat().st_mtime_ns:
+            outputs[source] = sorted(files)
+    return [(str(f), source, f.stat().st_mtime_ns, f.stat().st_size)
+            for source in sorted(outputs) for f in outputs[source]]
+
+def _iter_dataset_rows(files: List[Tuple[str, str, int, int]], chunking: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield one dataset row per non-empty line of each cleaned file, or per token-bounded chunk
+
+    files holds (path, source_file, mtime_ns, size) tuples from _dataset_files;
+    the last two fields only serve to change the datasets cache fingerprint
+    when a cleaned file changes. paragraph_index counts within each file (for
+    language shards, within the shard). With chunking ({"max_tokens",
+    "overlap_tokens", "tokenizer"}), each file's paragraphs are packed into
+    chunks as they are read and paragraph_index is the chunk's first paragraph.
+    """
+    count = None
+    if chunking:
+        from src.processors.chunker import get_token_counter, iter_token_chunks
+        count = get_token_counter(chunking.get("tokenizer"))
+    for path, source_file, _, _ in files:
+        file = Path(path)
         try:
-            with file.open('r', encoding='utf-8') as f:
-                all_texts.extend(line.strip() for line in f if line.strip())
+            if not chunking:
+                for paragraph_index, text in enumerate(_iter_file_paragraphs(file)):
+                    yield {"text": text, "source_file": source_file, "paragraph_index": paragraph_index}
+                continue
+            chunks = iter_token_chunks(_iter_file_paragraphs(file), chunking["max_tokens"],
+                                       chunking.get("overlap_tokens", 0), count)
+            for chunk_index, chunk in enumerate(chunks):
+                yield {"text": chunk.text, "source_file": source_file, "paragraph_index": chunk.first_paragraph,
+                       "chunk_index": chunk_index, "token_count": chunk.tokens}
         except Exception as e:
             logger.error(f"Error reading {file.name}: {str(e)}")
-    
-    if not all_texts:
-        logger.error("No valid text collected for dataset")
+
+def build_hf_dataset(max_shard_size: Optional[str] = None, chunk_tokens: Optional[int] = None,
+                     chunk_overlap: int = 0, tokenizer: Optional[str] = None) -> Optional["Dataset"]:
+    """Compile cleaned texts into Hugging Face dataset
+
+    Rows are streamed into Arrow via Dataset.from_generator, so memory stays
+    constant regardless of corpus size, and the result is saved in shards of
+    at most max_shard_size (DATASET_SHARD_SIZE, default 500MB). Each row
+    carries its source file and paragraph index for provenance. With
+    chunk_tokens, rows are samples of up to that many tokens (counted with
+    tokenizer, see chunker.get_token_counter) built from consecutive
+    paragraphs of a file, overlapping by up to chunk_overlap tokens.
+    """
+    from datasets import Dataset, Features, Value
+
+    file_states = _dataset_files()
+    if not file_states:
+        logger.warning("No cleaned files found for dataset creation")
         return None
-    
+
+    columns = {"text": Value("string"), "source_file": Value("string"), "paragraph_index": Value("int64")}
+    chunking = None
+    if chunk_tokens:
+        chunking = {"max_tokens": chunk_tokens, "overlap_tokens": chunk_overlap,
+                    "tokenizer": tokenizer or os.getenv("CHUNK_TOKENIZER", "whitespace")}
+        columns.update({"chunk_index": Value("int64"), "token_count": Value("int64")})
+    features = Features(columns)
+    num_proc = int(os.getenv("DATASET_NUM_PROC", 1))
+
     # Create and save dataset
     try:
-        dataset = Dataset.from_dict({"text": all_texts})
-        dataset.save_to_disk(str(DATASET_DIR))
-        logger.info(f"Dataset saved with {len(all_texts)} samples")
+        dataset = Dataset.from_generator(
+            _iter_dataset_rows,
+            features=features,
+            gen_kwargs={"files": file_states, "chunking": chunking},
+            num_proc=num_proc if num_proc > 1 and len(file_states) > 1 else None
+        )
+        if len(dataset) == 0:
+            logger.error("No valid text collected for dataset")
+            return None
+        dataset.save_to_disk(str(DATASET_DIR), max_shard_size=max_shard_size or os.getenv("DATASET_SHARD_SIZE", "500MB"))
+        logger.info(f"Dataset saved with {len(dataset)} samples from {len(file_states)} files")
         return dataset
     except Exception as e:
         logger.error(f"Dataset creation failed: {str(e)}")
         return None
 
-def upload_to_hf_hub(dataset: Dataset) -> bool:
+def upload_to_hf_hub(dataset: "Dataset") -> bool:
     """Upload dataset to Hugging Face Hub"""
     try:
         from huggingface_hub import login
@@ -233,27 +809,98 @@ def download_language_model():
 
 def main(args=None):
     """Main execution pipeline for MakeAIDatasets"""
+    configure_logging()
     logger.info("Starting MakeAIDatasets processing pipeline")
     import sys
     if args is None:
         import argparse
         parser = argparse.ArgumentParser()
         parser.add_argument("--lang", type=str, default="en")
-        parser.add_argument("--output-format", type=str, choices=["txt", "json", "csv"], default="txt")
+        parser.add_argument("--fast-detection", action="store_true")
+        parser.add_argument("--split-by-language", action="store_true")
+        parser.add_argument("--output-format", type=str, choices=OUTPUT_FORMATS, default="txt")
+        parser.add_argument("--row-group-size", type=int, default=10000)
+        parser.add_argument("--parquet-compression", type=str, choices=PARQUET_COMPRESSIONS, default="zstd")
+        parser.add_argument("--executor", type=str, choices=["thread", "process"], default="thread")
+        parser.add_argument("--force", action="store_true")
+        parser.add_argument("--detect-batch-size", type=int, default=256)
+        parser.add_argument("--parallel-detection", action="store_true")
+        parser.add_argument("--no-prefilter", action="store_true")
+        parser.add_argument("--clean-level", type=str, choices=CLEAN_LEVELS, default="basic")
+        parser.add_argument("--dataset-shard-size", type=str, default=None)
+        parser.add_argument("--chunk-tokens", type=int, default=None)
+        parser.add_argument("--chunk-overlap", type=int, default=0)
+        parser.add_argument("--tokenizer", type=str, default=None)
+        parser.add_argument("--dedup", type=str, choices=["off", "document", "corpus"], default="off")
+        parser.add_argument("--watch", action="store_true")
+        parser.add_argument("--include", action="append", default=[])
+        parser.add_argument("--exclude", action="append", default=[])
+        parser.add_argument("--shard", type=str, default=None)
+        parser.add_argument("--pdf-backend", type=str, choices=["auto", *PDF_BACKENDS], default=None)
         args = parser.parse_args()
-    # Initialize components
-    text_cleaner = TextCleaner()
+    ensure_directories()
     # Processing stage
     output_format = getattr(args, "output_format", "txt")
-    if hasattr(args, "process") and args.process:
-        if not process_batch_files(text_cleaner, output_format=output_format):
+    executor = getattr(args, "executor", "thread")
+    force = getattr(args, "force", False)
+    writer_options = {
+        "row_group_size": getattr(args, "row_group_size", 10000),
+        "compression": getattr(args, "parquet_compression", "zstd")
+    }
+    dedup = getattr(args, "dedup", "off")
+    if getattr(args, "pdf_backend", None):
+        # Read by the PDF extractor, including in worker processes
+        os.environ["PDF_BACKEND"] = args.pdf_backend
+    selection = {
+        "include": getattr(args, "include", None) or (),
+        "exclude": getattr(args, "exclude", None) or (),
+        "shard": parse_shard(getattr(args, "shard", None))
+    }
+    watch = getattr(args, "watch", False)
+    if getattr(args, "process", False) or watch:
+        from src.processors.text_cleaner import TextCleaner
+        text_cleaner = TextCleaner(
+            batch_size=getattr(args, "detect_batch_size", 256),
+            parallel_detection=getattr(args, "parallel_detection", False),
+            prefilter=not getattr(args, "no_prefilter", False),
+            clean_level=getattr(args, "clean_level", "basic"),
+            languages=getattr(args, "lang", "en"),
+            low_accuracy=getattr(args, "fast_detection", False)
+        )
+        deduplicator = None
+        if dedup != "off":
+            from src.processors.deduplicator import Deduplicator
+            deduplicator = Deduplicator(index_path=DEDUP_INDEX if dedup == "corpus" else None)
+        split_languages = getattr(args, "split_by_language", False)
+        cache = ProcessingCache(CACHE_DIR, max_bytes=int(os.getenv("CACHE_MAX_MB", 2048)) * 1024 * 1024)
+        # Files finished by an earlier run with the same settings are skipped
+        manifest = JobManifest(MANIFEST_PATH, config={
+            "cleaner": text_cleaner.config,
+            "output_format": output_format,
+            "writer_options": writer_options,
+            "dedup": deduplicator.config if deduplicator else None,
+            "split_languages": split_languages,
+            "pdf_backend": resolve_backend(),
+            "version": PIPELINE_VERSION
+        })
+        if watch:
+            watch_input(text_cleaner, output_format=output_format, executor=executor, cache=cache,
+                        writer_options=writer_options, deduplicator=deduplicator,
+                        split_languages=split_languages, manifest=manifest, **selection)
+        elif not process_batch_files(text_cleaner, output_format=output_format, executor=executor,
+                                     cache=cache, force=force, writer_options=writer_options,
+                                     deduplicator=deduplicator, split_languages=split_languages,
+                                     manifest=manifest, **selection):
             logger.error("Processing stage failed")
             return
         # After batch processing, generate summary report
-        generate_summary_report(INPUT_DIR, OUTPUT_DIR, META_DIR)
+        generate_summary_report(INPUT_DIR, OUTPUT_DIR, META_DIR, manifest=manifest)
     # Dataset creation stage
     if hasattr(args, "build_dataset") and args.build_dataset:
-        dataset = build_hf_dataset()
+        dataset = build_hf_dataset(max_shard_size=getattr(args, "dataset_shard_size", None),
+                                   chunk_tokens=getattr(args, "chunk_tokens", None),
+                                   chunk_overlap=getattr(args, "chunk_overlap", 0),
+                                   tokenizer=getattr(args, "tokenizer", None))
         if dataset and hasattr(args, "upload_hf") and args.upload_hf:
             upload_to_hf_hub(dataset)
     logger.info("MakeAIDatasets pipeline completed")
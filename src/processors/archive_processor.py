@@ -0,0 +1,118 @@
+import io
+import bz2
+import gzip
+import logging
+import zipfile
+import importlib
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+
+from src.utils.filetype_detector import SNIFF_BYTES, COMPRESSION_MAGIC, inspect_zip, sniff_format
+
+logger = logging.getLogger(__name__)
+
+# Extractors able to read a binary stream; the binary formats need it seekable
+_STREAM_EXTRACTORS = {
+    "txt": ("src.processors.txt_processor", "iter_txt"),
+    "html": ("src.processors.html_processor", "iter_html"),
+    "pdf": ("src.processors.pdf_processor", "iter_pdf"),
+    "epub": ("src.processors.epub_processor", "iter_epub"),
+    "docx": ("src.processors.docx_processor", "iter_docx"),
+}
+_SEEKABLE_FORMATS = ("pdf", "epub", "docx")
+
+def open_decompressed(file_path: Path, compression: str) -> BinaryIO:
+    """Open a gzip, bz2 or zstd compressed file as a stream of its decompressed bytes"""
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    if compression == "bz2":
+        return bz2.open(file_path, "rb")
+    if compression == "zstd":
+        try:
+            from compression import zstd  # Python 3.14+
+            return zstd.open(file_path, "rb")
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading .zst files requires the zstandard package") from None
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+def _extract_stream(name: str, open_stream: Callable[[], BinaryIO], meta: Dict) -> Iterator[str]:
+    """Sniff a decompressed stream and yield text from the matching extractor
+
+    open_stream is called again after sniffing so that text formats are read
+    from the start without buffering; binary formats are buffered in memory,
+    never written to disk.
+    """
+    with open_stream() as stream:
+        header = stream.read(SNIFF_BYTES)
+        source_format = sniff_format(header)
+        data = None
+        if source_format == "zip":
+            data = io.BytesIO(header + stream.read())
+            source_format = inspect_zip(data)
+    if source_format == "txt" and name.lower().endswith((".html", ".htm")):
+        source_format = "html"
+    if source_format not in _STREAM_EXTRACTORS:
+        logger.warning(f"Skipping {name}: unsupported content ({source_format or 'unknown'})")
+        return
+    meta.setdefault("archive_members", []).append({"name": name, "format": source_format})
+    extractor = getattr(importlib.import_module(_STREAM_EXTRACTORS[source_format][0]),
+                        _STREAM_EXTRACTORS[source_format][1])
+    member_meta: Dict = {}
+    if data is None and source_format in _SEEKABLE_FORMATS:
+        with open_stream() as stream:
+            data = io.BytesIO(stream.read())
+    if data is not None:
+        data.seek(0)
+        yield from extractor(data, member_meta)
+    else:
+        with open_stream() as stream:
+            yield from extractor(stream, member_meta)
+    # OCR statistics add up across members
+    for key in ("ocr_pages", "ocr_seconds"):
+        if key in member_meta:
+            meta[key] = meta.get(key, 0) + member_meta[key]
+    if member_meta.get("ocr_used"):
+        meta["ocr_used"] = True
+
+def iter_archive(file_path: Path, meta: Optional[Dict] = None) -> Iterator[str]:
+    """Yield the text of a compressed file (.gz, .bz2, .zst) or of every document in a ZIP archive
+
+    Content is decompressed on the fly and each document is routed by its
+    magic bytes. Members of ZIP archives are processed in name order;
+    nested archives are skipped. The container type and the documents read
+    are recorded in meta.
+    """
+    meta = meta if meta is not None else {}
+    try:
+        with open(file_path, "rb") as f:
+            header = f.read(SNIFF_BYTES)
+        container = next((c for magic, c in COMPRESSION_MAGIC.items() if header.startswith(magic)), None)
+        if container is None and zipfile.is_zipfile(file_path):
+            container = "zip"
+        if container is None:
+            logger.error(f"Not a supported archive: {file_path}")
+            return
+        meta["archive_format"] = container
+
+        if container != "zip":
+            inner_name = file_path.stem
+            yield from _extract_stream(inner_name, lambda: open_decompressed(file_path, container), meta)
+            return
+
+        with zipfile.ZipFile(file_path) as archive:
+            for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                name = info.filename
+                base = name.rsplit("/", 1)[-1]
+                if info.is_dir() or not base or base.startswith(".") or name.startswith("__MACOSX/"):
+                    continue
+                try:
+                    yield from _extract_stream(name, lambda: archive.open(info), meta)
+                except Exception as e:
+                    logger.warning(f"Archive member {name} failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Archive processing failed: {str(e)}")
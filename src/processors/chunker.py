@@ -0,0 +1,182 @@
+import os
+import re
+import logging
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Words and individual punctuation marks: close to subword token counts for English prose
+_WORD_TOKENS = re.compile(r"\w+|[^\w\s]")
+# Sentence end: terminal punctuation (plus closing quotes/brackets) and whitespace, unless a
+# lowercase letter follows, which is usually an abbreviation ("e.g. this")
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’)\]]))\s+(?![a-z])")
+
+TokenCounter = Callable[[str], int]
+
+def _count_words(text: str) -> int:
+    return len(_WORD_TOKENS.findall(text))
+
+def _count_bytes(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+def _tiktoken_counter(encoding: str) -> TokenCounter:
+    import tiktoken
+
+    tokenizer = tiktoken.get_encoding(encoding or "cl100k_base")
+    return lambda text: len(tokenizer.encode_ordinary(text))
+
+def _hf_counter(model: str) -> TokenCounter:
+    from tokenizers import Tokenizer
+
+    if not model:
+        raise ValueError("hf tokenizer needs a model name, e.g. hf:gpt2")
+    tokenizer = Tokenizer.from_pretrained(model)
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+# Token counters by name. whitespace and bytes need nothing installed and work offline;
+# tiktoken:<encoding> and hf:<model> use the optional tiktoken / tokenizers packages.
+TOKENIZERS: Dict[str, Callable[[str], TokenCounter]] = {
+    "whitespace": lambda arg: _count_words,
+    "bytes": lambda arg: _count_bytes,
+    "tiktoken": _tiktoken_counter,
+    "hf": _hf_counter,
+}
+FALLBACK_TOKENIZER = "whitespace"
+_counters: Dict[str, TokenCounter] = {}
+
+def get_token_counter(spec: Optional[str] = None) -> TokenCounter:
+    """Token counting function for spec ("name" or "name:argument", default: CHUNK_TOKENIZER or whitespace)
+
+    Counters are built once per process. A tokenizer that cannot be loaded
+    (package missing, model not downloadable offline) is replaced by the
+    whitespace counter with a warning.
+    """
+    spec = spec or os.getenv("CHUNK_TOKENIZER", FALLBACK_TOKENIZER)
+    if spec not in _counters:
+        name, _, argument = spec.partition(":")
+        if name not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer: {name} (expected one of {', '.join(TOKENIZERS)})")
+        try:
+            _counters[spec] = TOKENIZERS[name](argument)
+        except Exception as e:
+            logger.warning(f"Tokenizer {spec} unavailable ({str(e)}), counting {FALLBACK_TOKENIZER} tokens instead")
+            _counters[spec] = TOKENIZERS[FALLBACK_TOKENIZER]("")
+    return _counters[spec]
+
+def split_sentences(paragraph: str) -> List[str]:
+    """Split a paragraph at sentence boundaries (a lightweight heuristic, not a linguistic parser)"""
+    return [sentence for sentence in _SENTENCE_END.split(paragraph) if sentence]
+
+class Chunk(NamedTuple):
+    """A training sample: its text, token count and the paragraphs it spans"""
+    text: str
+    tokens: int
+    first_paragraph: int
+    last_paragraph: int
+
+class _Unit(NamedTuple):
+    text: str
+    tokens: int
+    paragraph: int
+    glue: str = " "  # joins the unit to the previous one of its paragraph
+
+def _split_word(word: str, limit: int, count: TokenCounter) -> Iterator[str]:
+    """Cut a word into pieces of at most limit tokens (at least one character each)"""
+    while word:
+        # Longest prefix within the limit, found by bisection on its length
+        low, high = 1, len(word)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count(word[:middle]) <= limit:
+                low = middle
+            else:
+                high = middle - 1
+        yield word[:low]
+        word = word[low:]
+
+def _units(paragraph: str, index: int, max_tokens: int, piece_tokens: int, count: TokenCounter) -> Iterator[_Unit]:
+    """Sentences of a paragraph; sentences over max_tokens are cut into runs of words of up to piece_tokens
+
+    A single word over piece_tokens is itself cut into pieces of at most
+    piece_tokens, which are joined back without spaces.
+    """
+    for sentence in split_sentences(paragraph):
+        tokens = count(sentence)
+        if tokens <= max_tokens:
+            yield _Unit(sentence, tokens, index)
+            continue
+        words: List[str] = []
+        budget = 0
+        for word in sentence.split():
+            word_tokens = count(word)
+            if word_tokens > piece_tokens:
+                if words:
+                    yield _Unit(" ".join(words), budget, index)
+                    words, budget = [], 0
+                for number, piece in enumerate(_split_word(word, piece_tokens, count)):
+                    yield _Unit(piece, count(piece), index, " " if number == 0 else "")
+                continue
+            if words and budget + word_tokens > piece_tokens:
+                yield _Unit(" ".join(words), budget, index)
+                words, budget = [], 0
+            words.append(word)
+            budget += word_tokens
+        if words:
+            yield _Unit(" ".join(words), budget, index)
+
+def _join(units: Iterable[_Unit]) -> str:
+    """Sentences of a paragraph joined by spaces, paragraphs by newlines"""
+    parts = []
+    previous = None
+    for unit in units:
+        if previous is not None:
+            parts.append(unit.glue if unit.paragraph == previous else "\n")
+        parts.append(unit.text)
+        previous = unit.paragraph
+    return "".join(parts)
+
+def iter_token_chunks(paragraphs: Iterable[str], max_tokens: int, overlap_tokens: int = 0,
+                      count: Optional[TokenCounter] = None) -> Iterator[Chunk]:
+    """Pack a stream of paragraphs into chunks of at most max_tokens tokens
+
+    Chunks break between sentences, and only inside a sentence (or a word)
+    when it is longer than max_tokens on its own. Each chunk after the first starts
+    with the last whole sentences of the previous one, up to overlap_tokens.
+    Only the sentences of the current chunk are held in memory. Token counts
+    are summed per sentence, which can differ slightly from counting the
+    joined text with a subword tokenizer.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be at least 0 and smaller than max_tokens")
+    count = count or get_token_counter()
+    window: Deque[_Unit] = deque()
+    total = 0
+    fresh = 0  # units added since the last chunk was emitted
+
+    for index, paragraph in enumerate(paragraphs):
+        # Pieces of long sentences leave room for the overlap
+        for unit in _units(paragraph, index, max_tokens, max_tokens - overlap_tokens, count):
+            if window and total + unit.tokens > max_tokens:
+                if fresh:
+                    yield Chunk(_join(window), total, window[0].paragraph, window[-1].paragraph)
+                    fresh = 0
+                    # Keep the longest tail of whole sentences that fits in the overlap
+                    kept = 0
+                    tail_tokens = 0
+                    for kept_unit in reversed(window):
+                        if tail_tokens + kept_unit.tokens > overlap_tokens:
+                            break
+                        tail_tokens += kept_unit.tokens
+                        kept += 1
+                    while len(window) > kept:
+                        total -= window.popleft().tokens
+                while window and total + unit.tokens > max_tokens:
+                    total -= window.popleft().tokens
+            window.append(unit)
+            total += unit.tokens
+            fresh += 1
+    if fresh:
+        yield Chunk(_join(window), total, window[0].paragraph, window[-1].paragraph)
@@ -0,0 +1,201 @@
+import re
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NORMALIZE_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+def _to_int64(digest: bytes) -> int:
+    """Interpret an 8-byte digest as a signed 64-bit integer (SQLite INTEGER range)"""
+    return int.from_bytes(digest, "big", signed=True)
+
+class Deduplicator:
+    """Exact and near-duplicate paragraph removal with MinHash/LSH
+
+    Paragraphs are normalized (lowercased, punctuation and whitespace
+    collapsed) and checked against an exact 64-bit hash and, when they have
+    enough words, a MinHash signature split into LSH bands: a paragraph is
+    a near duplicate if any band bucket was seen before. With the defaults
+    (128 permutations, 16 bands of 8 rows) pairs above ~0.7 Jaccard
+    similarity of word shingles are caught with high probability.
+
+    Without index_path, state is kept per document only. With index_path,
+    hashes are also persisted to a compact SQLite index (one row per exact
+    hash and per band bucket, tagged with the owning document) so
+    duplicates are found across documents and runs; re-processing a
+    document never flags its own earlier paragraphs.
+    """
+
+    def __init__(self, index_path: Optional[Path] = None, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, min_words: int = 6, commit_every: int = 1000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.index_path = Path(index_path) if index_path else None
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_words = min_words
+        self.commit_every = commit_every
+        self.seed = seed
+        # Settings that affect results, used as part of the processing cache key
+        self.config = {"num_perm": num_perm, "bands": bands, "shingle_size": shingle_size,
+                       "min_words": min_words, "seed": seed, "corpus": self.index_path is not None}
+        self._init_permutations()
+        self._local = threading.local()
+        if self.index_path:
+            self._connection()
+
+    def _init_permutations(self) -> None:
+        rng = np.random.RandomState(self.seed)
+        self._perm_a = rng.randint(1, int(_MERSENNE_PRIME), size=self.num_perm, dtype=np.uint64)
+        self._perm_b = rng.randint(0, int(_MERSENNE_PRIME), size=self.num_perm, dtype=np.uint64)
+
+    def __getstate__(self):
+        # Connections are per thread/process; rebuild them after pickling to worker processes
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite connection for the current thread, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.index_path), timeout=60)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS exact (hash INTEGER PRIMARY KEY, doc INTEGER NOT NULL) WITHOUT ROWID")
+            connection.execute("CREATE TABLE IF NOT EXISTS lsh (band INTEGER, bucket INTEGER, doc INTEGER NOT NULL, "
+                               "PRIMARY KEY (band, bucket)) WITHOUT ROWID")
+            connection.commit()
+            self._local.connection = connection
+            self._local.exact_rows = []
+            self._local.lsh_rows = []
+        return connection
+
+    def normalize(self, text: str) -> str:
+        return _NORMALIZE_PATTERN.sub(" ", text.lower()).strip()
+
+    def exact_hash(self, normalized: str) -> int:
+        return _to_int64(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest())
+
+    def signature(self, words: List[str]) -> np.ndarray:
+        """MinHash signature of the word shingles of a paragraph"""
+        k = self.shingle_size
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # Universal hashing (a*x + b) mod p; uint64 wraparound is fine for hashing purposes
+        with np.errstate(over="ignore"):
+            permuted = ((np.outer(hashes, self._perm_a) + self._perm_b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def band_keys(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        """(band, bucket) pairs for a signature"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append((band, _to_int64(hashlib.blake2b(chunk, digest_size=8).digest())))
+        return keys
+
+    def document(self, doc_key: str) -> "DocumentDeduplicator":
+        """Start deduplicating one document"""
+        return DocumentDeduplicator(self, doc_key)
+
+    def _seen_elsewhere(self, doc_id: int, exact: int, bands: List[Tuple[int, int]]) -> bool:
+        """Check and record hashes in the on-disk index; True if another document owns one of them"""
+        connection = self._connection()
+        row = connection.execute("SELECT doc FROM exact WHERE hash = ?", (exact,)).fetchone()
+        if row is not None and row[0] != doc_id:
+            return True
+        if bands:
+            placeholders = ",".join("(?,?)" for _ in bands)
+            params = [value for key in bands for value in key]
+            rows = connection.execute(f"SELECT doc FROM lsh WHERE (band, bucket) IN (VALUES {placeholders})", params).fetchall()
+            if any(owner != doc_id for (owner,) in rows):
+                return True
+        # Buffer writes and flush them in short transactions so concurrent
+        # workers never wait on a write lock held across a whole document
+        self._local.exact_rows.append((exact, doc_id))
+        self._local.lsh_rows.extend((band, bucket, doc_id) for band, bucket in bands)
+        if len(self._local.exact_rows) >= self.commit_every:
+            self.commit()
+        return False
+
+    def commit(self) -> None:
+        """Flush buffered index writes for this thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or not self._local.exact_rows:
+            return
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO exact (hash, doc) VALUES (?, ?)", self._local.exact_rows)
+            connection.executemany("INSERT OR IGNORE INTO lsh (band, bucket, doc) VALUES (?, ?, ?)", self._local.lsh_rows)
+        self._local.exact_rows = []
+        self._local.lsh_rows = []
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self.commit()
+            connection.close()
+            self._local.connection = None
+
+class DocumentDeduplicator:
+    """Per-document dedup state, optionally backed by the corpus index"""
+
+    def __init__(self, parent: Deduplicator, doc_key: str):
+        self.parent = parent
+        self.doc_id = _to_int64(hashlib.blake2b(doc_key.encode("utf-8"), digest_size=8).digest())
+        self._exact: Set[int] = set()
+        self._buckets: Set[Tuple[int, int]] = set()
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.corpus_duplicates = 0
+
+    def is_duplicate(self, paragraph: str) -> bool:
+        """Return True if paragraph duplicates an earlier one; otherwise remember it"""
+        normalized = self.parent.normalize(paragraph)
+        exact = self.parent.exact_hash(normalized)
+        if exact in self._exact:
+            self.exact_duplicates += 1
+            return True
+        words = normalized.split()
+        bands = self.parent.band_keys(self.parent.signature(words)) if len(words) >= self.parent.min_words else []
+        if any(key in self._buckets for key in bands):
+            self.near_duplicates += 1
+            return True
+        seen_elsewhere = self.parent.index_path is not None and self.parent._seen_elsewhere(self.doc_id, exact, bands)
+        # Remember corpus duplicates too, so their repeats are caught without another index lookup
+        self._exact.add(exact)
+        self._buckets.update(bands)
+        if seen_elsewhere:
+            self.corpus_duplicates += 1
+        return seen_elsewhere
+
+    def iter_unique(self, paragraphs: Iterable[str]) -> Iterator[str]:
+        """Lazily drop duplicate paragraphs"""
+        try:
+            for paragraph in paragraphs:
+                if not self.is_duplicate(paragraph):
+                    yield paragraph
+        finally:
+            if self.parent.index_path:
+                self.parent.commit()
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact_duplicates + self.near_duplicates + self.corpus_duplicates
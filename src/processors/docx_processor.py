@@ -1,15 +1,113 @@
 import logging
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from docx import Document
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
-def process_docx(file_path: Path) -> str:
-    """Extract and process text from DOCX file"""
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+# Parts read after the main document, in this order
+_NOTE_PARTS = ("word/footnotes.xml", "word/endnotes.xml")
+# Run content that stands for whitespace
+_BREAKS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+
+def _main_part(archive: zipfile.ZipFile) -> str:
+    """Path of the main document part, from the package relationships"""
+    try:
+        for rel in ET.fromstring(archive.read("_rels/.rels")):
+            if rel.get("Type") == _OFFICE_DOCUMENT:
+                return posixpath.normpath(rel.get("Target").lstrip("/"))
+    except (KeyError, ET.ParseError):
+        pass
+    return "word/document.xml"
+
+def iter_part_paragraphs(part: BinaryIO) -> Iterator[str]:
+    """Yield the non-empty paragraphs of a WordprocessingML part in document order
+
+    The XML is parsed incrementally and each top-level block is discarded
+    once its paragraphs have been emitted, so memory does not grow with the
+    document. Table cells are ordinary paragraphs and come out row by row;
+    paragraphs in text boxes are emitted before the paragraph anchoring
+    them. Deleted revisions, field codes and the fallback copies of
+    alternate content are not text and are skipped.
+    """
+    paragraphs: List[List[str]] = []
+    stack: List[ET.Element] = []
+    skip_depth = 0
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if skip_depth or elem.tag == _MC_FALLBACK:
+                skip_depth += 1
+            elif elem.tag == _W + "p":
+                paragraphs.append([])
+            continue
+        stack.pop()
+        if skip_depth:
+            skip_depth -= 1
+        elif elem.tag == _W + "t":
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif elem.tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append(_BREAKS[elem.tag])
+        elif elem.tag == _W + "p":
+            text = "".join(paragraphs.pop())
+            if text.strip():
+                yield text
+        # Drop finished blocks of the body (or note) so the tree never holds more than one
+        if len(stack) == 2:
+            stack[1].remove(elem)
+
+def _iter_docx_xml(file_path: Union[Path, BinaryIO]) -> Iterator[str]:
+    with zipfile.ZipFile(file_path) as archive:
+        names = set(archive.namelist())
+        for name in (_main_part(archive),) + _NOTE_PARTS:
+            if name in names:
+                with archive.open(name) as part:
+                    yield from iter_part_paragraphs(part)
+
+def _iter_python_docx(file_path: Union[Path, BinaryIO]) -> Iterator[str]:
+    from docx import Document
+
+    if hasattr(file_path, "seek"):
+        file_path.seek(0)
+    doc = Document(file_path if hasattr(file_path, "read") else str(file_path))
+    for para in doc.paragraphs:
+        if para.text.strip():
+            yield para.text
+
+def iter_docx(file_path: Union[Path, BinaryIO], meta: Optional[Dict] = None) -> Iterator[str]:
+    """Yield non-empty paragraphs from DOCX file (or seekable binary stream)
+
+    word/document.xml is streamed straight from the zip (see
+    iter_part_paragraphs), followed by footnotes and endnotes. If that
+    fails before producing text, the file is read with python-docx, which
+    loads the whole object model and only sees body paragraphs.
+    """
+    yielded = False
+    try:
+        for paragraph in _iter_docx_xml(file_path):
+            yielded = True
+            yield paragraph
+        return
+    except Exception as e:
+        if yielded:
+            logger.warning(f"DOCX parsing stopped early: {str(e)}")
+            return
+        logger.warning(f"Fast DOCX parsing failed, using python-docx: {str(e)}")
     try:
-        doc = Document(str(file_path))
-        text_parts = [para.text for para in doc.paragraphs if para.text.strip()]
-        return "\n\n".join(text_parts)
+        for paragraph in _iter_python_docx(file_path):
+            if meta is not None:
+                meta["docx_parser"] = "python-docx"
+            yield paragraph
     except Exception as e:
         logger.error(f"DOCX processing failed: {str(e)}")
-        return ""
+
+def process_docx(file_path: Path) -> str:
+    """Extract and process text from DOCX file"""
+    return "\n\n".join(iter_docx(file_path))
@@ -1,33 +1,187 @@
+import os
 import logging
+import zipfile
+import posixpath
+import threading
+import concurrent.futures
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from ebooklib import epub
-from bs4 import BeautifulSoup
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Union
+from urllib.parse import unquote
+
+from src.processors.html_text import html_to_text
 
 logger = logging.getLogger(__name__)
 
-def process_epub(file_path: Path) -> str:
-    """Extract and process text from EPUB file"""
+# Dublin Core fields of the package document recorded in metadata
+_DC_FIELDS = {"title": "title", "author": "creator", "language": "language", "publisher": "publisher"}
+
+class Chapter(NamedTuple):
+    """A spine item: its path inside the archive and its table-of-contents title"""
+    path: str
+    title: Optional[str]
+
+class ChapterText(str):
+    """Text of a chapter; .section is its position in meta["chapters"]"""
+
+    def __new__(cls, text: str, section: int):
+        chapter = super().__new__(cls, text)
+        chapter.section = section
+        return chapter
+
+def _resolve(base: str, href: str) -> str:
+    """Archive path of an href relative to the file at base"""
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), unquote(href.split("#", 1)[0])))
+
+def _toc_titles(archive: zipfile.ZipFile, opf_path: str, manifest: Dict[str, ET.Element],
+                spine: ET.Element) -> Dict[str, str]:
+    """Chapter titles by archive path, from the EPUB 3 nav document or the EPUB 2 NCX"""
+    titles: Dict[str, str] = {}
+    nav = next((item for item in manifest.values() if "nav" in item.get("properties", "").split()), None)
+    ncx = manifest.get(spine.get("toc", ""))
+    try:
+        if nav is not None:
+            nav_path = _resolve(opf_path, nav.get("href"))
+            for link in ET.fromstring(archive.read(nav_path)).iterfind(".//{*}a"):
+                title = " ".join("".join(link.itertext()).split())
+                if link.get("href") and title:
+                    titles.setdefault(_resolve(nav_path, link.get("href")), title)
+        elif ncx is not None:
+            ncx_path = _resolve(opf_path, ncx.get("href"))
+            for point in ET.fromstring(archive.read(ncx_path)).iterfind(".//{*}navPoint"):
+                label = point.find("{*}navLabel/{*}text")
+                content = point.find("{*}content")
+                if label is not None and content is not None and label.text and content.get("src"):
+                    titles.setdefault(_resolve(ncx_path, content.get("src")), " ".join(label.text.split()))
+    except Exception as e:
+        logger.warning(f"EPUB table of contents unreadable: {str(e)}")
+    return titles
+
+def read_spine(archive: zipfile.ZipFile, meta: Optional[Dict] = None) -> List[Chapter]:
+    """Chapters of an EPUB in reading (spine) order, without reading their content
+
+    Book-level Dublin Core metadata (title, author, ...) is written into meta.
+    """
+    container = ET.fromstring(archive.read("META-INF/container.xml"))
+    opf_path = container.find(".//{*}rootfile").get("full-path")
+    package = ET.fromstring(archive.read(opf_path))
+    if meta is not None:
+        for field, element in _DC_FIELDS.items():
+            value = package.find(f"{{*}}metadata/{{*}}{element}")
+            if value is not None and value.text and value.text.strip():
+                meta[field] = value.text.strip()
+    manifest = {item.get("id"): item for item in package.iterfind("{*}manifest/{*}item")}
+    spine = package.find("{*}spine")
+    titles = _toc_titles(archive, opf_path, manifest, spine)
+    chapters = []
+    for itemref in spine.iterfind("{*}itemref"):
+        item = manifest.get(itemref.get("idref"))
+        # The EPUB 3 nav document is a table of contents, not content
+        if item is None or "html" not in item.get("media-type", "") or "nav" in item.get("properties", "").split():
+            continue
+        path = _resolve(opf_path, item.get("href"))
+        chapters.append(Chapter(path, titles.get(path)))
+    return chapters
+
+# Process pool for chapter parsing, created on first use and shared by all books in this process
+_chapter_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_chapter_pool_lock = threading.Lock()
+
+def _get_chapter_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    global _chapter_pool
+    with _chapter_pool_lock:
+        if _chapter_pool is None:
+            _chapter_pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        return _chapter_pool
+
+def _chapter_text(future_or_markup) -> str:
     try:
-        book = epub.read_epub(str(file_path))
-        text_parts = []
-        
-        for item in book.get_items():
-            if item.get_type() == epub.ITEM_DOCUMENT:
-                try:
-                    soup = BeautifulSoup(item.get_content(), "html.parser")
-                    
-                    # Remove script and style elements
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    
-                    # Get text with paragraph preservation
-                    text = soup.get_text(separator="\n", strip=True)
-                    if text.strip():
-                        text_parts.append(text)
-                except Exception as e:
-                    logger.warning(f"EPUB item processing error: {str(e)}")
-        
-        return "\n\n".join(text_parts)
+        if isinstance(future_or_markup, concurrent.futures.Future):
+            return future_or_markup.result()
+        return html_to_text(future_or_markup)
+    except Exception as e:
+        logger.warning(f"EPUB chapter processing error: {str(e)}")
+        return ""
+
+def _iter_chapter_texts(archive: zipfile.ZipFile, chapters: List[Chapter], workers: int) -> Iterator[str]:
+    """Yield the text of each chapter in order ("" if it fails), reading chapters only as needed
+
+    With workers > 1 up to 2 * workers chapters are parsed ahead in a
+    process pool; otherwise each chapter is parsed when it is reached.
+    """
+    pool = _get_chapter_pool(workers) if workers > 1 and len(chapters) > 1 else None
+    pending: List = []
+    for chapter in chapters:
+        try:
+            markup = archive.read(chapter.path)
+        except Exception as e:
+            logger.warning(f"EPUB chapter {chapter.path} unreadable: {str(e)}")
+            markup = b""
+        if pool is None:
+            yield _chapter_text(markup)
+            continue
+        pending.append(pool.submit(html_to_text, markup))
+        if len(pending) >= 2 * workers:
+            yield _chapter_text(pending.pop(0))
+    for future in pending:
+        yield _chapter_text(future)
+
+def _iter_manifest_order(file_path: Union[Path, BinaryIO]) -> Iterator[str]:
+    """Fallback for EPUBs without a readable spine: every document item in manifest order, via ebooklib"""
+    import ebooklib
+    from ebooklib import epub
+
+    try:
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+        book = epub.read_epub(file_path if hasattr(file_path, "read") else str(file_path))
     except Exception as e:
         logger.error(f"EPUB processing failed: {str(e)}")
-        return ""
\ No newline at end of file
+        return
+    for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
+        yield _chapter_text(item.get_content())
+
+def iter_epub(file_path: Union[Path, BinaryIO], meta: Optional[Dict] = None) -> Iterator[str]:
+    """Yield the text of each EPUB chapter in reading order from a file or seekable binary stream
+
+    Chapters follow the package spine and are read from the archive one at
+    a time; EPUB_WORKERS > 1 parses chapters ahead in a process pool, which
+    pays off for large omnibus books. Chapter text comes from html_text's
+    lxml extractor, one paragraph per line. meta receives the book's title,
+    author, language and publisher, and under "chapters" the spine position,
+    archive path and table-of-contents title of each non-empty chapter, in
+    the order the chapters are yielded. Chapters are yielded as ChapterText,
+    which the pipeline uses to add the first_paragraph and last_paragraph
+    of each chapter in the cleaned output. EPUBs whose spine cannot be read
+    fall back to ebooklib's manifest order.
+    """
+    meta = meta if meta is not None else {}
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except Exception as e:
+        logger.error(f"EPUB processing failed: {str(e)}")
+        return
+    with archive:
+        try:
+            chapters = read_spine(archive, meta)
+            texts = _iter_chapter_texts(archive, chapters, int(os.getenv("EPUB_WORKERS", 1)))
+        except Exception as e:
+            logger.warning(f"EPUB spine unreadable ({str(e)}), reading documents in manifest order")
+            chapters = []
+            texts = _iter_manifest_order(file_path)
+
+        records = meta.setdefault("chapters", [])
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            chapter = chapters[index] if index < len(chapters) else None
+            records.append({
+                "index": index,
+                "path": chapter.path if chapter else None,
+                "title": chapter.title if chapter else None
+            })
+            yield ChapterText(text, len(records) - 1)
+
+def process_epub(file_path: Path) -> str:
+    """Extract and process text from EPUB file"""
+    return "\n\n".join(iter_epub(file_path))
@@ -1,18 +1,59 @@
+import io
 import logging
 from pathlib import Path
-from bs4 import BeautifulSoup
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+
+from src.processors.html_text import iter_html_text, soup_text
 
 logger = logging.getLogger(__name__)
 
-def process_html(file_path: Path) -> str:
-    """Extract and process text from HTML file"""
+def iter_html(file_path: Union[Path, BinaryIO], meta: Optional[Dict] = None) -> Iterator[str]:
+    """Yield the text of an HTML file (or binary stream), one paragraph per line
+
+    The document is parsed incrementally by lxml (see html_text), skipping
+    script, style and navigation content without building a tree. If lxml
+    is missing, fails before producing text or finds no text at all, the
+    document is parsed again with BeautifulSoup, which detects the encoding
+    from a BOM or <meta charset> declaration.
+    """
+    source = file_path if hasattr(file_path, "read") else None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, "html.parser")
-            for script in soup(["script", "style"]):
-                script.decompose()
-            text = soup.get_text(separator="\n", strip=True)
-            return text
+        f = source or open(file_path, 'rb')
     except Exception as e:
         logger.error(f"HTML processing failed: {str(e)}")
-        return ""
+        return
+    try:
+        yielded = False
+        try:
+            for chunk in iter_html_text(f):
+                yielded = True
+                yield chunk
+            if yielded:
+                return
+        except ImportError:
+            pass
+        except Exception as e:
+            if yielded:
+                logger.warning(f"HTML parsing stopped early: {str(e)}")
+                return
+            logger.warning(f"Fast HTML parsing failed, using BeautifulSoup: {str(e)}")
+        try:
+            f.seek(0)
+            text = soup_text(f)
+        except io.UnsupportedOperation:
+            logger.error("HTML processing failed: stream cannot be re-read")
+            return
+        except Exception as e:
+            logger.error(f"HTML processing failed: {str(e)}")
+            return
+        if text:
+            if meta is not None:
+                meta["html_parser"] = "beautifulsoup"
+            yield text
+    finally:
+        if source is None:
+            f.close()
+
+def process_html(file_path: Path) -> str:
+    """Extract and process text from HTML file"""
+    return "\n".join(iter_html(file_path))
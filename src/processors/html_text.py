@@ -0,0 +1,130 @@
+import io
+import re
+import codecs
+import logging
+from typing import BinaryIO, Iterator, List, Union
+
+from src.utils.text_encoding import detect_bom
+
+logger = logging.getLogger(__name__)
+
+# Elements whose content is never text, skipped with everything inside them
+SKIP_TAGS = frozenset({"script", "style", "nav", "noscript", "template", "svg", "math", "iframe", "object"})
+# Elements that start a new paragraph
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "caption", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol", "p", "pre",
+    "section", "table", "td", "th", "title", "tr", "ul",
+})
+FEED_BYTES = 1 << 16
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([-\w:.]+)""", re.IGNORECASE)
+
+def sniff_html_encoding(head: bytes) -> str:
+    """Encoding of an HTML document from its first bytes: BOM, <meta charset>, else UTF-8 or windows-1252"""
+    bom = detect_bom(head)
+    if bom:
+        return bom[0]
+    match = _META_CHARSET.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"
+
+class _TextTarget:
+    """lxml parser target that collects paragraph text as the document streams past
+
+    No tree is built: text inside SKIP_TAGS is dropped as it arrives, and
+    every block-level start or end tag closes the current paragraph.
+    Whitespace within a paragraph is collapsed; <pre> keeps its line breaks.
+    """
+
+    def __init__(self):
+        self.paragraphs: List[str] = []
+        self._buffer: List[str] = []
+        self._skip_depth = 0
+        self._pre_depth = 0
+
+    def _flush(self) -> None:
+        if self._buffer:
+            text = "".join(self._buffer)
+            self._buffer = []
+            lines = text.splitlines() if self._pre_depth else (text,)
+            for line in lines:
+                line = " ".join(line.split())
+                if line:
+                    self.paragraphs.append(line)
+
+    def start(self, tag, attrib) -> None:
+        if self._skip_depth or tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag == "pre":
+                self._pre_depth += 1
+
+    def end(self, tag) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            if tag == "pre" and self._pre_depth:
+                self._pre_depth -= 1
+
+    def data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._buffer.append(data)
+
+    def close(self) -> List[str]:
+        self._flush()
+        return self.paragraphs
+
+def iter_html_text(source: Union[bytes, BinaryIO], block_size: int = FEED_BYTES) -> Iterator[str]:
+    """Yield the paragraphs of an HTML document as newline-joined chunks, parsing it incrementally
+
+    Uses lxml's parser with a callback target, so memory is bounded by the
+    block size rather than the document. Raises ImportError without lxml.
+    """
+    from lxml import etree
+
+    read = (source if hasattr(source, "read") else io.BytesIO(source)).read
+    head = read(block_size)
+    target = _TextTarget()
+    parser = etree.HTMLParser(target=target, encoding=sniff_html_encoding(head[:4096]),
+                              remove_comments=True, huge_tree=True)
+    block = head
+    while block:
+        parser.feed(block)
+        if target.paragraphs:
+            yield "\n".join(target.paragraphs)
+            target.paragraphs = []
+        block = read(block_size)
+    if head:
+        paragraphs = parser.close()
+        if paragraphs:
+            yield "\n".join(paragraphs)
+
+def soup_text(markup: Union[bytes, BinaryIO]) -> str:
+    """Text of an HTML document via BeautifulSoup (slow, but tolerates anything)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(markup, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return soup.get_text(separator="\n", strip=True)
+
+def html_to_text(markup: bytes) -> str:
+    """Text of an in-memory HTML document, one paragraph per line; falls back to BeautifulSoup"""
+    try:
+        text = "\n".join(iter_html_text(markup))
+        if text or not markup.strip():
+            return text
+    except Exception as e:
+        if not isinstance(e, ImportError):
+            logger.warning(f"Fast HTML parsing failed, using BeautifulSoup: {str(e)}")
+    return soup_text(markup)
@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
+from lingua import IsoCode639_1, Language, LanguageDetector, LanguageDetectorBuilder
+
+logger = logging.getLogger(__name__)
+
+# Languages added to every restricted detector so that text in other common
+# languages is recognized (and dropped) instead of being attributed to the
+# closest requested language. Lingua always picks one of its candidates, so a
+# detector built for a single language would give it almost any text.
+REFERENCE_LANGUAGES = ("en", "es", "fr", "de", "it", "pt", "nl", "ru", "zh", "ja", "ko", "tr")
+# --lang values that keep every language Lingua knows
+AUTO_LANGUAGES = ("auto", "all")
+
+class TaggedParagraph(str):
+    """A paragraph annotated with its detected ISO 639-1 language code
+
+    Behaves exactly like str, so dedup and the writers handle it like any
+    other paragraph; writers that emit a language column read .language.
+    .section is the index of the source section (e.g. EPUB chapter) the
+    paragraph came from, or None.
+    """
+
+    def __new__(cls, text: str, language: Optional[str], section: Optional[int] = None):
+        paragraph = super().__new__(cls, text)
+        paragraph.language = language
+        paragraph.section = section
+        return paragraph
+
+def parse_languages(spec: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """Normalize "en,de" or ["en", "de"] to sorted ISO 639-1 codes; () means any language"""
+    codes = spec.split(",") if isinstance(spec, str) else spec
+    codes = sorted({code.strip().lower() for code in codes if code.strip()})
+    if not codes or any(code in AUTO_LANGUAGES for code in codes):
+        return ()
+    for code in codes:
+        try:
+            IsoCode639_1.from_str(code)
+        except ValueError:
+            raise ValueError(f"Unsupported language code: {code}") from None
+    return tuple(codes)
+
+def language_code(language: Optional[Language]) -> Optional[str]:
+    """ISO 639-1 code of a Lingua language, e.g. "en" """
+    return language.iso_code_639_1.name.lower() if language is not None else None
+
+class DetectorRegistry:
+    """Thread-safe cache of Lingua detectors keyed by language set and accuracy mode
+
+    Building a detector and loading its models is the expensive part of
+    language detection, so cleaners with the same languages share one
+    detector regardless of their other settings.
+    """
+
+    def __init__(self):
+        self._detectors: Dict[Tuple[Optional[FrozenSet[str]], bool], LanguageDetector] = {}
+        self._lock = threading.Lock()
+
+    def get(self, languages: Tuple[str, ...] = (), low_accuracy: bool = False) -> LanguageDetector:
+        """Detector for languages plus REFERENCE_LANGUAGES; () builds one for all languages
+
+        Callers keep only results in languages; the reference languages are
+        there so that other text is detected as what it is.
+        """
+        candidates = tuple(languages) + REFERENCE_LANGUAGES if languages else ()
+        key = (frozenset(candidates) if candidates else None, low_accuracy)
+        detector = self._detectors.get(key)
+        if detector is None:
+            with self._lock:
+                detector = self._detectors.get(key)
+                if detector is None:
+                    logger.info(f"Building language detector for {', '.join(sorted(key[0])) if key[0] else 'all languages'}"
+                                f"{' (low accuracy)' if low_accuracy else ''}")
+                    if key[0]:
+                        builder = LanguageDetectorBuilder.from_iso_codes_639_1(
+                            *[IsoCode639_1.from_str(code) for code in sorted(key[0])])
+                    else:
+                        builder = LanguageDetectorBuilder.from_all_languages()
+                    if low_accuracy:
+                        builder = builder.with_low_accuracy_mode()
+                    detector = builder.build()
+                    self._detectors[key] = detector
+        return detector
+
+    def __len__(self) -> int:
+        return len(self._detectors)
+
+# Registry shared by all cleaners in this process
+DETECTORS = DetectorRegistry()
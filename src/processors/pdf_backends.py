@@ -0,0 +1,177 @@
+import io
+import os
+import logging
+import threading
+import importlib.util
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[Path, BinaryIO]
+
+def extract_pdf_metadata(reader) -> Dict[str, str]:
+    """Extract metadata from a PyPDF2 PdfReader"""
+    meta = {}
+    try:
+        if reader.metadata:
+            meta = {
+                "title": reader.metadata.get("/Title", "").strip(),
+                "author": reader.metadata.get("/Author", "").strip(),
+                "creator": reader.metadata.get("/Creator", "").strip(),
+                "producer": reader.metadata.get("/Producer", "").strip(),
+                "creation_date": reader.metadata.get("/CreationDate", "").strip(),
+                "modification_date": reader.metadata.get("/ModDate", "").strip()
+            }
+    except Exception as e:
+        logger.warning(f"Metadata extraction failed: {str(e)}")
+    return meta
+
+# PDF info dictionary keys by metadata field, shared by the non-PyPDF2 backends
+_INFO_KEYS = {"title": "Title", "author": "Author", "creator": "Creator", "producer": "Producer",
+              "creation_date": "CreationDate", "modification_date": "ModDate"}
+
+# PDFium is not thread-safe; calls from the thread executor's workers are serialized
+_PDFIUM_LOCK = threading.Lock()
+
+def _pdfium_page_text(document, index: int) -> Optional[str]:
+    with _PDFIUM_LOCK:
+        page = document[index]
+        try:
+            text_page = page.get_textpage()
+            try:
+                return text_page.get_text_range()
+            finally:
+                text_page.close()
+        except Exception as e:
+            logger.warning(f"pypdfium2 failed on page {index + 1}: {str(e)}")
+            return None
+        finally:
+            page.close()
+
+def _iter_pypdfium2(source: PdfSource, meta: Dict) -> Iterator[Optional[str]]:
+    import pypdfium2 as pdfium
+
+    with _PDFIUM_LOCK:
+        document = pdfium.PdfDocument(source if hasattr(source, "read") else str(source))
+    try:
+        with _PDFIUM_LOCK:
+            info = document.get_metadata_dict(skip_empty=True)
+            page_count = len(document)
+        meta.update({field: info[key].strip() for field, key in _INFO_KEYS.items() if info.get(key, "").strip()})
+        for index in range(page_count):
+            yield _pdfium_page_text(document, index)
+    finally:
+        with _PDFIUM_LOCK:
+            document.close()
+
+def _pdfminer_metadata(document) -> Dict[str, str]:
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.utils import decode_text
+
+    info = resolve1(document.info[0]) if document.info else {}
+    meta = {}
+    for field, key in _INFO_KEYS.items():
+        value = resolve1(info.get(key, b""))
+        value = (decode_text(value) if isinstance(value, bytes) else str(value)).strip()
+        if value:
+            meta[field] = value
+    return meta
+
+def _iter_pdfminer(source: PdfSource, meta: Dict) -> Iterator[Optional[str]]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    f = source if hasattr(source, "read") else open(source, "rb")
+    try:
+        document = PDFDocument(PDFParser(f))
+        try:
+            meta.update(_pdfminer_metadata(document))
+        except Exception as e:
+            logger.warning(f"Metadata extraction failed: {str(e)}")
+        resources = PDFResourceManager(caching=True)
+        for page_number, page in enumerate(PDFPage.create_pages(document), 1):
+            # Layout analysis groups characters into lines and paragraphs in reading order
+            output = io.StringIO()
+            try:
+                with TextConverter(resources, output, laparams=LAParams()) as converter:
+                    PDFPageInterpreter(resources, converter).process_page(page)
+            except Exception as e:
+                logger.warning(f"pdfminer failed on page {page_number}: {str(e)}")
+                yield None
+                continue
+            yield output.getvalue()
+    finally:
+        if f is not source:
+            f.close()
+
+def _iter_pypdf2(source: PdfSource, meta: Dict) -> Iterator[Optional[str]]:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(source if hasattr(source, "read") else str(source))
+    meta.update(extract_pdf_metadata(reader))
+    for page in reader.pages:
+        try:
+            yield page.extract_text()
+        except Exception:
+            yield None
+
+# Text extraction engines by name: (module that must be installed, page text iterator).
+# Each iterator fills meta with the document metadata, then yields every page's text (None on failure).
+PDF_BACKENDS: Dict[str, tuple] = {
+    "pypdfium2": ("pypdfium2", _iter_pypdfium2),
+    "pypdf2": ("PyPDF2", _iter_pypdf2),
+    "pdfminer": ("pdfminer", _iter_pdfminer),
+}
+# "auto" picks the first installed of these. pdfminer's layout analysis gives better
+# reading order on multi-column pages but is several times slower, so it is opt-in.
+AUTO_BACKENDS = ("pypdfium2", "pypdf2")
+# The always-installed backend used when another one is missing or cannot open a file
+FALLBACK_BACKEND = "pypdf2"
+_END = object()
+_warned = set()
+
+def backend_available(name: str) -> bool:
+    return importlib.util.find_spec(PDF_BACKENDS[name][0]) is not None
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Backend to use for name (default: PDF_BACKEND, "auto" = fastest installed)"""
+    name = (name or os.getenv("PDF_BACKEND", "auto")).lower()
+    if name == "auto":
+        return next(backend for backend in AUTO_BACKENDS if backend_available(backend))
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name} (expected auto or one of {', '.join(PDF_BACKENDS)})")
+    if not backend_available(name):
+        if name not in _warned:
+            _warned.add(name)
+            logger.warning(f"PDF backend {name} is not installed, using {FALLBACK_BACKEND}")
+        return FALLBACK_BACKEND
+    return name
+
+def iter_page_texts(source: PdfSource, meta: Dict, backend: Optional[str] = None) -> Iterator[Optional[str]]:
+    """Yield the text of each page with the selected backend, recording the engine used in meta
+
+    If the backend cannot open the document, it is read again with PyPDF2.
+    """
+    name = resolve_backend(backend)
+    pages = PDF_BACKENDS[name][1](source, meta)
+    try:
+        first = next(pages, _END)
+    except Exception as e:
+        if name == FALLBACK_BACKEND:
+            raise
+        logger.warning(f"PDF backend {name} failed ({str(e)}), falling back to {FALLBACK_BACKEND}")
+        if hasattr(source, "seek"):
+            source.seek(0)
+        name = FALLBACK_BACKEND
+        pages = PDF_BACKENDS[name][1](source, meta)
+        first = next(pages, _END)
+    meta["pdf_backend"] = name
+    if first is _END:
+        return
+    yield first
+    yield from pages
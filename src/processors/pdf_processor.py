@@ -1,71 +1,134 @@
 import os
+import time
 import logging
+import concurrent.futures
 from pathlib import Path
-from typing import Tuple, Dict
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_path
+from typing import BinaryIO, Tuple, Dict, List, Iterator, Optional, Union
+from pdf2image import convert_from_bytes, convert_from_path
 import pytesseract
 
+from src.processors.pdf_backends import extract_pdf_metadata, iter_page_texts
+
 logger = logging.getLogger(__name__)
 
-def extract_pdf_metadata(reader: PdfReader) -> Dict[str, str]:
-    """Extract metadata from PDF document"""
-    meta = {}
-    try:
-        if reader.metadata:
-            meta = {
-                "title": reader.metadata.get("/Title", "").strip(),
-                "author": reader.metadata.get("/Author", "").strip(),
-                "creator": reader.metadata.get("/Creator", "").strip(),
-                "producer": reader.metadata.get("/Producer", "").strip(),
-                "creation_date": reader.metadata.get("/CreationDate", "").strip(),
-                "modification_date": reader.metadata.get("/ModDate", "").strip()
-            }
-    except Exception as e:
-        logger.warning(f"Metadata extraction failed: {str(e)}")
-    return meta
+def render_pages(file_path: Union[Path, BinaryIO], first_page: int, last_page: int) -> list:
+    """Rasterize a page range of a PDF file, or of a seekable binary stream, with poppler"""
+    options = {"first_page": first_page, "last_page": last_page, "thread_count": 2,
+               "poppler_path": os.getenv("POPPLER_PATH")}
+    if hasattr(file_path, "read"):
+        file_path.seek(0)
+        return convert_from_bytes(file_path.read(), **options)
+    return convert_from_path(str(file_path), **options)
 
 def ocr_single_page(file_path: Path, page_number: int) -> str:
     """Perform OCR on a single PDF page"""
     try:
-        images = convert_from_path(
-            str(file_path),
-            first_page=page_number,
-            last_page=page_number,
-            thread_count=2,
-            poppler_path=os.getenv("POPPLER_PATH")
-        )
-        return pytesseract.image_to_string(images[0], lang='eng') if images else ""
+        images = render_pages(file_path, page_number, page_number)
+        return pytesseract.image_to_string(images[0], lang=os.getenv("TESSERACT_LANG", "eng")) if images else ""
     except Exception as e:
         logger.error(f"OCR failed for page {page_number}: {str(e)}")
         return ""
 
-def process_pdf(file_path: Path) -> Tuple[str, bool, Dict]:
-    """Process PDF file with text extraction and OCR fallback"""
+def group_page_runs(page_numbers: List[int], max_run: int) -> List[Tuple[int, int]]:
+    """Group sorted page numbers into contiguous (first, last) runs of at most max_run pages"""
+    runs = []
+    for page in sorted(page_numbers):
+        if runs and page == runs[-1][1] + 1 and page - runs[-1][0] < max_run:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+def _ocr_image(image, page_number: int) -> str:
+    """Run tesseract on one rendered page image"""
     try:
-        reader = PdfReader(str(file_path))
-        pdf_meta = extract_pdf_metadata(reader)
-        text_parts = []
-        ocr_used = False
-        
-        for page_num, page in enumerate(reader.pages, 1):
+        return pytesseract.image_to_string(image, lang=os.getenv("TESSERACT_LANG", "eng"))
+    except Exception as e:
+        logger.error(f"OCR failed for page {page_number}: {str(e)}")
+        return ""
+
+def ocr_pages(file_path: Path, page_numbers: List[int]) -> Dict[int, str]:
+    """OCR several PDF pages, rendering contiguous runs in one poppler call
+
+    Each run of adjacent pages (capped at OCR_BATCH_PAGES to bound memory) is
+    rasterized by a single render_pages (poppler) call, and the resulting
+    images are dispatched to a pool of TESSERACT_THREADS tesseract workers.
+    Returns a mapping of page number to recognized text.
+    """
+    max_run = int(os.getenv("OCR_BATCH_PAGES", 8))
+    workers = int(os.getenv("TESSERACT_THREADS", min(4, os.cpu_count() or 1)))
+    results: Dict[int, str] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for first_page, last_page in group_page_runs(page_numbers, max_run):
             try:
-                page_text = page.extract_text()
-                if page_text and len(page_text.strip()) > 20:
-                    text_parts.append(page_text)
-                    continue
-            except Exception:
-                pass
-            
-            logger.info(f"Using OCR for page {page_num}")
-            ocr_text = ocr_single_page(file_path, page_num)
-            if ocr_text:
-                text_parts.append(ocr_text)
-                ocr_used = True
-            else:
-                logger.warning(f"Page {page_num} extraction failed")
-        
-        return "\n".join(text_parts), ocr_used, pdf_meta
+                images = render_pages(file_path, first_page, last_page)
+            except Exception as e:
+                logger.error(f"Rendering failed for pages {first_page}-{last_page}: {str(e)}")
+                continue
+            # Tesseract runs as a subprocess, so threads give real parallelism here
+            for page_number, image in zip(range(first_page, last_page + 1), images):
+                futures[executor.submit(_ocr_image, image, page_number)] = page_number
+
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return results
+
+def _ocr_window(file_path: Path, page_numbers: List[int], meta: Dict) -> Iterator[str]:
+    """OCR a window of pending pages and yield their text in page order"""
+    logger.info(f"Using OCR for pages {page_numbers[0]}-{page_numbers[-1]}")
+    start = time.perf_counter()
+    ocr_texts = ocr_pages(file_path, page_numbers)
+    meta["ocr_seconds"] = meta.get("ocr_seconds", 0.0) + time.perf_counter() - start
+    for page_num in page_numbers:
+        ocr_text = ocr_texts.get(page_num)
+        if ocr_text:
+            meta["ocr_used"] = True
+            meta["ocr_pages"] = meta.get("ocr_pages", 0) + 1
+            yield ocr_text
+        else:
+            logger.warning(f"Page {page_num} extraction failed")
+
+def iter_pdf(file_path: Union[Path, BinaryIO], meta: Optional[Dict] = None,
+             backend: Optional[str] = None) -> Iterator[str]:
+    """Yield PDF page texts in order, with batched OCR fallback
+
+    Page text comes from the backend engine (default: PDF_BACKEND, see
+    pdf_backends.resolve_backend). Image-only pages are buffered until a
+    text page (or a full window of OCR_BATCH_PAGES * TESSERACT_THREADS
+    pages) arrives, then OCRed together, so memory stays bounded by the
+    window rather than the document. PDF metadata, pdf_backend, ocr_used,
+    ocr_pages and ocr_seconds are written into meta. file_path may also be
+    a seekable binary stream (e.g. a decompressed input).
+    """
+    meta = meta if meta is not None else {}
+    meta.setdefault("ocr_used", False)
+
+    window = int(os.getenv("OCR_BATCH_PAGES", 8)) * int(os.getenv("TESSERACT_THREADS", min(4, os.cpu_count() or 1)))
+    pending: List[int] = []
+    try:
+        for page_num, page_text in enumerate(iter_page_texts(file_path, meta, backend), 1):
+            if page_text and len(page_text.strip()) > 20:
+                if pending:
+                    yield from _ocr_window(file_path, pending, meta)
+                    pending = []
+                yield page_text
+                continue
+            pending.append(page_num)
+            if len(pending) >= window:
+                yield from _ocr_window(file_path, pending, meta)
+                pending = []
     except Exception as e:
         logger.error(f"PDF processing failed: {str(e)}")
-        return "", False, {}
\ No newline at end of file
+        return
+    if pending:
+        yield from _ocr_window(file_path, pending, meta)
+
+def process_pdf(file_path: Path) -> Tuple[str, bool, Dict]:
+    """Process PDF file with text extraction and OCR fallback"""
+    meta: Dict = {}
+    text = "\n".join(iter_pdf(file_path, meta))
+    ocr_used = meta.pop("ocr_used", False)
+    return text, ocr_used, meta
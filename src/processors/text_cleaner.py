@@ -1,24 +1,80 @@
 import re
 import logging
-from typing import List
-from lingua import Language, LanguageDetectorBuilder
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple, Union
+from lingua import Language
+from src.processors.text_normalizer import TextNormalizer
+from src.processors.language_detector import DETECTORS, TaggedParagraph, language_code, parse_languages
 
 logger = logging.getLogger(__name__)
 
+# Function words that are common in English and rare in other Latin-script languages
+ENGLISH_STOPWORDS = frozenset({
+    "the", "and", "of", "that", "with", "this", "which", "were", "been", "would",
+    "their", "there", "what", "when", "will", "from", "have", "they", "these",
+    "those", "should", "could", "about", "into", "through", "because", "it's",
+    "its", "than", "then", "them", "only", "other", "such", "also", "after",
+})
+_WORD_PATTERN = re.compile(r"[a-z']+")
+# Small chunks (e.g. single TXT lines) are buffered up to this many characters
+# so that normalization runs over large blocks of text at once
+CLEAN_BUFFER_CHARS = 1 << 16
+
 class TextCleaner:
-    def __init__(self):
-        self.detector = LanguageDetectorBuilder.from_languages(Language.ENGLISH).build()
+    def __init__(self, batch_size: int = 256, parallel_detection: bool = False, prefilter: bool = True,
+                 clean_level: str = "basic", languages: Union[str, Iterable[str]] = ("en",), low_accuracy: bool = False):
+        self.languages = parse_languages(languages)
+        # Constructor arguments, used to rebuild an equivalent cleaner in worker processes
+        self.config: Dict = {
+            "batch_size": batch_size,
+            "parallel_detection": parallel_detection,
+            "prefilter": prefilter,
+            "clean_level": clean_level,
+            "languages": list(self.languages),
+            "low_accuracy": low_accuracy
+        }
+        self.normalizer = TextNormalizer.from_preset(clean_level)
+        self.batch_size = max(1, batch_size)
+        self.parallel_detection = parallel_detection
+        self.prefilter = prefilter
+        self.detector = DETECTORS.get(self.languages, low_accuracy)
+        # Target languages to keep; empty means keep every language (auto)
+        self._keep = set(self.languages)
+        self._english_wanted = not self._keep or "en" in self._keep
+        self._english_only = self._keep == {"en"}
+
+    def _clean_buffer(self, buffer: List[str], section: Optional[int]) -> Iterator[str]:
+        lines = self.normalizer.iter_lines("\n".join(buffer))
+        if section is None:
+            return lines
+        return (TaggedParagraph(line, None, section) for line in lines)
+
+    def iter_clean(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Lazily normalize and clean a stream of raw text chunks
+
+        Chunks with a .section attribute (EPUB chapters) are never buffered
+        together with chunks of another section, and their lines keep it.
+        """
+        buffer: List[str] = []
+        size = 0
+        section = None
+        for chunk in chunks:
+            chunk_section = getattr(chunk, "section", None)
+            if buffer and chunk_section != section:
+                yield from self._clean_buffer(buffer, section)
+                buffer, size = [], 0
+            section = chunk_section
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= CLEAN_BUFFER_CHARS:
+                yield from self._clean_buffer(buffer, section)
+                buffer, size = [], 0
+        if buffer:
+            yield from self._clean_buffer(buffer, section)
 
     def clean_text(self, text: str) -> List[str]:
         """Normalize and clean raw text"""
-        cleaned = []
-        for line in text.splitlines():
-            stripped = line.strip()
-            if len(stripped) < 10:
-                continue
-            normalized = re.sub(r"\s+", " ", stripped)
-            cleaned.append(normalized)
-        return cleaned
+        return list(self.iter_clean([text]))
 
     def is_english(self, text: str) -> bool:
         """Determine if text is English using Lingua"""
@@ -31,6 +87,70 @@ class TextCleaner:
             logger.warning(f"Language detection error: {str(e)}")
             return False
 
+    def prefilter_english(self, text: str) -> Optional[bool]:
+        """Cheap heuristic verdict: True/False when obvious, None when the model must decide"""
+        if not text.isascii():
+            letters = [c for c in text if c.isalpha()]
+            if not letters:
+                return False
+            non_ascii = sum(1 for c in letters if not c.isascii())
+            return False if non_ascii / len(letters) > 0.3 else None
+        words = _WORD_PATTERN.findall(text.lower())
+        if not words:
+            return False
+        if len(words) < 6:
+            return None
+        hits = [w for w in words if w in ENGLISH_STOPWORDS]
+        if len(set(hits)) >= 2 and len(hits) / len(words) >= 0.2:
+            return True
+        return None
+
+    def _detect_batch(self, texts: List[str]) -> List[Optional[Language]]:
+        """Run Lingua over a batch, optionally across its thread pool"""
+        try:
+            if self.parallel_detection:
+                return self.detector.detect_languages_in_parallel_of(texts)
+            return [self.detector.detect_language_of(text) for text in texts]
+        except Exception as e:
+            logger.warning(f"Language detection error: {str(e)}")
+            return [None] * len(texts)
+
+    def _prefilter_language(self, line: str) -> Tuple[bool, Optional[str]]:
+        """(decided, language) from the English heuristics; language None drops a decided line"""
+        verdict = self.prefilter_english(line)
+        if verdict is True:
+            return True, "en" if self._english_wanted else None
+        if verdict is False and self._english_only:
+            return True, None
+        return False, None
+
+    def _tag_batch(self, lines: List[str]) -> List[TaggedParagraph]:
+        """Tag one batch with languages and keep target-language lines, sending only undecided lines to the detector"""
+        tags: List[Optional[str]] = [None] * len(lines)
+        pending = []
+        for i, line in enumerate(lines):
+            decided, tags[i] = self._prefilter_language(line) if self.prefilter else (False, None)
+            if not decided and line.strip():
+                pending.append(i)
+        if pending:
+            for i, language in zip(pending, self._detect_batch([lines[i] for i in pending])):
+                tags[i] = language_code(language)
+        return [TaggedParagraph(line, tag, getattr(line, "section", None)) for line, tag in zip(lines, tags)
+                if tag is not None and (not self._keep or tag in self._keep)]
+
+    def iter_tag_languages(self, lines: Iterable[str]) -> Iterator[TaggedParagraph]:
+        """Lazily keep lines in the target languages, tagged with their language, one batch in memory at a time"""
+        iterator = iter(lines)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield from self._tag_batch(batch)
+
+    def iter_filter_english(self, lines: Iterable[str]) -> Iterator[str]:
+        """Lazily filter lines not in the target languages (English by default)"""
+        return self.iter_tag_languages(lines)
+
     def filter_english(self, lines: List[str]) -> List[str]:
-        """Filter non-English text from line list"""
-        return [line for line in lines if self.is_english(line)]
\ No newline at end of file
+        """Filter text not in the target languages from line list in batches of batch_size"""
+        return [str(line) for line in self.iter_tag_languages(lines)]
@@ -0,0 +1,94 @@
+import re
+import unicodedata
+from typing import Dict, Iterator, Optional
+
+# A word broken across lines by a hyphen, e.g. "normal-\nization" (continuation in lowercase);
+# the pattern starts with a literal so the regex engine can scan for it quickly
+_HYPHENATED_BREAK = re.compile(r"-[^\S\n\r]*(?:\r\n|[\n\r])\s*(?=[a-z])")
+_URLS = re.compile(r"(?:https?://|www\.)\S+")
+_EMAILS = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# C0/C1 control characters (except line boundaries and tabs) and invisible format characters
+_CONTROL_CHARS = re.compile("[\x00-\x08\x0e-\x1b\x1f\x7f-\x84\x86-\x9f\u200b-\u200d\u2060\ufeff]+")
+# Typographic ligatures and soft hyphens produced by PDF text extraction
+_LIGATURES = {
+    "\u00ad": "",
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi", "\ufb04": "ffl", "\ufb05": "st", "\ufb06": "st",
+    "\u0132": "IJ", "\u0133": "ij", "\u0152": "OE", "\u0153": "oe",
+}
+_LIGATURE_PATTERN = re.compile("[" + "".join(_LIGATURES) + "]")
+_NON_ALPHA_ASCII = bytes(c for c in range(128) if not chr(c).isalpha())
+
+def _join_hyphenated(match: re.Match) -> str:
+    start = match.start()
+    return "" if start and match.string[start - 1].isalpha() else match.group()
+
+def _letter_count(line: str) -> int:
+    if line.isascii():
+        return len(line.encode("ascii").translate(None, _NON_ALPHA_ASCII))
+    return sum(1 for c in line if c.isalpha())
+
+# Named cleaning levels, from cheapest to most thorough
+NORMALIZATION_PRESETS: Dict[str, Dict] = {
+    "basic": {},
+    "standard": {"strip_control": True, "fix_ligatures": True},
+    "advanced": {"strip_control": True, "fix_ligatures": True, "unicode_form": "NFKC", "repair_hyphenation": True},
+    "aggressive": {"strip_control": True, "fix_ligatures": True, "unicode_form": "NFKC", "repair_hyphenation": True,
+                   "strip_urls": True, "min_length": 20, "min_alpha_ratio": 0.5},
+}
+CLEAN_LEVELS = list(NORMALIZATION_PRESETS)
+
+class TextNormalizer:
+    """Configurable text normalization with rules compiled once at import
+
+    Character-level rules (control chars, ligatures, Unicode form, URLs,
+    hyphenated line breaks) each run as one pass over a whole chunk and
+    are skipped outright when a cheap check shows they cannot match.
+    Whitespace is then collapsed per line with str.split/join, which is
+    markedly faster than a regex substitution.
+    """
+
+    def __init__(self, unicode_form: Optional[str] = None, strip_control: bool = False,
+                 fix_ligatures: bool = False, repair_hyphenation: bool = False, strip_urls: bool = False,
+                 min_length: int = 10, min_alpha_ratio: float = 0.0):
+        if unicode_form not in (None, "NFC", "NFKC", "NFD", "NFKD"):
+            raise ValueError(f"Unsupported unicode form: {unicode_form}")
+        self.unicode_form = unicode_form
+        self.strip_control = strip_control
+        self.fix_ligatures = fix_ligatures
+        self.repair_hyphenation = repair_hyphenation
+        self.strip_urls = strip_urls
+        self.min_length = min_length
+        self.min_alpha_ratio = min_alpha_ratio
+
+    @classmethod
+    def from_preset(cls, level: str) -> "TextNormalizer":
+        if level not in NORMALIZATION_PRESETS:
+            raise ValueError(f"Unknown clean level: {level} (expected one of {', '.join(CLEAN_LEVELS)})")
+        return cls(**NORMALIZATION_PRESETS[level])
+
+    def normalize(self, text: str) -> str:
+        """Apply the character-level rules to a chunk, keeping its line structure"""
+        if self.strip_control:
+            text = _CONTROL_CHARS.sub("", text)
+        if not text.isascii():
+            if self.fix_ligatures:
+                text = _LIGATURE_PATTERN.sub(lambda m: _LIGATURES[m.group()], text)
+            if self.unicode_form and not unicodedata.is_normalized(self.unicode_form, text):
+                text = unicodedata.normalize(self.unicode_form, text)
+        if self.strip_urls and ("://" in text or "www." in text):
+            text = _URLS.sub(" ", text)
+        if self.repair_hyphenation:
+            text = _HYPHENATED_BREAK.sub(_join_hyphenated, text)
+        return text
+
+    def iter_lines(self, text: str) -> Iterator[str]:
+        """Yield whitespace-collapsed lines of a chunk that pass the length and letter-ratio filters"""
+        for line in self.normalize(text).splitlines():
+            if self.strip_urls and "@" in line:
+                line = _EMAILS.sub(" ", line)
+            line = " ".join(line.split())
+            if len(line) < self.min_length:
+                continue
+            if self.min_alpha_ratio and _letter_count(line) < self.min_alpha_ratio * len(line):
+                continue
+            yield line
@@ -1,36 +1,46 @@
 import logging
 from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+
+from src.utils.text_encoding import iter_decoded_lines
 
 logger = logging.getLogger(__name__)
 
-def process_txt(file_path: Path) -> str:
-    """Read and return text from TXT file"""
+def _iter_lines(f: BinaryIO, name, meta: Optional[Dict]) -> Iterator[str]:
+    meta = meta if meta is not None else {}
+    yield from iter_decoded_lines(f, meta)
+    if meta.get("undecodable_characters"):
+        logger.warning(f"Unicode decode errors in {name}: {meta['undecodable_characters']} "
+                       f"characters not valid {meta['encoding']} were replaced")
+
+def iter_txt(file_path: Union[Path, BinaryIO], meta: Optional[Dict] = None) -> Iterator[str]:
+    """Yield lines from TXT file (or binary stream) without loading it into memory
+
+    The encoding is detected from the first block (see text_encoding) and
+    the file is decoded in one streaming pass; meta receives the encoding.
+    """
     try:
+        if hasattr(file_path, "read"):
+            yield from _iter_lines(file_path, getattr(file_path, "name", "stream"), meta)
+            return
+
         if not file_path.exists():
             logger.error(f"File not found: {file_path}")
-            return ""
-            
+            return
+
         if file_path.stat().st_size == 0:
             logger.warning(f"Empty file: {file_path}")
-            return ""
-            
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        if not content.strip():
-            logger.warning(f"File contains only whitespace: {file_path}")
-            return ""
-            
-        return content
-        
-    except UnicodeDecodeError as e:
-        logger.error(f"Unicode decode error in {file_path}: {str(e)}")
-        try:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
-        except Exception as e2:
-            logger.error(f"Failed to read with latin-1 encoding: {str(e2)}")
-            return ""
+            return
+
+        with open(file_path, 'rb') as f:
+            yield from _iter_lines(f, file_path, meta)
     except Exception as e:
         logger.error(f"TXT processing failed: {str(e)}")
+
+def process_txt(file_path: Path) -> str:
+    """Read and return text from TXT file"""
+    content = "".join(iter_txt(file_path))
+    if content and not content.strip():
+        logger.warning(f"File contains only whitespace: {file_path}")
         return ""
+    return content
@@ -0,0 +1,51 @@
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Tuple
+
+from src.processors.text_cleaner import TextCleaner
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_SAMPLE = "The quick brown fox jumps over the lazy dog near the river bank."
+
+class CleanerPool:
+    """Thread-safe registry of long-lived TextCleaner instances
+
+    One cleaner is built per distinct configuration (e.g. batch size,
+    languages) and shared by all threads: cleaners hold no per-call state
+    and Lingua detectors are safe for concurrent use, so sharing avoids
+    rebuilding a detector for every request.
+    """
+
+    def __init__(self, factory: Callable[..., TextCleaner] = TextCleaner):
+        self._factory = factory
+        self._cleaners: Dict[Tuple, TextCleaner] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(config: Dict) -> Tuple:
+        return tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in config.items()))
+
+    def get(self, **config) -> TextCleaner:
+        """Return the shared cleaner for config, building it on first use"""
+        key = self._key(config)
+        cleaner = self._cleaners.get(key)
+        if cleaner is None:
+            with self._lock:
+                cleaner = self._cleaners.get(key)
+                if cleaner is None:
+                    logger.info(f"Building text cleaner for {dict(key) or 'default config'}")
+                    cleaner = self._factory(**config)
+                    self._cleaners[key] = cleaner
+        return cleaner
+
+    def warm_up(self, configs: Iterable[Dict] = ({},)) -> None:
+        """Build cleaners for configs and run one detection so models are loaded before traffic"""
+        for config in configs:
+            try:
+                self.get(**config).is_english(WARM_UP_SAMPLE)
+            except Exception as e:
+                logger.warning(f"Cleaner warm-up failed for {config}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._cleaners)
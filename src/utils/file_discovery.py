@@ -0,0 +1,94 @@
+import os
+import hashlib
+import logging
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse "i/N" (0 <= i < N) into (i, N); None or "" means no sharding"""
+    if not spec:
+        return None
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard: {spec} (expected i/N, e.g. 0/4)") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard: {spec} (index must be between 0 and {count - 1})")
+    return index, count
+
+def shard_of(relative_path: str, count: int) -> int:
+    """Shard a file belongs to, from a stable hash of its path relative to the input root"""
+    digest = hashlib.blake2b(relative_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+def _matches(relative_path: str, patterns: Iterable[str]) -> bool:
+    # Patterns with a slash match the relative path, others just the name
+    name = relative_path.rsplit("/", 1)[-1]
+    return any(fnmatchcase(relative_path if "/" in pattern else name, pattern) for pattern in patterns)
+
+def selected(relative_path: str, include: Iterable[str] = (), exclude: Iterable[str] = (),
+             shard: Optional[Tuple[int, int]] = None) -> bool:
+    """Whether iter_input_files would yield the file at relative_path (a posix path under the root)"""
+    parts = relative_path.split("/")
+    if exclude and any(_matches("/".join(parts[:i]), exclude) for i in range(1, len(parts) + 1)):
+        return False
+    if include and not _matches(relative_path, include):
+        return False
+    return shard is None or shard_of(relative_path, shard[1]) == shard[0]
+
+def iter_input_files(root: Path, include: Iterable[str] = (), exclude: Iterable[str] = (),
+                     shard: Optional[Tuple[int, int]] = None) -> Iterator[Path]:
+    """Yield files under root recursively, in a deterministic order, as they are found
+
+    Directories are walked with os.scandir, so file types come from the
+    directory listing instead of a stat per entry, and nothing is collected
+    up front. Symlinks to files are followed, symlinks to directories are not. include/exclude are glob patterns (e.g. "*.pdf", "drafts/*");
+    an excluded directory is not descended into. With shard=(i, N) only
+    files whose relative path hashes to shard i are yielded, so N nodes
+    running with 0/N .. N-1/N split the tree between them without
+    coordination, and adding files never moves existing ones between shards.
+    """
+    include, exclude = tuple(include or ()), tuple(exclude or ())
+    stack = [(Path(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {str(e)}")
+            continue
+        subdirectories = []
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if exclude and _matches(relative_path, exclude):
+                continue
+            try:
+                # Like os.walk, do not descend into directory symlinks, which can loop
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append((Path(entry.path), relative_path + "/"))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if include and not _matches(relative_path, include):
+                continue
+            if shard is not None and shard_of(relative_path, shard[1]) != shard[0]:
+                continue
+            yield Path(entry.path)
+        # Reversed so that the stack visits subdirectories in name order
+        stack.extend(reversed(subdirectories))
+
+def relative_input_path(file: Path, root: Path) -> PurePosixPath:
+    """file relative to the input root, or just its name if it lies outside"""
+    file, root = Path(file), Path(root)
+    for candidate, base in ((file, root), (file.absolute(), root.absolute())):
+        try:
+            return PurePosixPath(candidate.relative_to(base).as_posix())
+        except ValueError:
+            pass
+    return PurePosixPath(file.name)
@@ -1,35 +1,132 @@
 from pathlib import Path
+import codecs
+import zipfile
 import mimetypes
 import logging
+from typing import BinaryIO, Optional
+
+from src.utils.text_encoding import detect_bom, detect_encoding
 
-# Configure logger
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a file to identify it
+SNIFF_BYTES = 8192
+# Single-file compression formats by magic number
+COMPRESSION_MAGIC = {b"\x1f\x8b": "gzip", b"BZh": "bz2", b"\x28\xb5\x2f\xfd": "zstd"}
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd"}
+_HTML_MARKERS = ("<!doctype html", "<html", "<head", "<body", "<title", "<p>", "<div")
+
+def _sample_text(header: bytes) -> Optional[str]:
+    """Decode a file header as text, or None if it looks binary"""
+    bom = detect_bom(header)
+    if bom:
+        # Drop a trailing partial code unit left by the cut-off sample
+        return codecs.getincrementaldecoder(bom[0])("replace").decode(header[bom[1]:])
+    if b"\x00" in header:
+        encoding = detect_encoding(header)
+        if not encoding.startswith("utf-16"):
+            return None
+        return codecs.getincrementaldecoder(encoding)("replace").decode(header)
+    try:
+        return codecs.getincrementaldecoder("utf-8")().decode(header)
+    except UnicodeDecodeError:
+        # Legacy single-byte text; reject it if control bytes suggest binary data
+        controls = sum(1 for b in header if b < 32 and b not in b"\t\n\r\f")
+        return header.decode("latin-1") if controls <= len(header) // 100 else None
+
+def inspect_zip(stream: BinaryIO) -> str:
+    """Tell EPUB and DOCX apart from plain ZIP archives by their entries (reads the central directory only)"""
+    try:
+        with zipfile.ZipFile(stream) as archive:
+            names = set(archive.namelist())
+            if "META-INF/container.xml" in names or (
+                    "mimetype" in names and archive.read("mimetype").strip() == b"application/epub+zip"):
+                return "epub"
+            if "word/document.xml" in names:
+                return "docx"
+            return "zip"
+    except zipfile.BadZipFile:
+        return "unknown"
+
+def sniff_format(header: bytes, stream: Optional[BinaryIO] = None) -> Optional[str]:
+    """Identify content from its first bytes: pdf, epub, docx, zip, gzip, bz2, zstd, html or txt
+
+    ZIP containers are only told apart when a seekable stream is given.
+    Returns None for empty or unrecognized binary content.
+    """
+    if not header:
+        return None
+    # PDF allows up to 1KB of junk before the header
+    if b"%PDF-" in header[:1024]:
+        return "pdf"
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    if header.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        if stream is None:
+            return "zip"
+        stream.seek(0)
+        return inspect_zip(stream)
+    text = _sample_text(header)
+    if text is None:
+        return None
+    head = text[:1024].lstrip().lower()
+    if head.startswith(("<!doctype html", "<html")) or (
+            head.startswith(("<", "<?xml")) and any(marker in head for marker in _HTML_MARKERS)):
+        return "html"
+    return "txt"
+
+def _format_from_name(file_path: Path) -> str:
+    """File type implied by the extension and mime type"""
+    mime, _ = mimetypes.guess_type(str(file_path))
+    ext = file_path.suffix.lower()
+
+    if ext in COMPRESSED_SUFFIXES:
+        return COMPRESSED_SUFFIXES[ext]
+    if ext == ".pdf" or (mime and "pdf" in mime):
+        return "pdf"
+    if ext == ".epub" or (mime and "epub" in mime):
+        return "epub"
+    if ext == ".docx" or (mime and "word" in mime):
+        return "docx"
+    if ext == ".zip":
+        return "zip"
+    # Checked before generic text: the mime type of HTML files is text/html
+    if ext == ".html" or ext == ".htm" or (mime and "html" in mime):
+        return "html"
+    if ext == ".txt" or (mime and "text" in mime):
+        return "txt"
+    return "unknown"
+
 def detect_file_type(file_path: Path) -> str:
-    """Returns the file type based on extension and mime type."""
+    """Returns the file type based on its content, falling back to extension and mime type.
+
+    Only the first SNIFF_BYTES bytes (plus a ZIP's central directory) are
+    read, so misnamed or extensionless files still reach the right processor
+    and unsupported binaries are rejected before any parsing.
+    """
     if not file_path.exists():
         logger.error(f"File not found: {file_path}")
         return "unknown"
-        
+
     try:
-        mime, _ = mimetypes.guess_type(str(file_path))
-        ext = file_path.suffix.lower()
-        
-        if ext == ".pdf" or (mime and "pdf" in mime):
-            return "pdf"
-        if ext == ".epub" or (mime and "epub" in mime):
-            return "epub"
-        if ext == ".txt" or (mime and "text" in mime):
-            return "txt"
-        if ext == ".docx" or (mime and "word" in mime):
-            return "docx"
-        if ext == ".html" or ext == ".htm" or (mime and "html" in mime):
+        with open(file_path, "rb") as f:
+            sniffed = sniff_format(f.read(SNIFF_BYTES), f)
+        named = _format_from_name(file_path)
+
+        if sniffed is None:
+            # Empty files keep their declared type so the processor can report them
+            if file_path.stat().st_size == 0 and named != "unknown":
+                return named
+            logger.warning(f"Unrecognized file type for {file_path}")
+            return "unknown"
+        # Plain text can be either; markup without recognizable tags still counts as HTML if named so
+        if sniffed == "txt" and named == "html":
             return "html"
-        
-        logger.warning(f"Unrecognized file type for {file_path}")
-        return "unknown"
-        
+        if named != "unknown" and named != sniffed:
+            logger.info(f"{file_path.name} looks like {sniffed}, not {named}")
+        return sniffed
+
     except Exception as e:
         logger.error(f"Error detecting file type: {str(e)}")
         return "unknown"
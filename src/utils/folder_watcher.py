@@ -0,0 +1,132 @@
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.utils.file_discovery import iter_input_files, relative_input_path, selected
+
+logger = logging.getLogger(__name__)
+
+# Names that belong to partial downloads, editors or our own temporary files
+IGNORED_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".swp", ".lock")
+
+Signature = Tuple[int, int]
+
+class FolderWatcher:
+    """Report files in a directory tree once they have stopped changing
+
+    A file is ready when its size and mtime have been unchanged for
+    debounce seconds, so files that are still being copied in are not
+    picked up half-written. Each version of a file is reported once.
+
+    Change notifications come from watchdog (inotify/FSEvents/...) when it
+    is installed; only touched files are then re-checked, with a full
+    rescan every rescan_interval seconds to catch missed events. Without
+    watchdog the directory is polled every poll_interval seconds.
+    include/exclude/shard select files as in iter_input_files.
+    """
+
+    def __init__(self, directory: Path, debounce: float = 2.0, poll_interval: float = 1.0,
+                 use_watchdog: bool = True, rescan_interval: float = 60.0, include: Iterable[str] = (),
+                 exclude: Iterable[str] = (), shard: Optional[Tuple[int, int]] = None):
+        self.directory = Path(directory)
+        self.include, self.exclude, self.shard = tuple(include or ()), tuple(exclude or ()), shard
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self._candidates: Dict[str, Tuple[Signature, float]] = {}
+        self._reported: Dict[str, Signature] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self._last_scan = float("-inf")
+        self._observer = self._start_observer() if use_watchdog else None
+
+    def _start_observer(self):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            logger.info("watchdog not installed, polling for new files")
+            return None
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    # A directory moved in arrives as a single event; rescan the tree for its files
+                    if event.event_type in ("created", "moved"):
+                        watcher._last_scan = float("-inf")
+                else:
+                    with watcher._lock:
+                        watcher._dirty.add(os.fsdecode(event.src_path))
+                        dest = getattr(event, "dest_path", None)
+                        if dest:
+                            watcher._dirty.add(os.fsdecode(dest))
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.directory), recursive=True)
+            observer.start()
+            logger.info(f"Watching {self.directory} for new files")
+            return observer
+        except Exception as e:
+            logger.warning(f"File notifications unavailable ({str(e)}), polling for new files")
+            return None
+
+    def _scan(self) -> Set[str]:
+        return {str(path) for path in iter_input_files(self.directory, self.include, self.exclude, self.shard)}
+
+    def poll(self) -> List[Path]:
+        """Check for changes once and return files that became ready, oldest first"""
+        now = time.monotonic()
+        with self._lock:
+            paths, self._dirty = self._dirty, set()
+        paths = {path for path in paths
+                 if selected(str(relative_input_path(Path(path), self.directory)), self.include, self.exclude, self.shard)}
+        if self._observer is None or now - self._last_scan >= self.rescan_interval:
+            paths |= self._scan()
+            self._last_scan = now
+        paths |= self._candidates.keys()
+
+        for path in paths:
+            name = os.path.basename(path)
+            if name.startswith(".") or name.endswith(IGNORED_SUFFIXES):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._candidates.pop(path, None)
+                self._reported.pop(path, None)
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._reported.get(path) == signature:
+                self._candidates.pop(path, None)
+                continue
+            previous = self._candidates.get(path)
+            if previous is None or previous[0] != signature:
+                self._candidates[path] = (signature, now)
+
+        ready = sorted((since, path) for path, (_, since) in self._candidates.items() if now - since >= self.debounce)
+        for _, path in ready:
+            self._reported[path] = self._candidates.pop(path)[0]
+        return [Path(path) for _, path in ready]
+
+    def run(self, on_ready: Callable[[Path], None], stop_event: Optional[threading.Event] = None) -> None:
+        """Call on_ready for every ready file until stop_event is set"""
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                for path in self.poll():
+                    on_ready(path)
+                stop_event.wait(self.poll_interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
@@ -0,0 +1,133 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses of files whose output is complete and need not be processed again
+DONE_STATUSES = ("success", "cached")
+
+class JobManifest:
+    """Durable per-file record of batch runs, stored in SQLite
+
+    Every file gets one row with its status (running/success/cached/failed),
+    size and mtime, content hash, timings, output counts and last error.
+    Rows are written in their own short transaction as each file starts and
+    finishes, so a run killed at any point leaves an accurate record and the
+    next run only processes files that are new, changed, failed or were
+    still running. config (the processing settings) is fingerprinted into
+    every row, so changing settings reprocesses everything.
+    """
+
+    def __init__(self, path: Path, config: Optional[Dict] = None):
+        self.path = Path(path)
+        self.config_key = hashlib.blake2b(json.dumps(config or {}, sort_keys=True, default=str).encode("utf-8"),
+                                          digest_size=8).hexdigest()
+        self._local = threading.local()
+        self._connection()
+
+    def __getstate__(self):
+        # Connections are per thread/process; rebuild them after pickling to worker processes
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """SQLite connection for the current thread, creating the schema on first use"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=60)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime_ns INTEGER,
+                config_key TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                content_hash TEXT,
+                started REAL,
+                finished REAL,
+                seconds REAL,
+                paragraphs INTEGER,
+                characters INTEGER,
+                ocr_pages INTEGER,
+                stages TEXT,
+                error TEXT
+            )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS files_status ON files (status)")
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _signature(file: Path):
+        stat = file.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def iter_pending(self, files: Iterable[Path]) -> Iterator[Path]:
+        """Yield the files that are not yet done with their current content (by size/mtime) and config
+
+        Done records are loaded once up front; files are checked as they are consumed.
+        """
+        done = {
+            row[0]: (row[1], row[2])
+            for row in self._connection().execute(
+                f"SELECT path, size, mtime_ns FROM files WHERE config_key = ? AND status IN ({','.join('?' * len(DONE_STATUSES))})",
+                (self.config_key, *DONE_STATUSES))
+        }
+        for f in files:
+            if done.get(str(f)) != self._signature(f):
+                yield f
+
+    def pending(self, files: Iterable[Path]) -> List[Path]:
+        """Files that are not yet done with their current content (by size/mtime) and config"""
+        return list(self.iter_pending(files))
+
+    def start(self, file: Path) -> None:
+        """Mark a file as running; a crash leaves it in this state for the next run to retry"""
+        size, mtime_ns = self._signature(file)
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO files (path, size, mtime_ns, config_key, status, attempts, started) "
+                "VALUES (?, ?, ?, ?, 'running', 1, ?) "
+                "ON CONFLICT (path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+                "config_key = excluded.config_key, status = 'running', attempts = attempts + 1, "
+                "started = excluded.started, finished = NULL, error = NULL",
+                (str(file), size, mtime_ns, self.config_key, time.time()))
+
+    def finish(self, file: Path, status: str, seconds: float, stages: Optional[Dict] = None,
+               metadata: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        """Record the outcome of a file"""
+        metadata = metadata or {}
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE files SET status = ?, finished = ?, seconds = ?, content_hash = ?, paragraphs = ?, "
+                "characters = ?, ocr_pages = ?, stages = ?, error = ? WHERE path = ?",
+                (status, time.time(), seconds, metadata.get("content_hash"), metadata.get("paragraph_count"),
+                 metadata.get("character_count"), metadata.get("ocr_pages"),
+                 json.dumps(stages) if stages else None, error, str(file)))
+
+    def rows(self) -> Iterable[sqlite3.Row]:
+        """Records of the files last processed with the current config"""
+        connection = self._connection()
+        cursor = connection.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor.execute("SELECT * FROM files WHERE config_key = ? ORDER BY path", (self.config_key,))
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,104 @@
+import time
+import uuid
+import logging
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("finished", "failed")
+
+class JobQueue:
+    """In-process background job runner with bounded concurrency
+
+    Jobs run on a thread pool of max_workers; at most max_pending jobs may
+    be queued or running at once, beyond which submit() refuses new work.
+    The last max_history jobs are kept for status polling. A job function
+    receives an update(**fields) callback for progress reporting and its
+    return value is stored under "result".
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, max_history: int = 1000):
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job["status"] not in TERMINAL_STATUSES)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond max_history"""
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in TERMINAL_STATUSES]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def submit(self, func: Callable[[Callable[..., None]], Any], **info) -> Optional[str]:
+        """Queue func for background execution; return its job id, or None if the queue is full"""
+        with self._lock:
+            if self._active_count() >= self.max_pending:
+                return None
+            self._prune()
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "progress": {},
+                "result": None,
+                "error": None,
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                **info
+            }
+        self._executor.submit(self._run, job_id, func)
+        return job_id
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                self._changed.notify_all()
+
+    def _run(self, job_id: str, func: Callable[[Callable[..., None]], Any]) -> None:
+        self._update(job_id, status="running", started=time.time())
+
+        def report(**progress):
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["progress"].update(progress)
+                    self._changed.notify_all()
+
+        try:
+            result = func(report)
+            self._update(job_id, status="finished", result=result, finished=time.time())
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed: {e}")
+            self._update(job_id, status="failed", error=str(e), finished=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a snapshot of a job's state, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {**job, "progress": dict(job["progress"])} if job is not None else None
+
+    def wait_for_change(self, job_id: str, last_state: Optional[Dict], timeout: float = 15.0) -> Optional[Dict]:
+        """Block until the job differs from last_state (or timeout) and return the new snapshot"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                job = self._jobs.get(job_id)
+                snapshot = {**job, "progress": dict(job["progress"])} if job is not None else None
+                remaining = deadline - time.monotonic()
+                if snapshot != last_state or remaining <= 0:
+                    return snapshot
+                self._changed.wait(remaining)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,131 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Pipeline stages in execution order, as recorded in metadata and metrics
+STAGES = ["detect_type", "extract", "ocr", "clean", "language_filter", "dedup", "write", "metadata"]
+
+class StageTimer:
+    """Per-file stage durations and counters
+
+    Streaming stages run interleaved, so timed_iter() measures inclusive time
+    (a stage plus everything upstream of it); exclusive() then converts a
+    chain of nested stages into self-time per stage.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+
+    def _entry(self, name: str) -> Dict:
+        return self.stages.setdefault(name, {"seconds": 0.0})
+
+    def add(self, name: str, seconds: float = 0.0, **counts) -> None:
+        """Add a duration and counters to a stage"""
+        entry = self._entry(name)
+        entry["seconds"] += seconds
+        for key, value in counts.items():
+            entry[key] = entry.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block as stage `name`"""
+        start = time.perf_counter()
+        try:
+            yield self._entry(name)
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def timed_iter(self, items: Iterable, name: str) -> Iterator:
+        """Pass items through, charging the time spent producing each one to `name`"""
+        entry = self._entry(name)
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                entry["seconds"] += time.perf_counter() - start
+                return
+            entry["seconds"] += time.perf_counter() - start
+            yield item
+
+    def exclusive(self, chain: List[str]) -> None:
+        """Turn inclusive times of a producer->consumer chain into self-times"""
+        inclusive = [self._entry(name)["seconds"] for name in chain]
+        for index in range(len(chain) - 1, 0, -1):
+            self.stages[chain[index]]["seconds"] = max(0.0, inclusive[index] - inclusive[index - 1])
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Stages in pipeline order with rounded durations"""
+        ordered = sorted(self.stages.items(), key=lambda kv: STAGES.index(kv[0]) if kv[0] in STAGES else len(STAGES))
+        return {name: {**entry, "seconds": round(entry["seconds"], 6)} for name, entry in ordered}
+
+class MetricsRegistry:
+    """Process-wide counters exposed in Prometheus text format
+
+    Each process has its own registry; with the process executor, workers
+    drain() theirs after every chunk and the parent merges the snapshots.
+    """
+
+    def __init__(self, prefix: str = "makeaidatasets"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._files: Dict[str, int] = {}
+        self._stage_seconds: Dict[str, float] = {}
+        self._stage_calls: Dict[str, int] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+
+    def record_file(self, status: str, stages: Dict[str, Dict]) -> None:
+        """Record one processed file and its stage timings"""
+        with self._lock:
+            self._files[status] = self._files.get(status, 0) + 1
+            for name, entry in stages.items():
+                self._stage_seconds[name] = self._stage_seconds.get(name, 0.0) + entry.get("seconds", 0.0)
+                self._stage_calls[name] = self._stage_calls.get(name, 0) + 1
+                for key, value in entry.items():
+                    if key != "seconds" and isinstance(value, (int, float)):
+                        self._counters[(name, key)] = self._counters.get((name, key), 0) + value
+
+    def drain(self) -> Dict:
+        """Return everything recorded so far and reset the registry
+
+        Worker processes send the result back with each chunk so the parent
+        process can merge() it into its own registry.
+        """
+        with self._lock:
+            snapshot = {"files": self._files, "stage_seconds": self._stage_seconds,
+                        "stage_calls": self._stage_calls, "counters": self._counters}
+            self._files, self._stage_seconds, self._stage_calls, self._counters = {}, {}, {}, {}
+        return snapshot
+
+    def merge(self, snapshot: Dict) -> None:
+        """Add the counts of a drain() snapshot taken in another process"""
+        with self._lock:
+            for name, target in (("files", self._files), ("stage_seconds", self._stage_seconds),
+                                 ("stage_calls", self._stage_calls), ("counters", self._counters)):
+                for key, value in snapshot.get(name, {}).items():
+                    target[key] = target.get(key, 0) + value
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        p = self.prefix
+        with self._lock:
+            lines = [f"# HELP {p}_files_total Files processed by status",
+                     f"# TYPE {p}_files_total counter"]
+            lines += [f'{p}_files_total{{status="{status}"}} {count}' for status, count in sorted(self._files.items())]
+            lines += [f"# HELP {p}_stage_seconds_total Time spent per pipeline stage",
+                      f"# TYPE {p}_stage_seconds_total counter"]
+            lines += [f'{p}_stage_seconds_total{{stage="{name}"}} {seconds:.6f}'
+                      for name, seconds in sorted(self._stage_seconds.items())]
+            lines += [f"# HELP {p}_stage_runs_total Files that went through each pipeline stage",
+                      f"# TYPE {p}_stage_runs_total counter"]
+            lines += [f'{p}_stage_runs_total{{stage="{name}"}} {count}' for name, count in sorted(self._stage_calls.items())]
+            lines += [f"# HELP {p}_stage_items_total Items (bytes, paragraphs, pages) handled per stage",
+                      f"# TYPE {p}_stage_items_total counter"]
+            lines += [f'{p}_stage_items_total{{stage="{stage}",unit="{unit}"}} {value}'
+                      for (stage, unit), value in sorted(self._counters.items())]
+        return "\n".join(lines) + "\n"
+
+# Registry shared by everything running in this process
+METRICS = MetricsRegistry()
@@ -0,0 +1,134 @@
+import csv
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PARQUET_COMPRESSIONS = ["snappy", "zstd", "gzip", "brotli", "lz4", "none"]
+
+def _batches(paragraphs: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Group a paragraph stream into lists of at most batch_size items"""
+    iterator = iter(paragraphs)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def _language(paragraph: str) -> Optional[str]:
+    """Language tag of a paragraph from the language filter, if any"""
+    return getattr(paragraph, "language", None)
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        logger.error("pyarrow package not available")
+        raise
+
+def write_txt(path: Path, paragraphs: Iterable[str], **options) -> int:
+    """Write one paragraph per line"""
+    count = 0
+    with path.open('w', encoding='utf-8') as f:
+        for p in paragraphs:
+            f.write(f"\n{p}" if count else p)
+            count += 1
+    return count
+
+def write_json(path: Path, paragraphs: Iterable[str], language_column: bool = False, **options) -> int:
+    """Write a JSON array of paragraphs (or of {"text", "language"} objects), one element at a time"""
+    count = 0
+    with path.open('w', encoding='utf-8') as f:
+        f.write("[")
+        for p in paragraphs:
+            f.write(",\n  " if count else "\n  ")
+            item = {"text": p, "language": _language(p)} if language_column else p
+            f.write(json.dumps(item, ensure_ascii=False))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+def write_jsonl(path: Path, paragraphs: Iterable[str], language_column: bool = False, **options) -> int:
+    """Write one {"text": ...} JSON object per line, plus "language" with language_column"""
+    count = 0
+    with path.open('w', encoding='utf-8') as f:
+        for p in paragraphs:
+            record = {"text": p, "language": _language(p)} if language_column else {"text": p}
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+def _write_delimited(path: Path, paragraphs: Iterable[str], delimiter: str, language_column: bool) -> int:
+    count = 0
+    with path.open('w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        for p in paragraphs:
+            writer.writerow([p, _language(p)] if language_column else [p])
+            count += 1
+    return count
+
+def write_csv(path: Path, paragraphs: Iterable[str], language_column: bool = False, **options) -> int:
+    """Write one CSV row per paragraph: text, plus language with language_column"""
+    return _write_delimited(path, paragraphs, ",", language_column)
+
+def write_tsv(path: Path, paragraphs: Iterable[str], language_column: bool = False, **options) -> int:
+    """Write one TSV row per paragraph: text, plus language with language_column"""
+    return _write_delimited(path, paragraphs, "\t", language_column)
+
+def _arrow_schema(pa, language_column: bool):
+    fields = [("text", pa.string()), ("paragraph_index", pa.int64())]
+    if language_column:
+        fields.append(("language", pa.string()))
+    return pa.schema(fields)
+
+def _arrow_columns(pa, batch: List[str], start: int, language_column: bool) -> List:
+    columns = [pa.array(batch, pa.string()), pa.array(range(start, start + len(batch)), pa.int64())]
+    if language_column:
+        columns.append(pa.array([_language(p) for p in batch], pa.string()))
+    return columns
+
+def write_parquet(path: Path, paragraphs: Iterable[str], row_group_size: int = 10000,
+                  compression: str = "zstd", language_column: bool = False, **options) -> int:
+    """Write paragraphs to Parquet, one row group per row_group_size paragraphs"""
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, language_column)
+    count = 0
+    with pq.ParquetWriter(str(path), schema, compression=None if compression == "none" else compression) as writer:
+        for batch in _batches(paragraphs, row_group_size):
+            writer.write_table(pa.Table.from_arrays(_arrow_columns(pa, batch, count, language_column), schema=schema))
+            count += len(batch)
+    return count
+
+def write_arrow(path: Path, paragraphs: Iterable[str], row_group_size: int = 10000,
+                language_column: bool = False, **options) -> int:
+    """Write paragraphs to an Arrow IPC file that readers can memory-map"""
+    pa = _import_pyarrow()
+
+    schema = _arrow_schema(pa, language_column)
+    count = 0
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in _batches(paragraphs, row_group_size):
+            writer.write_batch(pa.record_batch(_arrow_columns(pa, batch, count, language_column), schema=schema))
+            count += len(batch)
+    return count
+
+# Writers by output format; each streams paragraphs to path and returns the count written.
+# With language_column=True, structured formats add each paragraph's language tag.
+WRITERS: Dict[str, Callable[..., int]] = {
+    "txt": write_txt,
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "tsv": write_tsv,
+    "parquet": write_parquet,
+    "arrow": write_arrow,
+}
+
+OUTPUT_FORMATS = list(WRITERS)
@@ -0,0 +1,132 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction/cleaning changes in a way that invalidates cached outputs
+PIPELINE_VERSION = 6
+
+def hash_file(file_path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the BLAKE2b hex digest of a file's content, read in chunks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ProcessingCache:
+    """Content-addressed store of cleaned outputs and metadata
+
+    Entries live in cache_dir/<key[:2]>/<key>/ and are keyed by the input's
+    content hash plus the processing configuration, so renamed or touched
+    files still hit while any config change misses. Entry directories are
+    touched on every hit and the least recently used ones are evicted once
+    the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 2 << 30):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, content_hash: str, config: Dict) -> str:
+        """Combine a content hash and processing config into a cache key"""
+        payload = json.dumps({"content": content_hash, "config": config, "version": PIPELINE_VERSION},
+                             sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def restore(self, key: str, output_file: Path, meta_file: Path,
+                shard_path: Optional[Callable[[str], Path]] = None) -> Optional[Dict]:
+        """Copy a cached entry to output_file/meta_file; return its metadata or None on miss
+
+        Entries stored with shards are restored to shard_path(name) for each shard.
+        """
+        entry = self._entry_dir(key)
+        cached_meta = entry / "metadata.json"
+        cached_output = entry / "output"
+        cached_shards = entry / "shards"
+        has_shards = shard_path is not None and cached_shards.is_dir()
+        if not (cached_meta.exists() and (cached_output.exists() or has_shards)):
+            return None
+        try:
+            with open(cached_meta, encoding="utf-8") as f:
+                metadata = json.load(f)
+            meta_file.parent.mkdir(parents=True, exist_ok=True)
+            if cached_output.exists():
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(cached_output, output_file)
+            if has_shards:
+                for shard in os.scandir(cached_shards):
+                    target = shard_path(shard.name)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(shard.path, target)
+            shutil.copyfile(cached_meta, meta_file)
+            os.utime(entry)
+            return metadata
+        except Exception as e:
+            logger.warning(f"Cache restore failed for {key}: {str(e)}")
+            return None
+
+    def store(self, key: str, output_file: Optional[Path], meta_file: Path,
+              shards: Optional[Dict[str, Path]] = None) -> bool:
+        """Copy a freshly produced output (and/or named output shards) and metadata file into the cache"""
+        entry = self._entry_dir(key)
+        tmp_entry = None
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per call, so threads and processes storing the same key do not share it
+            tmp_entry = Path(tempfile.mkdtemp(prefix=f"{key}.tmp", dir=entry.parent))
+            if output_file is not None:
+                shutil.copyfile(output_file, tmp_entry / "output")
+            if shards:
+                (tmp_entry / "shards").mkdir()
+                for name, shard_file in shards.items():
+                    shutil.copyfile(shard_file, tmp_entry / "shards" / name)
+            shutil.copyfile(meta_file, tmp_entry / "metadata.json")
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            # Rename is atomic, so concurrent readers never see half-written entries
+            os.replace(tmp_entry, entry)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache store failed for {key}: {str(e)}")
+            if tmp_entry is not None:
+                shutil.rmtree(tmp_entry, ignore_errors=True)
+            return False
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if not entry.is_dir():
+                    continue
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                shards = os.path.join(entry.path, "shards")
+                if os.path.isdir(shards):
+                    size += sum(f.stat().st_size for f in os.scandir(shards))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+                total += size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} cache entries, {total} bytes remain")
+        return removed
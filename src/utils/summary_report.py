@@ -1,17 +1,39 @@
 import logging
 import json
 from pathlib import Path
+from typing import Dict, Optional
 
-def generate_summary_report(input_dir: Path, output_dir: Path, meta_dir: Path):
-    """Generate a report with summary statistics for processed files."""
-    report = {
-        "total_files": 0,
-        "processed_files": 0,
-        "failed_files": [],
-        "total_paragraphs": 0,
-        "total_characters": 0
-    }
-    for meta_file in meta_dir.glob("*_metadata.json"):
+from src.utils.file_discovery import relative_input_path
+from src.utils.job_manifest import DONE_STATUSES, JobManifest
+
+def _add_stages(report: Dict, stages: Dict) -> None:
+    """Sum per-stage durations and counters of one file into the report"""
+    for stage, entry in stages.items():
+        totals = report["stages"].setdefault(stage, {"files": 0})
+        totals["files"] += 1
+        for key, value in entry.items():
+            if isinstance(value, (int, float)):
+                totals[key] = totals.get(key, 0) + value
+
+def _summarize_manifest(report: Dict, manifest: JobManifest, input_dir: Path) -> None:
+    """Fill the report from the manifest rows of the current config (one query, no per-file reads)"""
+    report["status_counts"] = {}
+    for row in manifest.rows():
+        report["total_files"] += 1
+        report["status_counts"][row["status"]] = report["status_counts"].get(row["status"], 0) + 1
+        if row["status"] not in DONE_STATUSES:
+            report["failed_files"].append(str(relative_input_path(Path(row["path"]), input_dir)))
+            continue
+        report["processed_files"] += 1
+        report["total_paragraphs"] += row["paragraphs"] or 0
+        report["total_characters"] += row["characters"] or 0
+        report["ocr_pages"] += row["ocr_pages"] or 0
+        if row["stages"]:
+            _add_stages(report, json.loads(row["stages"]))
+
+def _summarize_metadata(report: Dict, meta_dir: Path) -> None:
+    """Fill the report by reading every metadata JSON file"""
+    for meta_file in meta_dir.rglob("*_metadata.json"):
         report["total_files"] += 1
         try:
             with open(meta_file, encoding="utf-8") as f:
@@ -19,9 +41,35 @@ def generate_summary_report(input_dir: Path, output_dir: Path, meta_dir: Path):
             report["processed_files"] += 1
             report["total_paragraphs"] += meta.get("paragraph_count", 0)
             report["total_characters"] += meta.get("character_count", 0)
+            report["ocr_pages"] += meta.get("ocr_pages", 0)
+            _add_stages(report, meta.get("stages", {}))
         except Exception as e:
             logging.warning(f"Summary read error: {meta_file.name} - {e}")
-            report["failed_files"].append(meta_file.name)
+            report["failed_files"].append(str(relative_input_path(meta_file, meta_dir)))
+
+def generate_summary_report(input_dir: Path, output_dir: Path, meta_dir: Path, manifest: Optional[JobManifest] = None):
+    """Generate a report with summary statistics for processed files.
+
+    With a job manifest the report is built from its per-file records for
+    the manifest's current config, and failed_files lists the input paths
+    (relative to input_dir) of files whose last run failed; otherwise every
+    metadata file in meta_dir is read.
+    """
+    report = {
+        "total_files": 0,
+        "processed_files": 0,
+        "failed_files": [],
+        "total_paragraphs": 0,
+        "total_characters": 0,
+        "ocr_pages": 0,
+        "stages": {}
+    }
+    if manifest is not None:
+        _summarize_manifest(report, manifest, input_dir)
+    else:
+        _summarize_metadata(report, meta_dir)
+    for totals in report["stages"].values():
+        totals["seconds"] = round(totals.get("seconds", 0.0), 6)
     report_path = output_dir / "summary_report.json"
     with open(report_path, "w", encoding="utf-8") as f:
         json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,140 @@
+import codecs
+import logging
+import threading
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes of a file sampled to detect its encoding
+SAMPLE_BYTES = 64 * 1024
+# Bytes decoded per read when streaming a text file
+READ_BYTES = 1 << 20
+
+# Longest first, so the UTF-32 LE BOM is not taken for UTF-16 LE
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"), (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+# Share of letters outside ASCII above which cp1252 is unlikely (Western text is mostly ASCII letters)
+_MAX_LATIN_NON_ASCII = 0.3
+
+# Errors replaced by the decoder currently running in each thread
+_decode_errors = threading.local()
+
+def _count_and_replace(error: UnicodeDecodeError) -> Tuple[str, int]:
+    """Like the "replace" error handler, but counts the replacements"""
+    _decode_errors.count += 1
+    return "\ufffd", error.end
+
+codecs.register_error("makeaidatasets.countreplace", _count_and_replace)
+
+def detect_bom(head: bytes) -> Optional[Tuple[str, int]]:
+    """Encoding and length of the byte order mark at the start of head, if any"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return None
+
+def _utf16_without_bom(sample: bytes) -> Optional[str]:
+    """utf-16-le/be if the sample looks like BOM-less UTF-16 text (NULs in every other byte)"""
+    if len(sample) < 4:
+        return None
+    even, odd = sample[0::2], sample[1::2]
+    even_nuls, odd_nuls = even.count(0) / len(even), odd.count(0) / len(odd)
+    if odd_nuls > 0.3 and even_nuls < 0.05:
+        return "utf-16-le"
+    if even_nuls > 0.3 and odd_nuls < 0.05:
+        return "utf-16-be"
+    return None
+
+def _looks_western(text: str) -> bool:
+    letters = [c for c in text if c.isalpha()]
+    return not letters or sum(1 for c in letters if ord(c) > 127) / len(letters) <= _MAX_LATIN_NON_ASCII
+
+def _statistical_guess(sample: bytes) -> Optional[str]:
+    """Best encoding according to charset_normalizer, if installed"""
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return None
+    best = from_bytes(sample).best()
+    return best.encoding if best is not None else None
+
+def detect_encoding(sample: bytes) -> str:
+    """Encoding of a text file from its first bytes (at most SAMPLE_BYTES are examined)
+
+    A byte order mark wins; otherwise UTF-16 without BOM is recognised by
+    its NUL bytes and valid UTF-8 is taken as UTF-8. Other input is treated
+    as Windows-1252 when that decodes to mostly ASCII letters (Western
+    European text), and otherwise handed to charset_normalizer's
+    statistical detection, if installed.
+    """
+    sample = sample[:SAMPLE_BYTES]
+    bom = detect_bom(sample)
+    if bom:
+        return bom[0]
+    utf16 = _utf16_without_bom(sample)
+    if utf16:
+        return utf16
+    try:
+        # Incremental, so a character cut off at the end of the sample is not an error
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        if _looks_western(sample.decode("cp1252")):
+            return "cp1252"
+    except UnicodeDecodeError:
+        pass
+    try:
+        guess = _statistical_guess(sample)
+    except Exception as e:
+        logger.warning(f"Charset detection failed: {str(e)}")
+        guess = None
+    if guess:
+        try:
+            return codecs.lookup(guess).name
+        except LookupError:
+            pass
+    return "cp1252"
+
+def iter_decoded_lines(f: BinaryIO, meta: Optional[Dict] = None, read_bytes: int = READ_BYTES) -> Iterator[str]:
+    """Yield the lines of a binary text stream, keeping line endings, in a single read pass
+
+    The encoding is detected from the first block read, which is then
+    decoded with the rest of the stream by an incremental decoder, so the
+    stream need not be seekable and memory is bounded by read_bytes. Lines
+    longer than that are yielded in pieces. A BOM is dropped and
+    undecodable bytes become U+FFFD. The encoding and the number of
+    replaced characters (decode errors only, not U+FFFD already present in
+    the text) are recorded in meta.
+    """
+    block = f.read(max(read_bytes, SAMPLE_BYTES))
+    encoding = detect_encoding(block)
+    bom = detect_bom(block)
+    if bom:
+        block = block[bom[1]:]
+    decoder = codecs.getincrementaldecoder(encoding)("makeaidatasets.countreplace")
+    replaced = 0
+    pending = ""
+    while True:
+        _decode_errors.count = 0
+        text = decoder.decode(block, final=not block)
+        replaced += _decode_errors.count
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if len(pending) >= read_bytes:
+            yield pending
+            pending = ""
+        if not block:
+            break
+        block = f.read(read_bytes)
+    if pending:
+        yield pending
+    if meta is not None:
+        meta["encoding"] = encoding
+        if replaced:
+            meta["undecodable_characters"] = replaced
@@ -1,7 +1,14 @@
-from flask import Flask, request, render_template_string, send_file, abort
+from flask import Flask, request, render_template_string, send_file, abort, jsonify, Response, url_for, stream_with_context
 from pathlib import Path
-from src.main import process_single_file, TextCleaner, download_language_model
+from src.main import process_single_file, ensure_directories, cleaned_output_path
+from src.utils.job_queue import JobQueue, TERMINAL_STATUSES
+from src.utils.cleaner_pool import CleanerPool
+from src.processors.text_normalizer import CLEAN_LEVELS
+from src.processors.language_detector import parse_languages
+from src.utils.metrics import METRICS
+from src.utils.output_writers import OUTPUT_FORMATS
 import os
+import json
 import logging
 import re
 import mimetypes
@@ -15,12 +22,163 @@ logger = logging.getLogger(__name__)
 # Configure necessary directories
 UPLOAD_FOLDER = Path("web_uploads")
 OUTPUT_FOLDER = Path("output/cleaned_texts")
+ensure_directories()
 UPLOAD_FOLDER.mkdir(exist_ok=True)
 OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
 
+# Application-scoped cleaners, shared across requests and pre-warmed at startup
+cleaner_pool = CleanerPool()
+if os.getenv("WEB_WARM_UP", "1") == "1":
+    cleaner_pool.warm_up([{"clean_level": "basic", "languages": ("en",)}])
+
+# Background processing for the /jobs API
+job_queue = JobQueue(
+    max_workers=int(os.getenv("WEB_MAX_JOBS", 2)),
+    max_pending=int(os.getenv("WEB_MAX_PENDING", 32))
+)
+
+def _cleaner_options(form) -> dict:
+    """Cleaner settings from the upload form; raises ValueError on unknown values"""
+    clean_level = form.get("clean_level", "basic")
+    if clean_level not in CLEAN_LEVELS:
+        raise ValueError(f"Unknown clean level: {clean_level}")
+    return {"clean_level": clean_level, "languages": parse_languages(form.get("lang", "en"))}
+
+def _output_format(form) -> str:
+    """Output format from the upload form; raises ValueError on unknown values"""
+    output_format = form.get("output_format", "txt")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return output_format
+
+def _mimetype(path: Path) -> str:
+    """Download MIME type of a cleaned output; binary formats are not served as text"""
+    mime_type, _ = mimetypes.guess_type(str(path))
+    if mime_type:
+        return mime_type
+    return "application/octet-stream" if path.suffix in (".parquet", ".arrow") else "text/plain"
+
+def _run_upload_job(file_path: Path, cleaner_options: dict, output_format: str, report) -> str:
+    """Process an uploaded file in the background and return the cleaned file path"""
+    try:
+        cleaner = cleaner_pool.get(**cleaner_options)
+        if not process_single_file(file_path, cleaner, output_format=output_format, progress=report):
+            raise RuntimeError("Processing failed")
+        cleaned_path = cleaned_output_path(file_path, output_format)
+        if not cleaned_path.exists():
+            raise RuntimeError("Cleaned output not found")
+        logger.info(f"File processed successfully: {cleaned_path}")
+        return str(cleaned_path)
+    finally:
+        try:
+            if file_path.exists():
+                file_path.unlink()
+                logger.info(f"Temporary file cleaned up: {file_path}")
+        except Exception as e:
+            logger.warning(f"Failed to clean up temporary file: {e}")
+
+def _job_status(job: dict) -> dict:
+    """Public view of a job record"""
+    return {
+        "job_id": job["id"],
+        "filename": job["filename"],
+        "status": job["status"],
+        "clean_level": job.get("clean_level"),
+        "languages": job.get("languages"),
+        "output_format": job.get("output_format"),
+        "progress": job["progress"],
+        "error": job["error"],
+        "created": job["created"],
+        "started": job["started"],
+        "finished": job["finished"],
+        "result_url": url_for("job_result", job_id=job["id"]) if job["status"] == "finished" else None
+    }
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus scrape endpoint with per-stage processing metrics"""
+    return Response(METRICS.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Accept an upload and process it asynchronously; returns 202 with the job id"""
+    file = request.files.get("file")
+    if not file or not file.filename:
+        logger.error("No file provided in the job request.")
+        return jsonify(error="No file provided"), 400
+
+    filename = Path(file.filename).name
+    # Prefix with a random token so concurrent uploads of the same name don't collide
+    file_path = UPLOAD_FOLDER / f"{os.urandom(6).hex()}_{filename}"
+    try:
+        file.save(str(file_path))
+    except Exception as e:
+        logger.error(f"Failed to save uploaded file: {e}")
+        return jsonify(error="File upload failed"), 500
+
+    try:
+        cleaner_options = _cleaner_options(request.form)
+        output_format = _output_format(request.form)
+    except ValueError as e:
+        file_path.unlink()
+        return jsonify(error=str(e)), 400
+
+    job_id = job_queue.submit(lambda report: _run_upload_job(file_path, cleaner_options, output_format, report),
+                              filename=filename, clean_level=cleaner_options["clean_level"],
+                              languages=list(cleaner_options["languages"]) or ["auto"],
+                              output_format=output_format)
+    if job_id is None:
+        file_path.unlink()
+        return jsonify(error="Too many jobs in progress, retry later"), 503
+
+    logger.info(f"Queued job {job_id} for {filename}")
+    return jsonify(job_id=job_id, status_url=url_for("job_status", job_id=job_id),
+                   events_url=url_for("job_events", job_id=job_id)), 202
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(_job_status(job))
+
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """Stream job status changes as server-sent events until the job completes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404)
+
+    def stream(job):
+        while job is not None:
+            yield f"data: {json.dumps(_job_status(job))}\n\n"
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            job = job_queue.wait_for_change(job_id, job)
+
+    return Response(stream_with_context(stream(job)), mimetype="text/event-stream")
+
+@app.route("/jobs/<job_id>/result", methods=["GET"])
+def job_result(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        abort(404)
+    if job["status"] == "failed":
+        return jsonify(error=job["error"]), 500
+    if job["status"] != "finished":
+        return jsonify(_job_status(job)), 409
+    cleaned_path = Path(job["result"])
+    if not cleaned_path.exists():
+        abort(410)
+    return send_file(cleaned_path.resolve(),
+                     mimetype=_mimetype(cleaned_path),
+                     as_attachment=True,
+                     download_name=cleaned_output_path(Path(job["filename"]), job["output_format"]).name)
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
+        file_path = None
         try:
             if 'file' not in request.files:
                 logger.error("No file provided in the request.")
@@ -31,6 +189,14 @@ def index():
                 logger.error("No file selected for upload.")
                 return "No file selected", 400
 
+            # Validate options before saving, so a rejected request leaves no upload behind
+            try:
+                cleaner_options = _cleaner_options(request.form)
+                output_format = _output_format(request.form)
+            except ValueError as e:
+                logger.error(str(e))
+                return str(e), 400
+
             # Sanitize filename
             filename = Path(file.filename).name
             file_path = UPLOAD_FOLDER / filename
@@ -46,20 +212,18 @@ def index():
                 return "File upload failed", 500
 
             try:
-                lang_model = download_language_model()
-                cleaner = TextCleaner(lang_model=lang_model) if lang_model else TextCleaner()
+                cleaner = cleaner_pool.get(**cleaner_options)
             except Exception as e:
                 logger.exception(f"Failed to initialize text cleaner: {e}")
                 return "Text cleaner initialization failed", 500
 
             try:
-                if process_single_file(file_path, cleaner):
-                    cleaned_path = OUTPUT_FOLDER / f"{file_path.stem}_cleaned.txt"
+                if process_single_file(file_path, cleaner, output_format=output_format):
+                    cleaned_path = cleaned_output_path(file_path, output_format)
                     if cleaned_path.exists():
                         logger.info(f"File processed successfully: {cleaned_path}")
-                        mime_type, _ = mimetypes.guess_type(str(cleaned_path))
-                        return send_file(cleaned_path, 
-                                      mimetype=mime_type or 'text/plain',
+                        return send_file(cleaned_path.resolve(),
+                                      mimetype=_mimetype(cleaned_path),
                                       as_attachment=True,
                                       download_name=cleaned_path.name)
             except Exception as e:
@@ -76,7 +240,7 @@ def index():
         finally:
             # Clean up uploaded file
             try:
-                if 'file_path' in locals() and file_path.exists():
+                if file_path is not None and file_path.exists():
                     file_path.unlink()
                     logger.info(f"Temporary file cleaned up: {file_path}")
             except Exception as e:
@@ -266,7 +430,7 @@ def index():
         </head>
         <body>
         <div class="glass">            <h1>MakeAIDatasets Web</h1>
-            <form id="uploadForm" method="post" enctype="multipart/form-data">
+            <form id="uploadForm" method="post" action="/jobs" enctype="multipart/form-data">
                 <div class="drop-zone" id="dropZone">
                     <div class="drop-zone-content">
                         <svg width="50" height="50" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
@@ -287,10 +451,8 @@ def index():
                             <option value="csv">CSV</option>
                             <option value="jsonl">JSONL</option>
                             <option value="parquet">Parquet</option>
-                            <option value="tfrecord">TFRecord</option>
                             <option value="arrow">Arrow</option>
                             <option value="tsv">TSV</option>
-                            <option value="yaml">YAML</option>
                         </select>
                     </div>                    <div class="option-group">
                         <label>Language:</label>
@@ -440,9 +602,20 @@ def index():
                 formData.append('output_format', document.getElementById('outputFormat').value);
                 formData.append('lang', document.getElementById('langSelect').value);
                 formData.append('clean_level', document.getElementById('cleanLevel').value);
+                const finish = function(ok) {
+                    completed++;
+                    if (!ok) {
+                        alert('Processing failed for ' + file.name);
+                    }
+                    if (completed === arr.length) {
+                        progressBar.style.width = '0%';
+                        progressContainer.style.display = 'none';
+                    }
+                };
+                // Upload to the asynchronous jobs API, then follow the job over server-sent events
                 const xhr = new XMLHttpRequest();
-                xhr.open('POST', '/');
-                xhr.responseType = 'blob';
+                xhr.open('POST', '/jobs');
+                xhr.responseType = 'json';
                 xhr.upload.onprogress = function(e) {
                     if (e.lengthComputable) {
                         const percent = ((completed + e.loaded / e.total) / arr.length) * 100;
@@ -450,21 +623,40 @@ def index():
                     }
                 };
                 xhr.onload = function() {
-                    completed++;
-                    if (xhr.status === 200) {
-                        const blob = xhr.response;
-                        const a = document.createElement('a');
-                        a.href = window.URL.createObjectURL(blob);
-                        a.download = file.name.replace(/\.[^.]+$/, '_cleaned.txt');
-                        a.click();
-                    } else {
-                        alert('Processing failed for ' + file.name);
-                    }
-                    if (completed === arr.length) {
-                        progressBar.style.width = '0%';
-                        progressContainer.style.display = 'none';
+                    if (xhr.status !== 202) {
+                        finish(false);
+                        return;
                     }
+                    const events = new EventSource(xhr.response.events_url);
+                    events.onmessage = function(e) {
+                        const job = JSON.parse(e.data);
+                        if (job.status === 'finished') {
+                            events.close();
+                            fetch(job.result_url).then(function(response) {
+                                if (!response.ok) {
+                                    throw new Error(response.statusText);
+                                }
+                                const disposition = response.headers.get('Content-Disposition') || '';
+                                const match = disposition.match(/filename="?([^";]+)"?/);
+                                return response.blob().then(function(blob) {
+                                    const a = document.createElement('a');
+                                    a.href = window.URL.createObjectURL(blob);
+                                    a.download = match ? match[1] : file.name.replace(/\.[^.]+$/, '_cleaned.txt');
+                                    a.click();
+                                    finish(true);
+                                });
+                            }).catch(function() { finish(false); });
+                        } else if (job.status === 'failed') {
+                            events.close();
+                            finish(false);
+                        }
+                    };
+                    events.onerror = function() {
+                        events.close();
+                        finish(false);
+                    };
                 };
+                xhr.onerror = function() { finish(false); };
                 xhr.send(formData);
             });
         });
@@ -516,12 +708,6 @@ def output_formats():
                 <p>🔧 Use Case: Big data, ML pipelines</p>
                 <pre>import pandas as pd\ndf = pd.read_parquet("data.parquet")</pre>
             </div>
-            <div class="format">
-                <h2>📦 TFRecord</h2>
-                <p>✅ Best for: TensorFlow datasets (image/text/audio)</p>
-                <p>🔧 Use Case: Deep learning (vision, NLP, etc.)</p>
-                <pre># Save TFRecord\nwith tf.io.TFRecordWriter('data.tfrecord') as writer:\n    example = tf.train.Example(...)\n    writer.write(example.SerializeToString())</pre>
-            </div>
             <div class="format">
                 <h2>⚡ Arrow (Apache Arrow)</h2>
                 <p>✅ Best for: Hugging Face datasets, in-memory optimized</p>
@@ -535,13 +721,6 @@ def output_formats():
                 <pre>text\tlabel\n"How are you?"\tgreeting\n"Go away"\tcommand</pre>
                 <pre>import pandas as pd\ndf = pd.read_csv("data.tsv", sep="\t")</pre>
             </div>
-            <div class="format">
-                <h2>🧬 YAML (YAML Ain’t Markup Language)</h2>
-                <p>✅ Best for: Human-readable prompt templates or settings</p>
-                <p>🔧 Use Case: Few-shot examples, prompt engineering</p>
-                <pre>- prompt: "Define AI"\n  completion: "Artificial Intelligence is the simulation of human intelligence in machines."</pre>
-                <pre>import yaml\nwith open("data.yaml") as f:\n    data = yaml.safe_load(f)</pre>
-            </div>
         </body>
         </html>
     ''')
@@ -0,0 +1,25 @@
+import bz2
+import gzip
+import zipfile
+from src.processors.archive_processor import iter_archive
+
+def test_iter_compressed(tmp_path):
+    gz = tmp_path / 'book.txt.gz'
+    gz.write_bytes(gzip.compress(b'first line\nsecond line\n'))
+    meta = {}
+    assert list(iter_archive(gz, meta)) == ['first line\n', 'second line\n']
+    assert meta == {'archive_format': 'gzip', 'archive_members': [{'name': 'book.txt', 'format': 'txt'}]}
+    page = tmp_path / 'page.bz2'
+    page.write_bytes(bz2.compress(b'<html><body><p>Hello there</p><script>x()</script></body></html>'))
+    assert list(iter_archive(page)) == ['Hello there']
+
+def test_iter_zip_archive(tmp_path):
+    path = tmp_path / 'corpus.zip'
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('b/page.htm', '<p>Second document</p>')
+        archive.writestr('a.txt', 'First document\n')
+        archive.writestr('nested.gz', gzip.compress(b'skipped'))
+        archive.writestr('__MACOSX/._a.txt', 'resource fork')
+    meta = {}
+    assert list(iter_archive(path, meta)) == ['First document\n', 'Second document']
+    assert [member['format'] for member in meta['archive_members']] == ['txt', 'html']
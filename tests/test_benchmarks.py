@@ -0,0 +1,23 @@
+import pytest
+from benchmarks.corpus import generate_corpus
+from benchmarks.run_benchmarks import run_benchmark, compare_to_baseline
+from src.main import EXTRACTORS
+
+def test_generate_corpus_is_extractable(tmp_path):
+    corpus = generate_corpus(tmp_path, docs_per_format=1, paragraphs_per_doc=20)
+    for fmt, files in corpus.items():
+        extractor = EXTRACTORS[fmt]
+        text = "".join(extractor(files[0], {}))
+        assert len(text) > 100, fmt
+
+def test_run_benchmark(tmp_path):
+    corpus = generate_corpus(tmp_path, docs_per_format=1, paragraphs_per_doc=20, formats=['txt'])
+    result = run_benchmark('clean_text', corpus)
+    assert 'error' not in result
+    assert result['paragraphs'] > 0
+    assert result['peak_rss_mb'] > 0
+
+def test_compare_to_baseline():
+    baseline = {'results': {'clean_text': {'paragraphs_per_s': 100.0, 'mb_per_s': 10.0}}}
+    assert compare_to_baseline({'clean_text': {'paragraphs_per_s': 90.0, 'mb_per_s': 9.0}}, baseline, 0.2) == []
+    assert len(compare_to_baseline({'clean_text': {'paragraphs_per_s': 50.0, 'mb_per_s': 9.0}}, baseline, 0.2)) == 1
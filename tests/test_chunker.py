@@ -0,0 +1,45 @@
+import pytest
+from src.processors.chunker import get_token_counter, iter_token_chunks, split_sentences
+
+def test_split_sentences():
+    text = 'First one. Second, e.g. this one? "Third!" Fourth'
+    assert split_sentences(text) == ['First one.', 'Second, e.g. this one?', '"Third!"', 'Fourth']
+
+def test_iter_token_chunks_packs_paragraphs():
+    paragraphs = ['One two three.', 'Four five six.', 'Seven eight nine.']
+    chunks = list(iter_token_chunks(paragraphs, max_tokens=8))
+    assert [c.text for c in chunks] == ['One two three.\nFour five six.', 'Seven eight nine.']
+    assert [(c.tokens, c.first_paragraph, c.last_paragraph) for c in chunks] == [(8, 0, 1), (4, 2, 2)]
+
+def test_iter_token_chunks_overlap_and_long_sentences():
+    paragraphs = ['Alpha beta. Gamma delta. Epsilon zeta.', ' '.join(['word'] * 25)]
+    chunks = list(iter_token_chunks(iter(paragraphs), max_tokens=10, overlap_tokens=3))
+    assert chunks[0].text == 'Alpha beta. Gamma delta. Epsilon zeta.'
+    # The last sentence of a chunk is repeated at the start of the next
+    assert chunks[1].text.startswith('Epsilon zeta.\nword')
+    assert all(c.tokens <= 10 for c in chunks)
+    words = sum(c.text.split().count('word') for c in chunks)
+    assert words >= 25
+
+def test_iter_token_chunks_splits_words_over_budget():
+    count = get_token_counter('bytes')
+    word = 'x' * 50
+    chunks = list(iter_token_chunks([f'Short start {word} end.'], max_tokens=16, count=count))
+    assert all(c.tokens <= 16 and count(c.text) <= 16 for c in chunks)
+    # Pieces of the word are joined back without spaces
+    assert ''.join(c.text for c in chunks).replace(' ', '') == f'Shortstart{word}end.'
+
+    url = 'https://example.org/' + '/'.join(['path'] * 20)
+    chunks = list(iter_token_chunks([url], max_tokens=10, overlap_tokens=2))
+    assert all(c.tokens <= 10 for c in chunks)
+
+def test_iter_token_chunks_rejects_bad_budget():
+    with pytest.raises(ValueError):
+        list(iter_token_chunks(['text'], max_tokens=4, overlap_tokens=4))
+
+def test_get_token_counter_falls_back_offline():
+    assert get_token_counter('bytes')('héllo') == 6
+    # An unavailable tokenizer degrades to the whitespace counter
+    assert get_token_counter('hf:')('Hello, world') == 3
+    with pytest.raises(ValueError):
+        get_token_counter('nonexistent')
@@ -0,0 +1,10 @@
+import pytest
+from src.utils.cleaner_pool import CleanerPool
+
+def test_cleaner_pool_reuses_cleaners():
+    pool = CleanerPool()
+    pool.warm_up()
+    assert len(pool) == 1
+    assert pool.get() is pool.get()
+    assert pool.get(batch_size=8) is not pool.get()
+    assert len(pool) == 2
@@ -0,0 +1,36 @@
+import pickle
+import pytest
+from src.processors.deduplicator import Deduplicator
+
+PARAGRAPHS = [
+    'The quick brown fox jumps over the lazy dog near the river bank today.',
+    'The quick brown fox jumps over the lazy dog near the river bank today!',
+    'the  quick brown fox jumps over the lazy dog near the river bank, today',
+    'Completely different sentence about machine learning models and data sets.',
+]
+
+def test_document_dedup():
+    doc = Deduplicator().document('a.txt')
+    assert list(doc.iter_unique(PARAGRAPHS)) == [PARAGRAPHS[0], PARAGRAPHS[3]]
+    assert doc.duplicates == 2
+
+def test_near_duplicate_detected():
+    doc = Deduplicator().document('a.txt')
+    base = 'Copyright 2023 Example Press. All rights reserved. No part of this publication may be reproduced.'
+    assert not doc.is_duplicate(base)
+    assert doc.is_duplicate(base.replace('2023', '2024'))
+
+def test_corpus_index(tmp_path):
+    index = tmp_path / 'dedup.sqlite'
+    dedup = Deduplicator(index_path=index)
+    assert list(dedup.document('a.txt').iter_unique(PARAGRAPHS[:1])) == PARAGRAPHS[:1]
+    # Re-processing the same document keeps its own paragraphs
+    assert list(dedup.document('a.txt').iter_unique(PARAGRAPHS[:1])) == PARAGRAPHS[:1]
+    dedup.close()
+
+    # The index persists across runs and survives pickling to worker processes
+    resumed = pickle.loads(pickle.dumps(Deduplicator(index_path=index)))
+    doc = resumed.document('b.txt')
+    assert list(doc.iter_unique(PARAGRAPHS)) == [PARAGRAPHS[3]]
+    assert doc.corpus_duplicates == 1
+    resumed.close()
@@ -6,3 +6,42 @@ def test_process_docx():
     test_file = Path('input/test.docx')
     text = process_docx(test_file)
     assert isinstance(text, str)
+
+def test_iter_docx_streams_tables_in_document_order(tmp_path):
+    from docx import Document
+    from src.processors.docx_processor import iter_docx
+
+    doc = Document()
+    doc.add_paragraph("Before")
+    table = doc.add_table(rows=2, cols=2)
+    for i, row in enumerate(table.rows):
+        for j, cell in enumerate(row.cells):
+            cell.text = f"cell {i}{j}"
+    para = doc.add_paragraph("Left")
+    para.add_run().add_tab()
+    para.add_run("Right")
+    doc.add_paragraph("   ")
+    doc.add_paragraph("After")
+    path = tmp_path / "report.docx"
+    doc.save(path)
+    meta = {}
+    assert list(iter_docx(path, meta)) == ["Before", "cell 00", "cell 01", "cell 10", "cell 11", "Left\tRight", "After"]
+    assert "docx_parser" not in meta
+
+def test_iter_docx_falls_back_to_python_docx(tmp_path, monkeypatch):
+    from docx import Document
+    from src.processors import docx_processor
+
+    doc = Document()
+    doc.add_paragraph("Only paragraph")
+    path = tmp_path / "report.docx"
+    doc.save(path)
+
+    def broken(part):
+        raise ValueError("bad xml")
+        yield
+
+    monkeypatch.setattr(docx_processor, "iter_part_paragraphs", broken)
+    meta = {}
+    assert list(docx_processor.iter_docx(path, meta)) == ["Only paragraph"]
+    assert meta["docx_parser"] == "python-docx"
@@ -6,3 +6,58 @@ def test_process_epub():
     test_file = Path('input/test.epub')
     text = process_epub(test_file)
     assert isinstance(text, str)
+
+def _write_epub(path, chapters, spine_order):
+    from ebooklib import epub
+
+    book = epub.EpubBook()
+    book.set_identifier("spine-test")
+    book.set_title("Spine Test")
+    book.add_author("A. Writer")
+    items = []
+    for i, (title, body) in enumerate(chapters):
+        item = epub.EpubHtml(title=title, file_name=f"chap_{i}.xhtml", lang="en")
+        item.content = f"<h1>{title}</h1><p>{body}</p>"
+        book.add_item(item)
+        items.append(item)
+    book.toc = items
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    book.spine = ["nav"] + [items[i] for i in spine_order]
+    epub.write_epub(str(path), book)
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_iter_epub_follows_spine_and_records_chapters(tmp_path, monkeypatch, workers):
+    from src.processors.epub_processor import iter_epub
+
+    monkeypatch.setenv("EPUB_WORKERS", workers)
+    path = tmp_path / "book.epub"
+    _write_epub(path, [("Epilogue", "The end."), ("Opening", "It begins."), ("Middle", "It goes on.")], [1, 2, 0])
+    meta = {}
+    chunks = list(iter_epub(path, meta))
+    assert [c.splitlines()[0] for c in chunks] == ["Opening", "Middle", "Epilogue"]
+    assert meta["title"] == "Spine Test"
+    assert meta["author"] == "A. Writer"
+    assert [ch["title"] for ch in meta["chapters"]] == ["Opening", "Middle", "Epilogue"]
+    assert [ch["path"] for ch in meta["chapters"]] == ["EPUB/chap_1.xhtml", "EPUB/chap_2.xhtml", "EPUB/chap_0.xhtml"]
+
+def test_chapter_positions_match_cleaned_output(tmp_path, monkeypatch):
+    import json
+    from src.main import process_single_file
+    from src.processors.text_cleaner import TextCleaner
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input").mkdir()
+    bodies = [
+        "The first chapter explains how the samples were collected from the field.</p><p>They were stored at a constant temperature for the whole study.",
+        "The second chapter describes the statistical methods that were used in the analysis.",
+        "The third chapter discusses what the results mean for future research in this area.</p><p>It also lists the open questions that remain.",
+    ]
+    _write_epub(tmp_path / "input" / "book.epub", [(f"Chapter {i + 1}", body) for i, body in enumerate(bodies)], [0, 1, 2])
+    assert process_single_file(Path("input/book.epub"), TextCleaner())
+
+    lines = (tmp_path / "output" / "cleaned_texts" / "book_cleaned.txt").read_text(encoding="utf-8").splitlines()
+    chapters = json.loads((tmp_path / "output" / "metadata" / "book_metadata.json").read_text(encoding="utf-8"))["chapters"]
+    assert [(ch["first_paragraph"], ch["last_paragraph"]) for ch in chapters] == [(0, 1), (2, 2), (3, 4)]
+    for chapter, body in zip(chapters, bodies):
+        assert lines[chapter["first_paragraph"]:chapter["last_paragraph"] + 1] == body.split("</p><p>")
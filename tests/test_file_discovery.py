@@ -0,0 +1,35 @@
+import pytest
+from src.utils.file_discovery import iter_input_files, parse_shard, relative_input_path, selected
+
+def _tree(root):
+    for name in ['b.txt', 'a/book.pdf', 'a/notes.txt', 'b/book.pdf', 'drafts/x.pdf', 'a/z/deep.epub']:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+
+def test_iter_input_files(tmp_path):
+    _tree(tmp_path)
+    found = lambda **kw: [str(relative_input_path(f, tmp_path)) for f in iter_input_files(tmp_path, **kw)]
+    assert found() == ['b.txt', 'a/book.pdf', 'a/notes.txt', 'a/z/deep.epub', 'b/book.pdf', 'drafts/x.pdf']
+    assert found(include=['*.pdf'], exclude=['drafts']) == ['a/book.pdf', 'b/book.pdf']
+    assert found(exclude=['a/*']) == ['b.txt', 'b/book.pdf', 'drafts/x.pdf']
+    assert selected('drafts/x.pdf', exclude=['drafts']) is False
+    assert selected('a/book.pdf', include=['*.pdf']) is True
+
+def test_iter_input_files_skips_directory_symlinks(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / 'a' / 'loop').symlink_to('..', target_is_directory=True)
+    (tmp_path / 'a' / 'link.txt').symlink_to(tmp_path / 'b.txt')
+    found = [str(relative_input_path(f, tmp_path)) for f in iter_input_files(tmp_path)]
+    assert found == ['b.txt', 'a/book.pdf', 'a/link.txt', 'a/notes.txt', 'a/z/deep.epub', 'b/book.pdf', 'drafts/x.pdf']
+
+def test_shards_partition_tree(tmp_path):
+    _tree(tmp_path)
+    everything = list(iter_input_files(tmp_path))
+    shards = [list(iter_input_files(tmp_path, shard=(i, 3))) for i in range(3)]
+    assert sorted(f for shard in shards for f in shard) == sorted(everything)
+    assert parse_shard('2/3') == (2, 3)
+    assert parse_shard(None) is None
+    for spec in ['3/3', '1', 'a/b', '0/0']:
+        with pytest.raises(ValueError):
+            parse_shard(spec)
@@ -0,0 +1,32 @@
+import gzip
+import zipfile
+import pytest
+from src.utils.filetype_detector import detect_file_type
+
+@pytest.mark.parametrize('name, content, expected', [
+    ('report', b'%PDF-1.4\n%binary', 'pdf'),
+    ('scan.txt', b'%PDF-1.7\n', 'pdf'),
+    ('page', b'  <!DOCTYPE html><html><body>Hi</body></html>', 'html'),
+    ('page.html', b'plain words in an html file', 'html'),
+    ('notes', 'caf\xe9 au lait\n'.encode('latin-1'), 'txt'),
+    ('utf16.txt', '\ufeffHello world'.encode('utf-16-le'), 'txt'),
+    ('image.txt', bytes(range(256)) * 4, 'unknown'),
+    ('book.txt.gz', gzip.compress(b'text'), 'gzip'),
+    ('empty.txt', b'', 'txt'),
+])
+def test_sniffs_content(tmp_path, name, content, expected):
+    path = tmp_path / name
+    path.write_bytes(content)
+    assert detect_file_type(path) == expected
+
+def test_inspects_zip_containers(tmp_path):
+    for name, entries, expected in [
+        ('book', {'mimetype': 'application/epub+zip', 'META-INF/container.xml': '<container/>'}, 'epub'),
+        ('letter.zip', {'[Content_Types].xml': '<Types/>', 'word/document.xml': '<document/>'}, 'docx'),
+        ('corpus.docx', {'a.txt': 'first', 'b.txt': 'second'}, 'zip'),
+    ]:
+        path = tmp_path / name
+        with zipfile.ZipFile(path, 'w') as archive:
+            for entry, data in entries.items():
+                archive.writestr(entry, data)
+        assert detect_file_type(path) == expected
@@ -0,0 +1,56 @@
+import os
+import time
+import threading
+from src.utils.folder_watcher import FolderWatcher
+
+def test_ready_after_debounce(tmp_path):
+    watcher = FolderWatcher(tmp_path, debounce=0.2, use_watchdog=False)
+    book = tmp_path / 'book.txt'
+    book.write_text('first half')
+    (tmp_path / 'upload.part').write_text('partial download')
+    (tmp_path / '.hidden').write_text('editor state')
+    assert watcher.poll() == []
+    time.sleep(0.1)
+    # Still being written: the debounce starts over
+    with book.open('a') as f:
+        f.write(' and second half')
+    assert watcher.poll() == []
+    time.sleep(0.25)
+    assert watcher.poll() == [book]
+    # Each version is reported once
+    assert watcher.poll() == []
+
+def test_modified_file_reported_again(tmp_path):
+    watcher = FolderWatcher(tmp_path, debounce=0, use_watchdog=False)
+    book = tmp_path / 'book.txt'
+    book.write_text('version one')
+    assert watcher.poll() == [book]
+    book.write_text('version two, longer')
+    os.utime(book, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert watcher.poll() == [book]
+    book.unlink()
+    assert watcher.poll() == []
+
+def test_watch_input_processes_new_files(tmp_path, monkeypatch):
+    from src.main import watch_input
+    from src.processors.text_cleaner import TextCleaner
+    from src.utils.job_manifest import JobManifest
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    manifest = JobManifest(tmp_path / 'manifest.sqlite')
+    stop = threading.Event()
+    result = []
+    thread = threading.Thread(target=lambda: result.append(
+        watch_input(TextCleaner(), manifest=manifest, debounce=0.1, poll_interval=0.05, stop_event=stop)))
+    thread.start()
+    try:
+        (tmp_path / 'input' / 'book.txt').write_text('The results of the experiment were consistent with the theory.\n')
+        output = tmp_path / 'output' / 'cleaned_texts' / 'book_cleaned.txt'
+        deadline = time.monotonic() + 30
+        while not output.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+    assert result == [1]
+    assert [row['status'] for row in manifest.rows()] == ['success']
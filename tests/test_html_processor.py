@@ -6,3 +6,27 @@ def test_process_html():
     test_file = Path('input/test.html')
     text = process_html(test_file)
     assert isinstance(text, str)
+
+def test_iter_html_paragraphs(tmp_path):
+    from src.processors.html_processor import iter_html
+    test_file = tmp_path / 'page.html'
+    test_file.write_bytes(b'<html><head><meta charset="windows-1252"><title>Caf\xe9</title><style>p {}</style></head>'
+                          b'<body><nav>Home</nav><div>First <b>bold</b>\n words<p>Second</div>'
+                          b'<script>var p = "<p>no</p>";</script><pre>one\ntwo</pre></body></html>')
+    assert ''.join(iter_html(test_file)).split('\n') == ['Caf\xe9', 'First bold words', 'Second', 'one', 'two']
+
+def test_html_to_text_falls_back(monkeypatch):
+    from src.processors import html_text
+    def broken(markup):
+        raise ValueError('parser failure')
+        yield
+    monkeypatch.setattr(html_text, 'iter_html_text', broken)
+    assert html_text.html_to_text(b'<p>Still <b>read</b></p>') == 'Still\nread'
+
+def test_process_html_keeps_paragraphs_apart_across_feeds(tmp_path):
+    from src.processors.html_text import FEED_BYTES
+    paragraphs = [f'Paragraph number {i} here' for i in range(5000)]
+    test_file = tmp_path / 'large.html'
+    test_file.write_text('<html><body>' + ''.join(f'<p>{p}</p>' for p in paragraphs) + '</body></html>', encoding='utf-8')
+    assert test_file.stat().st_size > 2 * FEED_BYTES
+    assert process_html(test_file).split('\n') == paragraphs
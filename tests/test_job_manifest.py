@@ -0,0 +1,61 @@
+import pytest
+from src.utils.job_manifest import JobManifest
+from src.utils.summary_report import generate_summary_report
+
+def test_manifest_resume(tmp_path):
+    done = tmp_path / 'done.txt'
+    crashed = tmp_path / 'crashed.txt'
+    done.write_text('finished')
+    crashed.write_text('interrupted')
+
+    manifest = JobManifest(tmp_path / 'manifest.sqlite', config={'output_format': 'txt'})
+    assert manifest.pending([done, crashed]) == [done, crashed]
+    manifest.start(done)
+    manifest.finish(done, 'success', 0.5, {'clean': {'seconds': 0.1}}, {'paragraph_count': 3, 'character_count': 30})
+    manifest.start(crashed)
+
+    # A fresh manifest on the same file sees what the previous run finished
+    reopened = JobManifest(tmp_path / 'manifest.sqlite', config={'output_format': 'txt'})
+    assert reopened.pending([done, crashed]) == [crashed]
+    assert JobManifest(tmp_path / 'manifest.sqlite', config={'output_format': 'json'}).pending([done]) == [done]
+    done.write_text('changed content')
+    assert reopened.pending([done]) == [done]
+
+    report = generate_summary_report(tmp_path, tmp_path, tmp_path, manifest=reopened)
+    assert report['processed_files'] == 1
+    assert report['total_paragraphs'] == 3
+    assert report['failed_files'] == ['crashed.txt']
+    assert report['stages']['clean'] == {'files': 1, 'seconds': 0.1}
+
+def test_summary_report_uses_relative_paths_of_current_config(tmp_path):
+    for name in ('a/book.txt', 'b/book.txt', 'old.txt'):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(name)
+
+    previous = JobManifest(tmp_path / 'manifest.sqlite', config={'output_format': 'json'})
+    previous.start(tmp_path / 'old.txt')
+    previous.finish(tmp_path / 'old.txt', 'failed', 0.1, error='boom')
+
+    manifest = JobManifest(tmp_path / 'manifest.sqlite', config={'output_format': 'txt'})
+    for name, status in (('a/book.txt', 'failed'), ('b/book.txt', 'success')):
+        manifest.start(tmp_path / name)
+        manifest.finish(tmp_path / name, status, 0.1)
+
+    report = generate_summary_report(tmp_path, tmp_path, tmp_path, manifest=manifest)
+    assert report['total_files'] == 2
+    assert report['failed_files'] == ['a/book.txt']
+
+def test_process_batch_files_skips_finished(tmp_path, monkeypatch):
+    from src.main import process_batch_files
+    from src.processors.text_cleaner import TextCleaner
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    (tmp_path / 'input' / 'book.txt').write_text('The results of the experiment were consistent with the theory.\n')
+    manifest = JobManifest(tmp_path / 'manifest.sqlite')
+    cleaner = TextCleaner()
+    assert process_batch_files(cleaner, manifest=manifest)
+    assert process_batch_files(cleaner, manifest=manifest)
+    rows = list(manifest.rows())
+    assert [(row['status'], row['attempts']) for row in rows] == [('success', 1)]
+    assert process_batch_files(cleaner, manifest=manifest, force=True)
+    assert list(manifest.rows())[0]['attempts'] == 2
@@ -0,0 +1,27 @@
+import pytest
+from src.utils.job_queue import JobQueue
+
+def test_job_queue_runs_jobs():
+    queue = JobQueue(max_workers=1, max_pending=4)
+
+    def work(report):
+        report(paragraphs=3)
+        return 'done'
+
+    job_id = queue.submit(work, filename='a.txt')
+    job = queue.get(job_id)
+    while job['status'] not in ('finished', 'failed'):
+        job = queue.wait_for_change(job_id, job, timeout=5)
+    assert job['status'] == 'finished'
+    assert job['result'] == 'done'
+    assert job['progress'] == {'paragraphs': 3}
+    queue.shutdown()
+
+def test_job_queue_rejects_when_full():
+    import threading
+    release = threading.Event()
+    queue = JobQueue(max_workers=1, max_pending=1)
+    assert queue.submit(lambda report: release.wait(5)) is not None
+    assert queue.submit(lambda report: None) is None
+    release.set()
+    queue.shutdown()
@@ -0,0 +1,21 @@
+import pytest
+from src.processors.language_detector import DetectorRegistry, TaggedParagraph, parse_languages
+
+def test_parse_languages():
+    assert parse_languages('de, EN') == ('de', 'en')
+    assert parse_languages(['en']) == ('en',)
+    assert parse_languages('auto') == ()
+    with pytest.raises(ValueError):
+        parse_languages('en,xx')
+
+def test_registry_reuses_detectors():
+    registry = DetectorRegistry()
+    detector = registry.get(('en',))
+    assert registry.get(('en',)) is detector
+    assert registry.get(('en',), low_accuracy=True) is not detector
+    assert len(registry) == 2
+
+def test_tagged_paragraph_is_str():
+    paragraph = TaggedParagraph('Ein Absatz.', 'de')
+    assert paragraph == 'Ein Absatz.'
+    assert paragraph.language == 'de'
@@ -1,6 +1,7 @@
 import pytest
-from src.main import process_single_file, process_batch_files
+from src.main import process_single_file, process_batch_files, save_cleaned_text, build_hf_dataset
 from src.processors.text_cleaner import TextCleaner
+from src.utils.job_manifest import JobManifest
 from pathlib import Path
 
 def test_process_single_file():
@@ -13,3 +14,179 @@ def test_process_batch_files():
     cleaner = TextCleaner()
     result = process_batch_files(cleaner)
     assert result in [True, False]
+
+def test_process_batch_files_process_executor(tmp_path, monkeypatch):
+    import shutil
+    monkeypatch.chdir(tmp_path)
+    for index in range(6):
+        book = tmp_path / 'input' / f'part{index % 2}' / f'book{index}.txt'
+        book.parent.mkdir(parents=True, exist_ok=True)
+        book.write_text(f'Chapter {index} begins here.\n\nThe results of experiment {index} matched the theory.\n')
+
+    def outputs():
+        root = tmp_path / 'output' / 'cleaned_texts'
+        return {str(f.relative_to(root)): f.read_text(encoding='utf-8') for f in sorted(root.rglob('*')) if f.is_file()}
+
+    assert process_batch_files(TextCleaner(), executor="thread")
+    thread_outputs = outputs()
+    shutil.rmtree(tmp_path / 'output')
+    assert process_batch_files(TextCleaner(), executor="process", chunk_size=2)
+    assert len(thread_outputs) == 6
+    assert outputs() == thread_outputs
+
+def test_process_batch_files_cleans_up_when_nothing_is_pending(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    (tmp_path / 'input' / 'book.txt').write_text('The results of the experiment were consistent with the theory.\n')
+    manifest = JobManifest(tmp_path / 'manifest.sqlite')
+    cleaner = TextCleaner()
+    assert process_batch_files(cleaner, manifest=manifest)
+
+    class Recorder:
+        index_path = None
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    deduplicator = Recorder()
+    assert process_batch_files(cleaner, manifest=manifest, deduplicator=deduplicator)
+    assert deduplicator.closed
+
+def test_process_executor_metrics_reach_parent_registry(tmp_path, monkeypatch):
+    import re
+    from src.utils.metrics import METRICS
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    (tmp_path / 'input' / 'book.txt').write_text('The results of the experiment were consistent with the theory.\n')
+
+    def files_total():
+        return sum(int(n) for n in re.findall(r'^makeaidatasets_files_total\{[^}]*\} (\d+)$', METRICS.render_prometheus(), re.M))
+
+    before = files_total()
+    process_batch_files(TextCleaner(), executor="process")
+    assert files_total() > before
+
+def test_import_is_lightweight(tmp_path):
+    import os
+    import subprocess
+    import sys
+    heavy = ['datasets', 'lingua', 'numpy', 'PyPDF2', 'pdf2image', 'pytesseract', 'ebooklib', 'bs4', 'docx']
+    code = f"import sys, src.main; print([m for m in {heavy!r} if m in sys.modules])"
+    env = {**os.environ, 'PYTHONPATH': str(Path(__file__).resolve().parent.parent)}
+    result = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+    assert list(tmp_path.iterdir()) == []
+
+def test_save_cleaned_text_streams_generator(tmp_path):
+    import json
+    output_file = tmp_path / 'book_cleaned.json'
+    count = save_cleaned_text(output_file, (p for p in ['First paragraph.', 'Second "quoted" one.']), 'json')
+    assert count == 2
+    assert json.loads(output_file.read_text(encoding='utf-8')) == ['First paragraph.', 'Second "quoted" one.']
+
+    empty_file = tmp_path / 'empty_cleaned.txt'
+    assert save_cleaned_text(empty_file, iter([]), 'txt') == 0
+    assert not empty_file.exists()
+
+def test_build_hf_dataset():
+    dataset = build_hf_dataset()
+    if dataset is not None:
+        assert set(dataset.column_names) == {'text', 'source_file', 'paragraph_index'}
+
+def test_process_single_file_splits_languages(tmp_path, monkeypatch):
+    import json
+    from src.utils.processing_cache import ProcessingCache
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / 'mixed.txt'
+    source.write_text('The results of the experiment were consistent with the theory.\n'
+                      'Dies ist ein Beispielsatz, der nicht auf Englisch geschrieben wurde.\n', encoding='utf-8')
+    cleaner = TextCleaner(languages='en,de')
+    cache = ProcessingCache(tmp_path / 'cache')
+    assert process_single_file(source, cleaner, output_format='jsonl', cache=cache, split_languages=True)
+    shard = tmp_path / 'output' / 'language_shards' / 'mixed_de_cleaned.jsonl'
+    assert json.loads(shard.read_text(encoding='utf-8'))['language'] == 'de'
+    meta = json.loads((tmp_path / 'output' / 'metadata' / 'mixed_metadata.json').read_text(encoding='utf-8'))
+    assert meta['languages'] == {'en': 1, 'de': 1}
+
+    shard.unlink()
+    assert process_single_file(source, cleaner, output_format='jsonl', cache=cache, split_languages=True)
+    assert shard.exists()
+
+def test_process_batch_files_mirrors_input_tree(tmp_path, monkeypatch):
+    import json
+    monkeypatch.chdir(tmp_path)
+    for folder in ['a', 'b']:
+        (tmp_path / 'input' / folder).mkdir(parents=True)
+        (tmp_path / 'input' / folder / 'book.txt').write_text(f'The experiment in folder {folder} produced consistent results.\n')
+    assert process_batch_files(TextCleaner(), exclude=['b'])
+    assert not (tmp_path / 'output' / 'cleaned_texts' / 'b').exists()
+    assert process_batch_files(TextCleaner())
+    for folder in ['a', 'b']:
+        assert folder in (tmp_path / 'output' / 'cleaned_texts' / folder / 'book_cleaned.txt').read_text()
+        meta = json.loads((tmp_path / 'output' / 'metadata' / folder / 'book_metadata.json').read_text())
+        assert meta['source_path'] == f'{folder}/book.txt'
+
+def test_build_hf_dataset_chunks_by_tokens(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cleaned = tmp_path / 'output' / 'cleaned_texts' / 'books'
+    cleaned.mkdir(parents=True)
+    (cleaned / 'story_cleaned.txt').write_text(
+        'The first paragraph has eight tokens in it.\nA second, shorter one.\nAnd a third closing line.\n',
+        encoding='utf-8')
+    dataset = build_hf_dataset(chunk_tokens=16, chunk_overlap=0, tokenizer='whitespace')
+    assert dataset is not None
+    assert dataset['text'] == ['The first paragraph has eight tokens in it.\nA second, shorter one.',
+                               'And a third closing line.']
+    assert dataset['source_file'] == ['books/story', 'books/story']
+    assert dataset['paragraph_index'] == [0, 2]
+    assert dataset['chunk_index'] == [0, 1]
+    assert dataset['token_count'] == [15, 6]
+
+def test_cache_hit_keeps_source_of_identical_file(tmp_path, monkeypatch):
+    import json
+    from src.utils.processing_cache import ProcessingCache
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    content = 'The results of the experiment were consistent with the theory.\n'
+    for name in ['a.txt', 'b.txt']:
+        (tmp_path / 'input' / name).write_text(content, encoding='utf-8')
+    cleaner = TextCleaner()
+    cache = ProcessingCache(tmp_path / 'cache')
+    for name in ['a', 'b']:
+        assert process_single_file(Path('input') / f'{name}.txt', cleaner, cache=cache, split_languages=True)
+    meta = json.loads((tmp_path / 'output' / 'metadata' / 'b_metadata.json').read_text(encoding='utf-8'))
+    assert (meta['source_file'], meta['source_path']) == ('b.txt', 'b.txt')
+    assert meta['language_shards'] == {'en': 'b_en_cleaned.txt'}
+    assert (tmp_path / 'output' / 'language_shards' / 'b_en_cleaned.txt').read_text(encoding='utf-8').strip() == content.strip()
+
+def test_corpus_dedup_bypasses_cache(tmp_path, monkeypatch):
+    from src.processors.deduplicator import Deduplicator
+    from src.utils.processing_cache import ProcessingCache
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input').mkdir()
+    content = 'The results of the experiment were consistent with the theory we proposed.\n'
+    for name in ['a.txt', 'b.txt']:
+        (tmp_path / 'input' / name).write_text(content, encoding='utf-8')
+    cleaner = TextCleaner()
+    cache = ProcessingCache(tmp_path / 'cache')
+    deduplicator = Deduplicator(index_path=tmp_path / 'dedup.sqlite')
+    assert process_single_file(Path('input/a.txt'), cleaner, cache=cache, deduplicator=deduplicator)
+    # Same content as a.txt: removed as a corpus duplicate instead of restored from the cache
+    assert not process_single_file(Path('input/b.txt'), cleaner, cache=cache, deduplicator=deduplicator)
+    deduplicator.close()
+
+def test_build_hf_dataset_uses_latest_of_combined_output_and_shards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'input' / 'a').mkdir(parents=True)
+    (tmp_path / 'input' / 'a' / 'book.txt').write_text(
+        'The results of the experiment were consistent with the theory.\n'
+        'Dies ist ein Beispielsatz, der nicht auf Englisch geschrieben wurde.\n', encoding='utf-8')
+    (tmp_path / 'input' / 'a' / 'book_en.txt').write_text(
+        'Another document whose name happens to end like a language shard.\n', encoding='utf-8')
+    cleaner = TextCleaner(languages='en,de')
+    assert process_batch_files(cleaner)
+    assert process_batch_files(cleaner, split_languages=True, force=True)
+    dataset = build_hf_dataset()
+    assert sorted(dataset['source_file']) == ['a/book', 'a/book', 'a/book_en']
+    assert len(set(dataset['text'])) == 3
@@ -0,0 +1,36 @@
+import pytest
+from src.utils.metrics import StageTimer, MetricsRegistry
+
+def test_stage_timer_exclusive():
+    timer = StageTimer()
+    items = timer.timed_iter(iter(range(3)), 'extract')
+    doubled = timer.timed_iter((i * 2 for i in items), 'clean')
+    assert list(doubled) == [0, 2, 4]
+    timer.exclusive(['extract', 'clean'])
+    timer.add('clean', paragraphs=3)
+    stages = timer.as_dict()
+    assert list(stages) == ['extract', 'clean']
+    assert stages['clean']['paragraphs'] == 3
+    assert stages['clean']['seconds'] >= 0
+
+def test_metrics_registry_renders_prometheus():
+    registry = MetricsRegistry()
+    registry.record_file('success', {'language_filter': {'seconds': 0.5, 'paragraphs': 10}})
+    text = registry.render_prometheus()
+    assert 'makeaidatasets_files_total{status="success"} 1' in text
+    assert 'makeaidatasets_stage_seconds_total{stage="language_filter"} 0.500000' in text
+    assert 'makeaidatasets_stage_items_total{stage="language_filter",unit="paragraphs"} 10' in text
+
+def test_metrics_registry_drain_and_merge():
+    worker = MetricsRegistry()
+    worker.record_file('success', {'extract': {'seconds': 0.25, 'chunks': 4}})
+    snapshot = worker.drain()
+    assert 'status="success"' not in worker.render_prometheus()
+
+    parent = MetricsRegistry()
+    parent.record_file('success', {'extract': {'seconds': 0.25, 'chunks': 1}})
+    parent.merge(snapshot)
+    text = parent.render_prometheus()
+    assert 'makeaidatasets_files_total{status="success"} 2' in text
+    assert 'makeaidatasets_stage_seconds_total{stage="extract"} 0.500000' in text
+    assert 'makeaidatasets_stage_items_total{stage="extract",unit="chunks"} 5' in text
@@ -0,0 +1,33 @@
+import json
+import pytest
+from src.utils.output_writers import WRITERS
+
+PARAGRAPHS = ['First paragraph.', 'Second, with "quotes".', 'Third\tone.']
+
+def test_write_jsonl(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    assert WRITERS['jsonl'](path, iter(PARAGRAPHS)) == 3
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['text'] for line in lines] == PARAGRAPHS
+
+def test_write_parquet_and_arrow(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    parquet_path = tmp_path / 'out.parquet'
+    assert WRITERS['parquet'](parquet_path, iter(PARAGRAPHS), row_group_size=2, compression='snappy') == 3
+    parquet_file = pq.ParquetFile(str(parquet_path))
+    assert parquet_file.num_row_groups == 2
+    assert parquet_file.read().column('text').to_pylist() == PARAGRAPHS
+
+    arrow_path = tmp_path / 'out.arrow'
+    assert WRITERS['arrow'](arrow_path, iter(PARAGRAPHS), row_group_size=2) == 3
+    with pa.memory_map(str(arrow_path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.column('paragraph_index').to_pylist() == [0, 1, 2]
+
+def test_language_column(tmp_path):
+    from src.processors.language_detector import TaggedParagraph
+    path = tmp_path / 'out.jsonl'
+    WRITERS['jsonl'](path, [TaggedParagraph('Ein Absatz.', 'de')], language_column=True)
+    assert json.loads(path.read_text(encoding='utf-8')) == {'text': 'Ein Absatz.', 'language': 'de'}
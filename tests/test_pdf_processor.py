@@ -1,5 +1,5 @@
 import pytest
-from src.processors.pdf_processor import process_pdf
+from src.processors.pdf_processor import process_pdf, group_page_runs
 from pathlib import Path
 
 def test_process_pdf():
@@ -8,3 +8,31 @@ def test_process_pdf():
     assert isinstance(text, str)
     assert isinstance(ocr_used, bool)
     assert isinstance(metadata, dict)
+
+def test_group_page_runs():
+    assert group_page_runs([5, 1, 2, 3, 7, 8], max_run=2) == [(1, 2), (3, 3), (5, 5), (7, 8)]
+
+@pytest.mark.parametrize('backend', ['pypdf2', 'pypdfium2', 'pdfminer'])
+def test_pdf_backends_agree(tmp_path, backend):
+    from benchmarks.corpus import write_pdf
+    from src.processors.pdf_backends import backend_available
+    from src.processors.pdf_processor import iter_pdf
+    if not backend_available(backend):
+        pytest.skip(f'{backend} not installed')
+    test_file = tmp_path / 'book.pdf'
+    write_pdf(test_file, ['The first paragraph of the synthetic book is long enough to count.'] * 5)
+    meta = {}
+    text = ''.join(iter_pdf(test_file, meta, backend=backend))
+    assert 'synthetic book' in text
+    assert meta['pdf_backend'] == backend
+    assert meta['ocr_used'] is False
+
+def test_resolve_backend(monkeypatch):
+    from src.processors import pdf_backends
+    monkeypatch.setenv('PDF_BACKEND', 'pypdf2')
+    assert pdf_backends.resolve_backend() == 'pypdf2'
+    monkeypatch.setattr(pdf_backends, 'backend_available', lambda name: name == 'pypdf2')
+    assert pdf_backends.resolve_backend('auto') == 'pypdf2'
+    assert pdf_backends.resolve_backend('pypdfium2') == 'pypdf2'
+    with pytest.raises(ValueError):
+        pdf_backends.resolve_backend('nope')
@@ -0,0 +1,47 @@
+import pytest
+from src.utils.processing_cache import ProcessingCache, hash_file
+
+def test_cache_roundtrip(tmp_path):
+    source = tmp_path / 'book.txt'
+    source.write_text('Some content')
+    output_file = tmp_path / 'out' / 'book_cleaned.txt'
+    meta_file = tmp_path / 'meta' / 'book_metadata.json'
+    output_file.parent.mkdir()
+    meta_file.parent.mkdir()
+    output_file.write_text('cleaned')
+    meta_file.write_text('{"paragraph_count": 1}')
+
+    cache = ProcessingCache(tmp_path / 'cache')
+    key = cache.make_key(hash_file(source), {'output_format': 'txt'})
+    assert cache.restore(key, output_file, meta_file) is None
+    assert cache.store(key, output_file, meta_file)
+
+    output_file.unlink()
+    meta_file.unlink()
+    assert cache.restore(key, output_file, meta_file) == {'paragraph_count': 1}
+    assert output_file.read_text() == 'cleaned'
+    assert key != cache.make_key(hash_file(source), {'output_format': 'json'})
+
+def test_cache_evict(tmp_path):
+    source = tmp_path / 'book.txt'
+    source.write_text('x' * 100)
+    cache = ProcessingCache(tmp_path / 'cache', max_bytes=0)
+    cache.store(cache.make_key('abc', {}), source, source)
+    assert cache.evict() == 1
+
+def test_cache_store_same_key_from_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    output_file = tmp_path / 'book_cleaned.txt'
+    meta_file = tmp_path / 'book_metadata.json'
+    output_file.write_text('cleaned')
+    meta_file.write_text('{"paragraph_count": 1}')
+    cache = ProcessingCache(tmp_path / 'cache')
+    key = cache.make_key('abc', {})
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: cache.store(key, output_file, meta_file, shards={'en': output_file}), range(16)))
+    assert any(results)
+    assert [p.name for p in (tmp_path / 'cache' / key[:2]).iterdir()] == [key]
+    assert cache.restore(key, tmp_path / 'restored.txt', tmp_path / 'restored.json',
+                         shard_path=lambda name: tmp_path / f'restored_{name}.txt') == {'paragraph_count': 1}
+    assert (tmp_path / 'restored_en.txt').read_text() == 'cleaned'
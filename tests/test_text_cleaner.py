@@ -11,3 +11,54 @@ def test_is_english():
     cleaner = TextCleaner()
     assert cleaner.is_english('This is a test.')
     assert not cleaner.is_english('Esto es una prueba.')
+
+def test_filter_english_batched():
+    cleaner = TextCleaner(batch_size=2, parallel_detection=True)
+    lines = [
+        'The results of the experiment were consistent with the theory.',
+        'Esto es una prueba del sistema.',
+        'Это тестовое предложение.',
+        'This is a test.',
+    ]
+    assert cleaner.filter_english(lines) == [lines[0], lines[3]]
+
+def test_prefilter_english():
+    cleaner = TextCleaner()
+    assert cleaner.prefilter_english('Это тестовое предложение.') is False
+    assert cleaner.prefilter_english('1234 5678') is False
+    assert cleaner.prefilter_english('They said that the work was done with their tools.') is True
+    assert cleaner.prefilter_english('Esto es una prueba.') is None
+
+def test_iter_clean_is_lazy():
+    cleaner = TextCleaner()
+    chunks = iter(['short\n  A   longer   line of text  ', 'Second chunk line here.'])
+    cleaned = cleaner.iter_clean(chunks)
+    assert next(cleaned) == 'A longer line of text'
+    assert list(cleaned) == ['Second chunk line here.']
+
+def test_clean_level_presets():
+    raw_text = 'Cleaning the ﬁnal draft of the docu-\nment.\nhttp://example.com/a/very/long/link'
+    assert TextCleaner().clean_text(raw_text) == ['Cleaning the ﬁnal draft of the docu-', 'http://example.com/a/very/long/link']
+    assert TextCleaner(clean_level='aggressive').clean_text(raw_text) == ['Cleaning the final draft of the document.']
+
+def test_tag_languages():
+    lines = [
+        'The results of the experiment were consistent with the theory.',
+        'Dies ist ein Beispielsatz, der nicht auf Englisch geschrieben wurde.',
+        "Ceci est une phrase d'exemple qui n'est pas écrite en anglais.",
+    ]
+    tagged = list(TextCleaner(languages='en,de').iter_tag_languages(lines))
+    assert tagged == lines[:2]
+    assert [p.language for p in tagged] == ['en', 'de']
+    assert TextCleaner().filter_english(lines) == lines[:1]
+
+def test_single_language_drops_other_languages():
+    lines = [
+        'Dies ist ein Beispielsatz, der auf Deutsch geschrieben wurde.',
+        'Esta es una frase de ejemplo escrita en español.',
+        'The model was trained on data.',
+        'Questa è una frase di esempio scritta in italiano.',
+    ]
+    tagged = list(TextCleaner(languages='de').iter_tag_languages(lines))
+    assert tagged == lines[:1]
+    assert [p.language for p in tagged] == ['de']
@@ -0,0 +1,46 @@
+import io
+import pytest
+from src.utils.text_encoding import detect_encoding, iter_decoded_lines
+
+@pytest.mark.parametrize("data, encoding", [
+    ("plain ascii\n".encode("utf-8"), "utf-8"),
+    ("café naïve\n".encode("utf-8"), "utf-8"),
+    ("\ufeffwith bom\n".encode("utf-8"), "utf-8"),
+    ("\ufeffwide text\r\n".encode("utf-16-le"), "utf-16-le"),
+    ("wide text without a bom\n".encode("utf-16-be"), "utf-16-be"),
+    ("“Quoted” café – résumé\n".encode("cp1252"), "cp1252"),
+])
+def test_detect_encoding(data, encoding):
+    assert detect_encoding(data) == encoding
+
+def test_detect_encoding_cyrillic():
+    pytest.importorskip("charset_normalizer")
+    data = "Привет, как дела? " * 20
+    assert detect_encoding(data.encode("cp1251")) == "cp1251"
+
+def test_iter_decoded_lines_across_blocks():
+    text = "été — première ligne\r\n" * 5000 + "sans fin"
+    # Both with a BOM, which is dropped
+    for data in (("\ufeff" + text).encode("utf-8"), text.encode("utf-16")):
+        meta = {}
+        lines = list(iter_decoded_lines(io.BytesIO(data), meta, read_bytes=4097))
+        assert lines == text.splitlines(keepends=True)
+        assert meta["encoding"] in ("utf-8", "utf-16-le")
+        assert "undecodable_characters" not in meta
+
+def test_iter_decoded_lines_splits_long_lines():
+    lines = list(iter_decoded_lines(io.BytesIO(b"x" * 200000), read_bytes=65536))
+    assert "".join(lines) == "x" * 200000
+    assert max(map(len, lines)) < 2 * 65536
+
+def test_iter_decoded_lines_counts_replacements():
+    meta = {}
+    data = ("ok\n" * 30000).encode("utf-8") + b"bad \xff byte\n"
+    assert list(iter_decoded_lines(io.BytesIO(data), meta))[-1] == "bad \ufffd byte\n"
+    assert meta == {"encoding": "utf-8", "undecodable_characters": 1}
+
+def test_iter_decoded_lines_ignores_genuine_replacement_characters():
+    meta = {}
+    data = "already replaced � in the source\n".encode("utf-8")
+    assert list(iter_decoded_lines(io.BytesIO(data), meta)) == ["already replaced � in the source\n"]
+    assert meta == {"encoding": "utf-8"}
@@ -0,0 +1,26 @@
+import pytest
+from src.processors.text_normalizer import TextNormalizer, CLEAN_LEVELS
+
+def test_basic_collapses_whitespace_and_drops_short_lines():
+    normalizer = TextNormalizer.from_preset("basic")
+    text = "  A   longer\tline of text  \r\n\n\nshort Another line of text here.\x0c"
+    assert list(normalizer.iter_lines(text)) == ["A longer line of text", "Another line of text here."]
+
+def test_standard_strips_controls_and_ligatures():
+    normalizer = TextNormalizer.from_preset("standard")
+    assert list(normalizer.iter_lines("The eﬃcient\x00 de\u00adsign\u200b")) == ["The efficient design"]
+
+def test_advanced_repairs_hyphenation_and_nfkc():
+    normalizer = TextNormalizer.from_preset("advanced")
+    text = "The normal-\n  ization step uses ＦＵＬＬ width.\nWell-known-\nKnown terms stay apart."
+    assert list(normalizer.iter_lines(text)) == ["The normalization step uses FULL width.", "Well-known-", "Known terms stay apart."]
+
+def test_aggressive_drops_urls_and_symbol_lines():
+    normalizer = TextNormalizer.from_preset("aggressive")
+    text = "See https://example.com/page for all of the details here.\n|---|---|---|---|---|---|---|"
+    assert list(normalizer.iter_lines(text)) == ["See for all of the details here."]
+
+def test_unknown_preset():
+    assert CLEAN_LEVELS == ["basic", "standard", "advanced", "aggressive"]
+    with pytest.raises(ValueError):
+        TextNormalizer.from_preset("extreme")
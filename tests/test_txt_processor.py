@@ -1,8 +1,20 @@
 import pytest
-from src.processors.txt_processor import process_txt
+from src.processors.txt_processor import process_txt, iter_txt
 from pathlib import Path
 
 def test_process_txt():
     test_file = Path('input/test.txt')
     text = process_txt(test_file)
     assert isinstance(text, str)
+
+def test_iter_txt(tmp_path):
+    test_file = tmp_path / 'lines.txt'
+    test_file.write_bytes('first line\nsecond caf\xe9 line\n'.encode('latin-1'))
+    assert list(iter_txt(test_file)) == ['first line\n', 'second caf\xe9 line\n']
+
+def test_iter_txt_detects_encoding(tmp_path):
+    test_file = tmp_path / 'wide.txt'
+    test_file.write_bytes('Test “content”\r\nsecond\r\n'.encode('utf-16'))
+    meta = {}
+    assert list(iter_txt(test_file, meta)) == ['Test “content”\r\n', 'second\r\n']
+    assert meta['encoding'] == 'utf-16-le'
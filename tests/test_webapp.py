@@ -1,5 +1,6 @@
 import pytest
 from flask import Flask
+from pathlib import Path
 from src.webapp import app
 
 @pytest.fixture
@@ -12,6 +13,9 @@ def test_index_page(client):
     response = client.get('/')
     assert response.status_code == 200
     assert b'MakeAIDatasets Web' in response.data
+    # The upload form goes through the asynchronous jobs API
+    assert b'action="/jobs"' in response.data
+    assert b"xhr.open('POST', '/jobs')" in response.data
 
 def test_file_upload(client):
     data = {
@@ -19,3 +23,85 @@ def test_file_upload(client):
     }
     response = client.post('/', data=data, content_type='multipart/form-data')
     assert response.status_code in [200, 400, 500]
+
+def test_upload_rejected_for_invalid_option_is_not_kept(client):
+    import io
+    from src.webapp import UPLOAD_FOLDER
+    for form in ({'clean_level': 'extreme'}, {'lang': 'xx'}, {'output_format': 'yaml'}):
+        data = {'file': (io.BytesIO(b'Some text'), 'rejected.txt'), **form}
+        response = client.post('/', data=data, content_type='multipart/form-data')
+        assert response.status_code == 400
+        assert not (UPLOAD_FOLDER / 'rejected.txt').exists()
+
+def test_job_rejects_unknown_clean_level(client):
+    import io
+    data = {
+        'file': (io.BytesIO(b'Some text'), 'job.txt'),
+        'clean_level': 'extreme'
+    }
+    response = client.post('/jobs', data=data, content_type='multipart/form-data')
+    assert response.status_code == 400
+
+def test_async_job(client):
+    import io
+    import time
+    text = b'The quick brown fox jumps over the lazy dog and then it runs away from the farm.\n'
+    data = {
+        'file': (io.BytesIO(text * 3), 'job.txt')
+    }
+    response = client.post('/jobs', data=data, content_type='multipart/form-data')
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+
+    deadline = time.time() + 30
+    status = client.get(f'/jobs/{job_id}').get_json()
+    while status['status'] not in ('finished', 'failed') and time.time() < deadline:
+        time.sleep(0.1)
+        status = client.get(f'/jobs/{job_id}').get_json()
+    assert status['status'] == 'finished', status['error']
+    result = client.get(status['result_url'])
+    assert result.status_code == 200
+    assert result.data.decode('utf-8').split('\n') == [text.decode('utf-8').strip()] * 3
+    result.close()
+    for leftover in Path('output').glob(f"*/*_job_*"):
+        leftover.unlink()
+
+    events = client.get(f'/jobs/{job_id}/events')
+    assert b'data: ' in events.data
+    assert client.get('/jobs/unknown').status_code == 404
+
+def test_metrics_endpoint(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert b'makeaidatasets_files_total' in response.data
+
+def test_upload_of_compressed_file_matches_cli_output_name(client):
+    import gzip
+    import io
+    text = b'The quick brown fox jumps over the lazy dog and then it runs away from the farm.\n'
+    data = {'file': (io.BytesIO(gzip.compress(text * 3)), 'webgz.txt.gz')}
+    response = client.post('/', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert 'webgz_cleaned.txt' in response.headers['Content-Disposition']
+    assert response.data.startswith(b'The quick brown fox')
+    response.close()
+    Path('output/cleaned_texts/webgz_cleaned.txt').unlink()
+    Path('output/metadata/webgz_metadata.json').unlink()
+
+def test_upload_uses_requested_output_format(client):
+    import io
+    import json
+    text = b'The quick brown fox jumps over the lazy dog and then it runs away from the farm.\n'
+    data = {'file': (io.BytesIO(text * 2), 'webjsonl.txt'), 'output_format': 'jsonl'}
+    response = client.post('/', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert 'webjsonl_cleaned.jsonl' in response.headers['Content-Disposition']
+    rows = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+    assert [row['text'] for row in rows] == [text.decode('utf-8').strip()] * 2
+    response.close()
+    Path('output/cleaned_texts/webjsonl_cleaned.jsonl').unlink()
+    Path('output/metadata/webjsonl_metadata.json').unlink()
+
+    data = {'file': (io.BytesIO(text), 'job.txt'), 'output_format': 'yaml'}
+    assert client.post('/jobs', data=data, content_type='multipart/form-data').status_code == 400
+    assert b'value="yaml"' not in client.get('/').data